@@ -0,0 +1,64 @@
+"""Benchmark dask graph overhead of shipping a HexProj to every task.
+
+Builds a labelling graph with one task per chunk (100k tasks by default),
+then reports:
+
+- graph construction time,
+- serialisation time and size of the whole graph (what the distributed
+  scheduler does on submission), and
+- per-task overhead: unpickling a HexProj and labelling one position,
+  for the parameter-only pickle vs. shipping pyproj objects (the old
+  behaviour, emulated by pickling the Proj and Transformer alongside).
+
+    python dev/benchmarks/bench_dask_graph.py [n_tasks]
+"""
+
+import pickle
+import sys
+import time
+
+import cloudpickle
+import dask.array as da
+import numpy as np
+
+from hextraj import HexProj
+
+
+def timed(func, *args):
+    tic = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - tic
+
+
+def main(n_tasks):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    lon = da.zeros(n_tasks * 8, chunks=8)
+    lat = da.zeros(n_tasks * 8, chunks=8)
+
+    labels, t_build = timed(hp.label, lon, lat)
+    graph = dict(labels.__dask_graph__())
+    payload, t_dump = timed(cloudpickle.dumps, graph)
+    print(f"label tasks={n_tasks:,}  graph tasks (incl. inputs)={len(graph):,}")
+    print(f"  graph construction: {t_build:7.3f} s")
+    print(f"  graph serialisation: {t_dump:7.3f} s  ({len(payload) / 2**20:.1f} MiB)")
+
+    new = pickle.dumps(hp)
+    old = pickle.dumps((hp._constructor_args(), hp.proj, hp.transformer_relto_wgs))
+    n_rep = 2_000
+    one = np.zeros(1)
+
+    def per_task(blob, rebuild):
+        tic = time.perf_counter()
+        for _ in range(n_rep):
+            rebuild(pickle.loads(blob)).label(one, one)
+        return (time.perf_counter() - tic) / n_rep
+
+    t_new = per_task(new, lambda obj: obj)
+    # unpickling the tuple rebuilds Proj and Transformer, as the old pickle did
+    t_old = per_task(old, lambda obj: HexProj(*obj[0]))
+    print(f"  per-task overhead (params pickle, {len(new)} B):   {t_new * 1e6:8.1f} us")
+    print(f"  per-task overhead (pyproj pickle, {len(old)} B): {t_old * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
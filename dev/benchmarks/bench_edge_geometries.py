@@ -0,0 +1,62 @@
+"""Benchmark the batched edge geometry builder against the per-edge loop.
+
+The previous ``hex_analysis._build_edge_geometries`` decoded each pair and
+inverse-projected both centres one edge at a time; ``HexProj.edge_geometries``
+decodes and projects every distinct centre once and builds all lines in
+one ``shapely.linestrings`` call.
+
+    python dev/benchmarks/bench_edge_geometries.py [n_edges] [n_hexes]
+"""
+
+import sys
+import time
+
+import numpy as np
+from shapely.geometry import LineString
+
+from hextraj import HexProj
+from hextraj.hex_id import INVALID_HEX_ID
+from hextraj.redblobhex_array import Hex
+
+
+def per_edge_loop(hp, from_ids, to_ids):
+    """The edge geometry loop before batching."""
+    geometries = []
+    for f_id, t_id in zip(from_ids, to_ids):
+        if f_id == INVALID_HEX_ID or t_id == INVALID_HEX_ID:
+            geometries.append(None)
+        else:
+            q_f, r_f = hp.decode_hex_id(f_id)
+            q_t, r_t = hp.decode_hex_id(t_id)
+            lon_f, lat_f = hp.hex_to_lon_lat_SoA(Hex(q_f, r_f, -q_f - r_f))
+            lon_t, lat_t = hp.hex_to_lon_lat_SoA(Hex(q_t, r_t, -q_t - r_t))
+            geometries.append(LineString([(lon_f, lat_f), (lon_t, lat_t)]))
+    return geometries
+
+
+def timed(func, *args):
+    tic = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - tic
+
+
+def main(n_edges, n_hexes):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    ids = hp.encode_hex_id(rng.integers(-300, 300, n_hexes), rng.integers(-300, 300, n_hexes))
+    from_ids, to_ids = rng.choice(ids, n_edges), rng.choice(ids, n_edges)
+    print(f"{n_edges:,} edges between {n_hexes:,} hexes")
+
+    n_loop = min(n_edges, 20_000)
+    _, t_loop = timed(per_edge_loop, hp, from_ids[:n_loop], to_ids[:n_loop])
+    t_loop *= n_edges / n_loop
+    _, t_cold = timed(hp.edge_geometries, from_ids, to_ids)
+    _, t_warm = timed(hp.edge_geometries, from_ids, to_ids)
+    print(f"  per-edge loop  {t_loop:8.2f} s (extrapolated from {n_loop:,})")
+    print(f"  batched cold   {t_cold:8.2f} s ({t_loop / t_cold:.0f}x)")
+    print(f"  batched warm   {t_warm:8.2f} s ({t_loop / t_warm:.0f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [1_000_000, 50_000][len(args):]))
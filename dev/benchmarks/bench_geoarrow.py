@@ -0,0 +1,51 @@
+"""Benchmark array-native hex geometry outputs against to_geodataframe.
+
+``to_geodataframe`` builds one shapely Polygon per hex; ``corner_coords``
+returns the (N, 7, 2) corner array and ``to_geoarrow`` wraps the same
+array in a GeoArrow polygon column without creating geometry objects.
+Times are warm (geometry cache filled), so they show the output cost.
+
+    python dev/benchmarks/bench_geoarrow.py [n_hexes]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj
+
+
+def best_of(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(n_hexes):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=1_000)
+    side = int(np.sqrt(n_hexes))
+    q, r = np.meshgrid(np.arange(side), np.arange(side))
+    hex_ids = hp.encode_hex_id(q.ravel(), r.ravel())
+    hp.geometry_cache.maxsize = hex_ids.shape[0]
+    hp.corner_coords(hex_ids)
+    print(f"n_hexes={hex_ids.shape[0]:,}")
+
+    _, t_gdf = best_of(hp.to_geodataframe, hex_ids)
+    _, t_coords = best_of(hp.corner_coords, hex_ids)
+    print(f"  to_geodataframe  {t_gdf * 1e3:8.1f} ms")
+    print(f"  corner_coords    {t_coords * 1e3:8.1f} ms  ({t_gdf / t_coords:.1f}x)")
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return
+    _, t_arrow = best_of(hp.to_geoarrow, hex_ids)
+    print(f"  to_geoarrow      {t_arrow * 1e3:8.1f} ms  ({t_gdf / t_arrow:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    main(*(args or [1_000_000]))
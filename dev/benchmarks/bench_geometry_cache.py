@@ -0,0 +1,50 @@
+"""Benchmark the HexProj geometry cache on repeated geometry calls.
+
+Times to_geodataframe, edges_geodataframe and region_of_hexes over the
+same shelf-sea domain with a cold cache (cleared before each call) and a
+warm one.
+
+    python dev/benchmarks/bench_geometry_cache.py [hex_size_meters]
+"""
+
+import sys
+import time
+
+import numpy as np
+from shapely.geometry import box
+
+from hextraj import HexProj
+
+
+def best_of(func, *args, repeat=5, before=None):
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        tic = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - tic)
+    return min(times)
+
+
+def main(hex_size_meters):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=hex_size_meters)
+    region = box(-10, 50, 5, 60)
+    ids = hp.region_of_hexes(region)
+    rng = np.random.default_rng(0)
+    from_ids, to_ids = rng.choice(ids, len(ids)), rng.choice(ids, len(ids))
+    print(f"{len(ids):,} hexes of {hex_size_meters:,} m")
+    calls = {
+        "to_geodataframe": (hp.to_geodataframe, ids),
+        "edges_geodataframe": (hp.edges_geodataframe, from_ids, to_ids),
+        "region_of_hexes": (hp.region_of_hexes, region),
+    }
+    for name, (func, *args) in calls.items():
+        t_cold = best_of(func, *args, before=hp.geometry_cache.cache_clear)
+        t_warm = best_of(func, *args)
+        print(f"  {name:<19} cold {t_cold * 1e3:7.1f} ms  warm {t_warm * 1e3:7.1f} ms  ({t_cold / t_warm:.1f}x)")
+    print(f"  {hp.geometry_cache.cache_info()}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]] or [5_000])
@@ -0,0 +1,54 @@
+"""Benchmark hex_counts and hex_connectivity with deferred geometry.
+
+Times each call with ``geometry="eager"`` against ``"none"`` (the table
+only) and ``"lazy"`` plus a later first access of its geometry. The
+geometry cache is cleared before every call.
+
+    python dev/benchmarks/bench_geometry_modes.py [n_traj] [n_obs]
+"""
+
+import sys
+import time
+
+import numpy as np
+import xarray as xr
+
+from hextraj import HexProj, hex_connectivity, hex_counts
+
+
+def best_of(func, hp, repeat=3):
+    times = []
+    for _ in range(repeat):
+        hp.geometry_cache.cache_clear()
+        tic = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(n_traj, n_obs):
+    rng = np.random.default_rng(0)
+    lon = -10 + np.cumsum(rng.normal(0, 0.05, (n_traj, n_obs)), axis=1)
+    lat = 55 + np.cumsum(rng.normal(0, 0.03, (n_traj, n_obs)), axis=1)
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=1_000)
+    hex_ids = xr.DataArray(hp.label(lon, lat), dims=("traj", "obs"))
+    print(f"n_traj={n_traj:,}  n_obs={n_obs}")
+
+    calls = {
+        "hex_counts": lambda geometry: hex_counts(hex_ids, hp=hp, geometry=geometry),
+        "hex_connectivity": lambda geometry: hex_connectivity(
+            hex_ids, "obs", 0, "obs", -1, hp=hp, geometry=geometry
+        ),
+    }
+    for name, call in calls.items():
+        eager, t_eager = best_of(lambda: call("eager"), hp)
+        _, t_none = best_of(lambda: call("none"), hp)
+        _, t_lazy = best_of(lambda: call("lazy").geometry, hp)
+        print(f"  {name:<17} rows {len(eager):>9,}  eager {t_eager * 1e3:7.1f} ms  "
+              f"none {t_none * 1e3:7.1f} ms ({t_eager / t_none:.1f}x)  "
+              f"lazy+access {t_lazy * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [100_000, 50][len(args):]))
@@ -0,0 +1,61 @@
+"""Benchmark batched hex corner coordinates against the per-hex loop.
+
+The previous ``hex_corners_lon_lat`` took one hex and made one inverse
+projection call per corner, so outlines were drawn by looping over hexes;
+it now takes arrays of (q, r) and makes one call for all corners.
+``corner_coords`` returns the same corners as one array from hex IDs or
+(q, r), here without the geometry cache.
+
+    python dev/benchmarks/bench_hex_corners.py [n_hexes]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj
+from hextraj import redblobhex_array as redblobhex
+from hextraj.redblobhex_array import Hex
+
+
+def corners_one_hex(hp, hex_tuple):
+    """hex_corners_lon_lat before batching: seven inverse projections."""
+    centre = redblobhex.hex_to_pixel(hp.hex_layout_projected, hex_tuple)
+    return [
+        hp._transform_proj_to_lon_lat(centre.x + cop.x, centre.y + cop.y)
+        for cop in hp.corner_offsets_projected
+    ]
+
+
+def per_hex_loop(hp, q, r):
+    return [corners_one_hex(hp, Hex(qi, ri, -qi - ri)) for qi, ri in zip(q, r)]
+
+
+def best_of(func, *args, repeat=3, **kwargs):
+    times = []
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        result = func(*args, **kwargs)
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(n_hexes):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    side = int(np.sqrt(n_hexes))
+    q, r = (a.ravel() for a in np.meshgrid(np.arange(side), np.arange(side)))
+    print(f"n_hexes={q.shape[0]:,}")
+
+    loop, t_loop = best_of(per_hex_loop, hp, q, r, repeat=1)
+    _, t_batch = best_of(hp.hex_corners_lon_lat, Hex(q, r, -q - r))
+    coords, t_coords = best_of(hp.corner_coords, q=q, r=r, cached=False)
+    np.testing.assert_allclose(coords[:, :6, 0], np.array([[c[0] for c in h[:6]] for h in loop]))
+    print(f"  per-hex loop         {t_loop * 1e3:9.1f} ms")
+    print(f"  hex_corners_lon_lat  {t_batch * 1e3:9.1f} ms  ({t_loop / t_batch:.0f}x)")
+    print(f"  corner_coords        {t_coords * 1e3:9.1f} ms  ({t_loop / t_coords:.0f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    main(*(args or [20_000]))
@@ -0,0 +1,58 @@
+"""Benchmark counting and connectivity on a registered HexGrid.
+
+Compares the hashing aggregations (pandas value_counts / groupby) with
+``np.bincount`` over dense local indices for a fixed-domain grid, and
+``pair_sums`` (what ``hex_connectivity(grid=...)`` uses) for pairs.
+
+    python dev/benchmarks/bench_hex_grid.py [n_traj] [n_obs]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+
+from hextraj import HexGrid, HexProj
+
+
+def timed(func, *args, **kwargs):
+    tic = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - tic
+
+
+def main(n_traj, n_obs):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=25_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-20, 10, size=(n_traj, n_obs))
+    lat = rng.uniform(45, 65, size=(n_traj, n_obs))
+    ids = hp.label(lon, lat)
+    grid, t_grid = timed(HexGrid, hp.region_of_hexes(box(-21, 44, 11, 66)))
+    print(f"n={ids.size:,}  grid hexes={len(grid):,}  (registered in {t_grid:.3f} s)")
+
+    flat = ids.ravel()
+    hashed, t_hash = timed(lambda: pd.Series(flat).value_counts(sort=False))
+    binned, t_bin = timed(grid.bincount, flat)
+    assert binned[:-1].sum() == hashed.sum()
+    print(f"  counts:       value_counts {t_hash:7.3f} s  bincount {t_bin:7.3f} s"
+          f"  ({t_hash / t_bin:.1f}x)")
+
+    df = pd.DataFrame({"from_id": ids[:, 0], "to_id": ids[:, -1]})
+    pairs = pd.DataFrame({
+        "from_id": np.repeat(ids[:, 0], n_obs), "to_id": flat,
+    })
+    for name, frame in [("connectivity", df), ("all obs pairs", pairs)]:
+        hashed, t_hash = timed(lambda: frame.groupby(["from_id", "to_id"]).size())
+        (_, _, binned), t_bin = timed(
+            grid.pair_sums, frame["from_id"].to_numpy(), frame["to_id"].to_numpy()
+        )
+        assert binned.sum() == hashed.sum()
+        print(f"  {name:<13} groupby      {t_hash:7.3f} s  pair_sums {t_bin:6.3f} s"
+              f"  ({t_hash / t_bin:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args or [20_000, 200]))
@@ -0,0 +1,52 @@
+"""Benchmark Cantor decode_hex_id against the previous float-sqrt expression.
+
+The previous decode evaluated the whole array through ``np.sqrt`` on a
+float64 copy and ``np.where`` selects; the current one runs blockwise in
+place and corrects the float estimate in integer arithmetic. Also reports
+how many IDs the previous expression decoded wrongly.
+
+    python dev/benchmarks/bench_hex_id_decode.py [n] [max_id_bits]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj.hex_id import decode_hex_id, encode_hex_id
+
+
+def decode_float_sqrt(hex_id):
+    """The decode expression before the exact integer correction."""
+    w = np.floor((np.sqrt(8 * hex_id.astype(float) + 1) - 1) / 2).astype(np.int64)
+    b = hex_id - w * (w + 1) // 2
+    a = w - b
+    z_inv = lambda n: np.where(n % 2 == 0, n // 2, -(n + 1) // 2)  # noqa: E731
+    return z_inv(a), z_inv(b)
+
+
+def best_of(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(n, max_id_bits):
+    rng = np.random.default_rng(0)
+    hex_id = rng.integers(0, 2**max_id_bits - 1, n, dtype=np.int64, endpoint=True)
+    print(f"n={n:,}  ids < 2**{max_id_bits}")
+
+    (q_old, r_old), t_old = best_of(decode_float_sqrt, hex_id)
+    (q, r), t_new = best_of(decode_hex_id, hex_id)
+    assert (encode_hex_id(q, r) == hex_id).all()
+    wrong = np.count_nonzero((q_old != q) | (r_old != r))
+    print(f"  float sqrt  {n / t_old / 1e6:7.1f} M/s  wrong {wrong:,}")
+    print(f"  exact       {n / t_new / 1e6:7.1f} M/s  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [10_000_000, 63][len(args):]))
@@ -0,0 +1,60 @@
+"""Benchmark the hex ID encodings: label cost and spatial locality.
+
+For each encoding, labels random positions and then mimics a parquet file
+sorted by hex ID and cut into equal row groups: a small-box query reads
+every row group whose [min, max] ID range contains one of the box's hexes.
+
+    python dev/benchmarks/bench_hex_id_encoding.py [n] [n_row_groups]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj
+from hextraj.hex_id import HEX_ID_ENCODINGS
+
+
+def timed(func, *args, **kwargs):
+    tic = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - tic
+
+
+def row_groups_touched(sorted_ids, n_row_groups, query_ids):
+    groups = np.array_split(sorted_ids, n_row_groups)
+    lo = np.array([g[0] for g in groups])
+    hi = np.array([g[-1] for g in groups])
+    # a row group is read if a query ID falls inside its [lo, hi] range
+    i = np.searchsorted(lo, query_ids, side="right") - 1
+    hit = (i >= 0) & (query_ids <= hi[np.maximum(i, 0)])
+    return len(np.unique(i[hit]))
+
+
+def main(n, n_row_groups):
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-20, 10, n)
+    lat = rng.uniform(45, 65, n)
+    # 2 x 1 degree query boxes, at and away from the projection origin
+    boxes = {"centre": (-4, -2, 55, 56), "corner": (6, 8, 61, 62)}
+    print(f"n={n:,}  row groups={n_row_groups}  (row groups read per box)")
+    for encoding in HEX_ID_ENCODINGS:
+        hp = HexProj(
+            lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000,
+            hex_id_encoding=encoding,
+        )
+        hp.label(lon[:10], lat[:10])
+        ids, t_label = timed(hp.label, lon, lat)
+        sorted_ids = np.sort(ids)
+        touched = []
+        for name, (x0, x1, y0, y1) in boxes.items():
+            in_box = (lon > x0) & (lon < x1) & (lat > y0) & (lat < y1)
+            query = np.unique(ids[in_box])
+            touched.append(f"{name} {row_groups_touched(sorted_ids, n_row_groups, query):4d}")
+        print(f"  {encoding:<8} label {n / t_label / 1e6:6.1f} M/s  " + "  ".join(touched))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args or [5_000_000, 200]))
@@ -0,0 +1,44 @@
+"""Benchmark labelling through a HexRaster against HexProj.label.
+
+Builds lookup rasters of a shelf-sea box at a few resolutions and labels
+random positions inside it, reporting build time, raster size, the share
+of cells answered by lookup and the labelling speed-up.
+
+    python dev/benchmarks/bench_hex_raster.py [n]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj, HexRaster
+
+
+def timed(func, *args, **kwargs):
+    tic = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - tic
+
+
+def main(n):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-14, 9, n)
+    lat = rng.uniform(46, 64, n)
+    hp.label(lon[:10], lat[:10])
+    expected, t_label = timed(hp.label, lon, lat)
+    print(f"n={n:,}  HexProj.label {n / t_label / 1e6:6.1f} M/s")
+    for resolution in (0.02, 0.01, 0.005, 0.0025):
+        raster, t_build = timed(HexRaster.build, hp, -15, 10, 45, 65, resolution)
+        ids, t_raster = timed(raster.label, lon, lat)
+        assert (ids == expected).all()
+        print(
+            f"  {resolution:<7} build {t_build:5.1f} s  {raster.hex_ids.nbytes / 2**20:6.0f} MiB  "
+            f"exact {raster.exact_fraction:5.1%}  label {n / t_raster / 1e6:6.1f} M/s "
+            f"({t_label / t_raster:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]] or [5_000_000])
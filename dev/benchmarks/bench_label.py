@@ -0,0 +1,54 @@
+"""Benchmark HexProj.label: fused blockwise kernel vs the unfused pipeline.
+
+Reports wall time, throughput and peak traced memory (numpy allocations are
+visible to tracemalloc) for both paths.
+
+    python dev/benchmarks/bench_label.py [n_positions]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from hextraj import HexProj
+from hextraj.hex_id import encode_hex_id
+
+
+def unfused(hp, lon, lat):
+    hex_soa = hp.lon_lat_to_hex_SoA(lon=lon, lat=lat)
+    return encode_hex_id(hex_soa.q, hex_soa.r)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    tic = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - tic
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(n):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-20, 10, size=n)
+    lat = rng.uniform(45, 65, size=n)
+    input_mb = (lon.nbytes + lat.nbytes) / 2**20
+    print(f"n={n:,}  input={input_mb:.1f} MiB")
+
+    ref, t_ref, peak_ref = measure(unfused, hp, lon, lat)
+    res, t_new, peak_new = measure(hp.label, lon, lat)
+    assert np.array_equal(ref, res)
+
+    for name, t, peak in [("unfused", t_ref, peak_ref), ("fused", t_new, peak_new)]:
+        print(
+            f"{name:>8}: {t:7.3f} s  {n / t / 1e6:6.2f} Mpos/s  "
+            f"peak {peak / 2**20:8.1f} MiB ({peak / (lon.nbytes):4.1f}x lon)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
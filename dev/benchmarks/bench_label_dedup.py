@@ -0,0 +1,48 @@
+"""Benchmark HexProj.label(dedup=True) on repeated release positions.
+
+Particles are released from a fixed number of sites; labels the positions
+with and without deduplication, and all-distinct positions to show the
+cost of the sampling check that skips it.
+
+    python dev/benchmarks/bench_label_dedup.py [n] [n_sites]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj
+
+
+def best_of(func, *args, repeat=3, **kwargs):
+    times = []
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        result = func(*args, **kwargs)
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(n, n_sites):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    site = rng.integers(0, n_sites, n)
+    cases = {
+        f"{n_sites} sites": (rng.uniform(-10, 5, n_sites)[site], rng.uniform(48, 60, n_sites)[site]),
+        "distinct": (rng.uniform(-10, 5, n), rng.uniform(48, 60, n)),
+    }
+    print(f"n={n:,}")
+    for name, (lon, lat) in cases.items():
+        expected, t_plain = best_of(hp.label, lon, lat)
+        ids, t_dedup = best_of(hp.label, lon, lat, dedup=True)
+        assert (ids == expected).all()
+        print(
+            f"  {name:<12} plain {n / t_plain / 1e6:6.1f} M/s  "
+            f"dedup {n / t_dedup / 1e6:6.1f} M/s  ({t_plain / t_dedup:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [5_000_000, 1_000][len(args):]))
@@ -0,0 +1,44 @@
+"""Benchmark HexProj.label with a regional domain on global positions.
+
+Labels uniformly random global positions with no domain, a lon/lat box
+domain and a hex ID domain (a HexGrid of the same region).
+
+    python dev/benchmarks/bench_label_domain.py [n]
+"""
+
+import sys
+import time
+
+import numpy as np
+from shapely.geometry import box
+
+from hextraj import HexGrid, HexProj
+
+
+def best_of(func, *args, repeat=3, **kwargs):
+    times = []
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        result = func(*args, **kwargs)
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(n):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 180, n)
+    lat = rng.uniform(-80, 80, n)
+    region = (-15, 10, 45, 65)
+    grid = HexGrid(hp.region_of_hexes(box(region[0], region[2], region[1], region[3])))
+    print(f"n={n:,}  domain {region}  ({len(grid):,} hexes)")
+    _, t_all = best_of(hp.label, lon, lat)
+    print(f"  no domain  {n / t_all / 1e6:6.1f} M/s")
+    for name, domain in (("bbox", region), ("hex IDs", grid)):
+        ids, t = best_of(hp.label, lon, lat, domain=domain)
+        kept = np.count_nonzero(ids != -1) / n
+        print(f"  {name:<9}  {n / t / 1e6:6.1f} M/s  ({t_all / t:.1f}x, {kept:.1%} kept)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]] or [5_000_000])
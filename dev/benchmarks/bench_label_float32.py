@@ -0,0 +1,54 @@
+"""Benchmark HexProj.label on float32 drifter output.
+
+Compares float32 input labelled with the float64 and float32 compute modes
+against the old behaviour of upcasting the whole input first, and checks
+that all three agree.
+
+    python dev/benchmarks/bench_label_float32.py [n_positions]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from hextraj import HexProj
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    tic = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - tic
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def upcast_first(hp, lon, lat):
+    return hp.label(lon.astype(np.float64), lat.astype(np.float64))
+
+
+def main(n):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-20, 10, size=n).astype(np.float32)
+    lat = rng.uniform(45, 65, size=n).astype(np.float32)
+    print(f"n={n:,}  input={(lon.nbytes + lat.nbytes) / 2**20:.1f} MiB float32")
+
+    runs = [
+        ("upcast", *measure(upcast_first, hp, lon, lat)),
+        ("float64", *measure(hp.label, lon, lat)),
+        ("float32", *measure(hp.label, lon, lat, compute_dtype="float32")),
+    ]
+    for name, res, t, peak in runs:
+        assert np.array_equal(res, runs[0][1])
+        print(
+            f"{name:>8}: {t:7.3f} s  {n / t / 1e6:6.2f} Mpos/s  "
+            f"peak {peak / 2**20:8.1f} MiB ({peak / lon.nbytes:4.1f}x lon)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
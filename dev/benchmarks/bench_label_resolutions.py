@@ -0,0 +1,42 @@
+"""Benchmark labelling one set of positions at several hex sizes.
+
+Compares one ``HexProj.label`` call per resolution against
+``label_resolutions``, which projects each block once for all grids.
+
+    python dev/benchmarks/bench_label_resolutions.py [n_positions]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj, label_resolutions
+
+
+def main(n):
+    hps = [
+        HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=km * 1_000)
+        for km in (5, 10, 25, 50, 100)
+    ]
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-20, 10, size=n)
+    lat = rng.uniform(45, 65, size=n)
+    print(f"n={n:,}  resolutions={len(hps)}")
+
+    tic = time.perf_counter()
+    separate = [hp.label(lon, lat) for hp in hps]
+    t_separate = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    shared = label_resolutions(hps, lon, lat)
+    t_shared = time.perf_counter() - tic
+
+    for a, b in zip(separate, shared):
+        assert np.array_equal(a, b)
+    print(f"  per-HexProj label: {t_separate:7.3f} s")
+    print(f"  label_resolutions: {t_shared:7.3f} s  ({t_separate / t_shared:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,40 @@
+"""Benchmark HexProj.label(n_threads=...) scaling.
+
+    python dev/benchmarks/bench_label_threads.py [n_positions] [max_threads]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from hextraj import HexProj
+
+
+def main(n, max_threads):
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-20, 10, size=n)
+    lat = rng.uniform(45, 65, size=n)
+    out = np.empty(n, dtype=np.int64)
+
+    print(f"n={n:,}  cpus={os.cpu_count()}")
+    t1 = None
+    n_threads = 1
+    while n_threads <= max_threads:
+        tic = time.perf_counter()
+        hp.label(lon, lat, out=out, n_threads=n_threads)
+        t = time.perf_counter() - tic
+        t1 = t1 or t
+        print(
+            f"threads={n_threads:3d}: {t:7.3f} s  {n / t / 1e6:7.2f} Mpos/s  "
+            f"speedup {t1 / t:5.2f}x"
+        )
+        n_threads *= 2
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    max_threads = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    main(n, max_threads)
@@ -0,0 +1,64 @@
+"""Benchmark the scanline rectangle_of_hexes against the parallelogram scan.
+
+The previous ``rectangle_of_hexes`` built a shapely polygon for every hex
+of the axial (q, r) parallelogram spanned by the box corners and tested
+each with ``intersects``; the scanline version enumerates per-row q ranges
+and tests the candidate rings on coordinate arrays. The geometry cache
+is cleared before every call. Also reports IDs the previous scan missed
+where the box boundary bulges outside its corners' parallelogram.
+
+    python dev/benchmarks/bench_rectangle_of_hexes.py [hex_size_meters]
+"""
+
+import sys
+import time
+
+import numpy as np
+from shapely.geometry import box as shapely_box
+
+from hextraj import HexProj
+
+
+def parallelogram_scan(hp, lon_min, lon_max, lat_min, lat_max):
+    """rectangle_of_hexes before the scanline enumeration."""
+    corners = hp.lon_lat_to_hex_SoA(
+        lon=np.array([lon_min, lon_max, lon_max, lon_min]),
+        lat=np.array([lat_min, lat_min, lat_max, lat_max]),
+    )
+    q_range = np.arange(corners.q.min() - 1, corners.q.max() + 2, dtype=np.int64)
+    r_range = np.arange(corners.r.min() - 1, corners.r.max() + 2, dtype=np.int64)
+    q_mesh, r_mesh = np.meshgrid(q_range, r_range, indexing="ij")
+    hex_ids = hp.encode_hex_id(q_mesh.ravel(), r_mesh.ravel())
+    gdf = hp.to_geodataframe(hex_ids)
+    mask = gdf.geometry.intersects(shapely_box(lon_min, lat_min, lon_max, lat_max))
+    return hex_ids[mask.values]
+
+
+def best_of(func, hp, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        hp.geometry_cache.cache_clear()
+        tic = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(hex_size_meters):
+    hp = HexProj(lon_origin=-40.0, lat_origin=45.0, hex_size_meters=hex_size_meters)
+    hp.geometry_cache.maxsize = 1 << 24
+    bbox = (-80.0, 0.0, 20.0, 70.0)  # North Atlantic
+    print(f"hex_size={hex_size_meters:,} m  bbox={bbox}")
+
+    old, t_old = best_of(lambda: parallelogram_scan(hp, *bbox), hp)
+    new, t_new = best_of(lambda: hp.rectangle_of_hexes(*bbox), hp)
+    missed = np.setdiff1d(new, old).shape[0]
+    assert np.setdiff1d(old, new).shape[0] == 0
+    print(f"  parallelogram  {t_old:7.2f} s  {old.shape[0]:>10,} hexes")
+    print(f"  scanline       {t_new:7.2f} s  {new.shape[0]:>10,} hexes  "
+          f"({t_old / t_new:.1f}x, {missed:,} previously missed)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    main(*(args or [10_000]))
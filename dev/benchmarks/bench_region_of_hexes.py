@@ -0,0 +1,71 @@
+"""Benchmark region_of_hexes against testing every bbox hex polygon.
+
+The previous ``region_of_hexes`` built polygons for all hexes of the
+region's bounding box and tested each with ``intersects``; the current
+one traces the region's rings through the HexProj plane, decides hexes
+clear of the boundary by their centre and tests only boundary hexes.
+The region is a rough, coastline-like polygon with a hole. The geometry
+cache is cleared before every call. Also times the tiled scan on a pool of
+threads.
+
+    python dev/benchmarks/bench_region_of_hexes.py [hex_size_meters] [n_vertices] [n_threads]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from shapely.geometry import Point, Polygon
+
+from hextraj import HexProj
+
+
+def bbox_polygons(hp, region):
+    """region_of_hexes before the projected-plane scan."""
+    lon_min, lat_min, lon_max, lat_max = region.bounds
+    candidates = hp.rectangle_of_hexes(lon_min, lon_max, lat_min, lat_max)
+    mask = hp.to_geodataframe(candidates).geometry.intersects(region)
+    return candidates[mask.values]
+
+
+def coastline(n_vertices, seed=0):
+    rng = np.random.default_rng(seed)
+    theta = np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+    # 1/f-like roughness over many scales
+    k = np.arange(1, n_vertices // 4)
+    amplitude = rng.normal(0, 1, k.shape[0]) / k
+    phase = rng.uniform(0, 2 * np.pi, k.shape[0])
+    radius = 1 + 0.15 * np.cos(np.outer(theta, k) + phase) @ amplitude
+    region = Polygon(np.c_[3 + 9 * radius * np.cos(theta), 56 + 6 * radius * np.sin(theta)])
+    return region.buffer(0).difference(Point(3, 56).buffer(1.0))
+
+
+def best_of(func, hp, repeat=3):
+    times = []
+    for _ in range(repeat):
+        hp.geometry_cache.cache_clear()
+        tic = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - tic)
+    return result, min(times)
+
+
+def main(hex_size_meters, n_vertices, n_threads):
+    hp = HexProj(lon_origin=3.0, lat_origin=56.0, hex_size_meters=hex_size_meters)
+    region = coastline(n_vertices)
+    print(f"hex_size={hex_size_meters:,} m  vertices={n_vertices:,}")
+
+    new, t_new = best_of(lambda: hp.region_of_hexes(region), hp)
+    old, t_old = best_of(lambda: bbox_polygons(hp, region), hp, repeat=1)
+    assert np.array_equal(old, new)
+    print(f"  bbox polygons  {t_old:7.2f} s  {old.shape[0]:>10,} hexes")
+    print(f"  plane scan     {t_new:7.2f} s  ({t_old / t_new:.1f}x)")
+    threaded, t_threaded = best_of(lambda: hp.region_of_hexes(region, n_threads=n_threads), hp)
+    assert np.array_equal(threaded, new)
+    print(f"  {n_threads:2d} threads     {t_threaded:7.2f} s  ({t_old / t_threaded:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*(args + [2_000, 20_000, os.cpu_count()][len(args):]))
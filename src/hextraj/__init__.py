@@ -1,8 +1,14 @@
 """hextraj: hex-grid labelling for trajectory data.
 
-Public API: HexProj, hex_counts, hex_connectivity, hex_connectivity_power,
-hex_connectivity_dask.
+Public API: HexProj, label_resolutions, HexRuns, HexGrid, HexRaster, LabelScratch,
+hex_counts, hex_connectivity, hex_connectivity_power, hex_connectivity_dask,
+HexFrame, with_geometry.
 """
 
-from .hexproj import HexProj
+from .hexproj import HexProj, label_resolutions
+from ._label import LabelScratch
+from .hex_runs import HexRuns
+from .hex_grid import HexGrid, OUT_OF_GRID
+from .hex_raster import HexRaster
 from .hex_analysis import hex_counts, hex_counts_lazy, hex_connectivity, hex_connectivity_power, hex_connectivity_dask
+from .hex_analysis import HexFrame, with_geometry
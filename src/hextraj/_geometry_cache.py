@@ -0,0 +1,188 @@
+"""Per-HexProj cache of hex polygon corners and centres in lon/lat.
+
+Building polygons or edge lines for hex IDs means decoding them, placing
+corners in projected space and inverse-projecting through PROJ, on every
+call. ``HexGeometryCache`` keeps the lon/lat results keyed by hex ID in
+sorted arrays, so repeated calls over the same domain are a
+``searchsorted`` and a gather. Lookups, inserts and evictions are all
+vectorised over the requested IDs; recency is tracked per call (a tick
+per lookup) and the least recently used entries are evicted in bulk once
+a store holds more than ``maxsize`` hexes. A single lookup of more
+distinct hexes than ``maxsize`` is computed and returned without being
+stored.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Hexes per store (corners and centres each) of a new HexGeometryCache.
+# A corner entry is 128 bytes, so the default corner store stays under
+# 32 MiB.
+GEOMETRY_CACHE_SIZE = 1 << 18
+
+
+class CacheInfo(NamedTuple):
+    """Hit / miss statistics of one store, counted per distinct hex ID."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class _LRUHexArrays:
+    """Sorted-array LRU store of a fixed-shape float64 value per hex ID."""
+
+    def __init__(self, value_shape: tuple[int, ...], compute: Callable, maxsize: int):
+        self.value_shape = value_shape
+        self.compute = compute
+        self.maxsize = maxsize
+        self.clear()
+
+    def clear(self) -> None:
+        self.ids = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0,) + self.value_shape)
+        self.ticks = np.empty(0, dtype=np.int64)
+        self.clock = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _find(self, ids: NDArray[np.int64]) -> tuple[NDArray[np.int64], NDArray[np.bool_]]:
+        pos = np.searchsorted(self.ids, ids)
+        found = pos < self.ids.shape[0]
+        found[found] = self.ids[pos[found]] == ids[found]
+        return pos, found
+
+    def get(self, hex_ids: NDArray[np.int64]) -> np.ndarray:
+        ids, inverse = np.unique(hex_ids, return_inverse=True)
+        pos, found = self._find(ids)
+        n_found = int(np.count_nonzero(found))
+        self.hits += n_found
+        self.misses += ids.shape[0] - n_found
+        if ids.shape[0] > self.maxsize:
+            # more hexes than the store holds: inserting them would copy
+            # the store only to evict most of them (and the useful rest)
+            values = np.empty((ids.shape[0],) + self.value_shape)
+            values[found] = self.values[pos[found]]
+            if n_found < ids.shape[0]:
+                values[~found] = self.compute(ids[~found])
+            return values[inverse.reshape(-1)]
+        if n_found < ids.shape[0]:
+            new = ids[~found]
+            values = self.compute(new)
+            insert_at = pos[~found]
+            self.ids = np.insert(self.ids, insert_at, new)
+            self.values = np.insert(self.values, insert_at, values, axis=0)
+            self.ticks = np.insert(self.ticks, insert_at, 0)
+            pos, _ = self._find(ids)
+        self.ticks[pos] = self.clock
+        self.clock += 1
+        result = self.values[pos[inverse.reshape(-1)]]
+        self._evict()
+        return result
+
+    def _evict(self) -> None:
+        excess = self.ids.shape[0] - self.maxsize
+        if excess <= 0:
+            return
+        drop = np.argpartition(self.ticks, excess - 1)[:excess]
+        keep = np.ones(self.ids.shape[0], dtype=bool)
+        keep[drop] = False
+        self.ids = self.ids[keep]
+        self.values = self.values[keep]
+        self.ticks = self.ticks[keep]
+        self.evictions += excess
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, self.ids.shape[0]
+        )
+
+
+class HexGeometryCache:
+    """Bounded LRU cache of hex corner and centre lon/lat, keyed by hex ID.
+
+    Every ``HexProj`` owns one as ``hexproj.geometry_cache``; the geometry
+    helpers (``to_geodataframe``, ``edges_geodataframe``,
+    ``rectangle_of_hexes``, ``region_of_hexes`` and the ``hex_counts`` /
+    ``hex_connectivity`` geometry) read through it. Thread-safe.
+
+    Attributes:
+        maxsize: Hexes kept per store (corners and centres each). Lowering
+            it takes effect at the next lookup.
+    """
+
+    def __init__(
+        self,
+        corners: Callable,
+        centres: Callable,
+        maxsize: int = GEOMETRY_CACHE_SIZE,
+    ):
+        """Set up empty stores.
+
+        Args:
+            corners: Maps valid int64 hex IDs to ``(N, 7, 2)`` lon/lat of
+                their closed polygon rings.
+            centres: Maps valid int64 hex IDs to ``(N, 2)`` lon/lat of
+                their centres.
+            maxsize: Hexes kept per store.
+        """
+        self._lock = threading.Lock()
+        self._corners = _LRUHexArrays((7, 2), corners, maxsize)
+        self._centres = _LRUHexArrays((2,), centres, maxsize)
+
+    @property
+    def maxsize(self) -> int:
+        return self._corners.maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        self._corners.maxsize = self._centres.maxsize = int(value)
+
+    def corners(self, hex_ids: NDArray[np.int64]) -> NDArray[np.float64]:
+        """Closed polygon rings of valid hex IDs.
+
+        Args:
+            hex_ids: 1-D int64 hex IDs, none of them INVALID_HEX_ID.
+
+        Returns:
+            ``(N, 7, 2)`` float64 lon/lat, first and last corner equal.
+        """
+        with self._lock:
+            return self._corners.get(np.asarray(hex_ids, dtype=np.int64))
+
+    def centres(self, hex_ids: NDArray[np.int64]) -> NDArray[np.float64]:
+        """Centres of valid hex IDs.
+
+        Args:
+            hex_ids: 1-D int64 hex IDs, none of them INVALID_HEX_ID.
+
+        Returns:
+            ``(N, 2)`` float64 lon/lat.
+        """
+        with self._lock:
+            return self._centres.get(np.asarray(hex_ids, dtype=np.int64))
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """Statistics per store, as ``{"corners": ..., "centres": ...}``."""
+        with self._lock:
+            return {"corners": self._corners.info(), "centres": self._centres.info()}
+
+    def cache_clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._corners.clear()
+            self._centres.clear()
+
+    def __repr__(self) -> str:
+        """Repr."""
+        info = self.cache_info()
+        return (
+            f"HexGeometryCache(maxsize={self.maxsize}, "
+            f"corners={info['corners'].currsize}, centres={info['centres'].currsize})"
+        )
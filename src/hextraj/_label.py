@@ -0,0 +1,485 @@
+"""Fused, blockwise labelling kernel: lon/lat -> projected x/y -> int64 hex IDs.
+
+``HexProj.label`` used to chain ``_transform_lon_lat_to_proj``,
+``pixel_to_hex``, ``hex_round`` and ``encode_hex_id``, each of which
+allocates several full-size temporaries. The kernel here walks the input in
+blocks of ``block_size`` elements and performs every step in place on a
+small, reusable ``LabelScratch``, so peak memory is the input plus the int64
+output plus a constant of roughly ``12 * block_size * 8`` bytes.
+
+Results are bit-for-bit identical to the unfused chain for finite input:
+the float operations are the same and run in the same order. Non-finite
+projected positions (NaN input, points PROJ cannot project) map to
+``INVALID_HEX_ID``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pyproj
+
+from .hex_id import (
+    _ENCODE_INPLACE,
+    INVALID_HEX_ID,
+    _cantor_encode_inplace,
+    _narrow_into,
+)
+
+
+BLOCK_SIZE = 1 << 16
+
+
+class LabelScratch:
+    """Preallocated per-block buffers for the labelling kernel.
+
+    Pass one to ``HexProj.label(..., scratch=...)`` to reuse the same buffers
+    across calls. The ``x`` and ``y`` buffers are the scratch space the
+    pyproj transform runs on in place. A scratch object must not be shared
+    between concurrent calls.
+
+    Args:
+        block_size: Number of positions processed per block.
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE) -> None:
+        self.block_size = int(block_size)
+        if self.block_size < 1:
+            raise ValueError("block_size must be at least 1.")
+        n = self.block_size
+        # x, y double as the projection scratch buffers
+        self.x = np.empty(n, dtype=np.float64)
+        self.y = np.empty(n, dtype=np.float64)
+        self.q = np.empty(n, dtype=np.float64)
+        self.r = np.empty(n, dtype=np.float64)
+        self.s = np.empty(n, dtype=np.float64)
+        self.qr = np.empty(n, dtype=np.float64)
+        self.rr = np.empty(n, dtype=np.float64)
+        self.sr = np.empty(n, dtype=np.float64)
+        self.qi = np.empty(n, dtype=np.int64)
+        self.ri = np.empty(n, dtype=np.int64)
+        self.m1 = np.empty(n, dtype=bool)
+        self.m2 = np.empty(n, dtype=bool)
+        self.m3 = np.empty(n, dtype=bool)
+        self._float32 = None
+        self._ids = None
+
+    def id_buffer(self) -> np.ndarray:
+        """int64 block buffer for labelling into int32 output, made on first use."""
+        if self._ids is None:
+            self._ids = np.empty(self.block_size, dtype=np.int64)
+        return self._ids
+
+    def float32_buffers(self) -> tuple[np.ndarray, ...]:
+        """Nine float32 block buffers for ``compute_dtype="float32"``, made on first use."""
+        if self._float32 is None:
+            self._float32 = tuple(
+                np.empty(self.block_size, dtype=np.float32) for _ in range(9)
+            )
+        return self._float32
+
+
+def _scale_xy(layout, x, y) -> None:
+    """First step of pixel_to_hex, in place: x, y -> layout-scaled pt.x, pt.y."""
+    np.subtract(x, layout.origin.x, out=x)
+    np.divide(x, layout.size.x, out=x)
+    np.subtract(y, layout.origin.y, out=y)
+    np.divide(y, layout.size.y, out=y)
+
+
+def _label_xy_block(
+    layout, x, y, out, ws: LabelScratch, encode=_cantor_encode_inplace
+) -> None:
+    """Label one block of projected coordinates in place.
+
+    ``x`` and ``y`` are overwritten (they end up holding the layout-scaled
+    coordinates). All other temporaries live in ``ws``. ``encode`` is one of
+    the ``hex_id._ENCODE_INPLACE`` kernels.
+    """
+    _scale_xy(layout, x, y)
+    _round_encode_block(layout, x, y, out, ws, encode)
+
+
+def _round_encode_block(
+    layout, x, y, out, ws: LabelScratch, encode=_cantor_encode_inplace
+) -> None:
+    """Hex-round and encode layout-scaled float64 coordinates into ``out``."""
+    n = out.shape[0]
+    M = layout.orientation
+    q, r, s = ws.q[:n], ws.r[:n], ws.s[:n]
+    qr, rr, sr = ws.qr[:n], ws.rr[:n], ws.sr[:n]
+    qi, ri = ws.qi[:n], ws.ri[:n]
+    m1, m2, m3 = ws.m1[:n], ws.m2[:n], ws.m3[:n]
+
+    # pixel_to_hex (after scaling)
+    np.multiply(y, M.b1, out=s)
+    np.multiply(x, M.b0, out=q)
+    np.add(q, s, out=q)
+    np.multiply(y, M.b3, out=s)
+    np.multiply(x, M.b2, out=r)
+    np.add(r, s, out=r)
+    np.negative(q, out=s)
+    np.subtract(s, r, out=s)
+
+    # hex_round: q, r, s are replaced by the rounding residuals
+    np.rint(q, out=qr)
+    np.rint(r, out=rr)
+    np.rint(s, out=sr)
+    np.subtract(qr, q, out=q)
+    np.abs(q, out=q)
+    np.subtract(rr, r, out=r)
+    np.abs(r, out=r)
+    np.subtract(sr, s, out=s)
+    np.abs(s, out=s)
+
+    np.greater(q, r, out=m1)
+    np.greater(q, s, out=m2)
+    np.logical_and(m1, m2, out=m1)  # fix q
+    np.greater(r, s, out=m2)
+    np.logical_not(m1, out=m3)
+    np.logical_and(m2, m3, out=m2)  # fix r
+
+    np.negative(rr, out=q)
+    np.subtract(q, sr, out=q)  # -ri - si
+    np.negative(qr, out=r)
+    np.subtract(r, sr, out=r)  # -qi - si
+    # select by arithmetic, not np.copyto(where=): much faster on the
+    # mixed masks seen here, and exact since all operands are integral
+    np.subtract(q, qr, out=q)
+    np.multiply(q, m1, out=q)
+    np.add(qr, q, out=qr)
+    np.subtract(r, rr, out=r)
+    np.multiply(r, m2, out=r)
+    np.add(rr, r, out=rr)
+
+    # invalid where the projection did not produce a finite position
+    np.isfinite(x, out=m1)
+    np.isfinite(y, out=m2)
+    np.logical_and(m1, m2, out=m1)
+    np.logical_not(m1, out=m3)
+    np.copyto(qr, 0.0, where=m3)
+    np.copyto(rr, 0.0, where=m3)
+    np.copyto(qi, qr, casting="unsafe")
+    np.copyto(ri, rr, casting="unsafe")
+
+    encode(qi, ri, out)
+    np.copyto(out, INVALID_HEX_ID, where=m3)
+
+
+# Bound on the float32 error of q, r, s and their rounding residuals, in
+# units of eps32 * (|pt.x| + |pt.y| + 1). Conservative: the actual
+# worst case is a handful of ulps.
+_FLOAT32_TOLERANCE = 16 * float(np.finfo(np.float32).eps)
+
+
+def _label_xy_block_float32(
+    layout, x, y, out, ws: LabelScratch, encode=_cantor_encode_inplace
+) -> None:
+    """Like ``_label_xy_block`` but scales and hex-rounds in float32.
+
+    Positions whose float32 rounding decision is within the error bound of
+    a tie (a residual near 0.5, or two residuals nearly equal) are
+    recomputed with the float64 kernel, so the output equals
+    ``_label_xy_block`` exactly. ``x`` and ``y`` are left unscaled.
+    """
+    n = out.shape[0]
+    M = layout.orientation
+    size = layout.size
+    origin = layout.origin
+    X, Y, Q, R, S, QR, RR, SR, TOL = (b[:n] for b in ws.float32_buffers())
+    qi, ri = ws.qi[:n], ws.ri[:n]
+    m1, m2, m3 = ws.m1[:n], ws.m2[:n], ws.m3[:n]
+
+    np.copyto(X, x, casting="same_kind")
+    np.subtract(X, origin.x, out=X)
+    np.divide(X, size.x, out=X)
+    np.copyto(Y, y, casting="same_kind")
+    np.subtract(Y, origin.y, out=Y)
+    np.divide(Y, size.y, out=Y)
+
+    np.multiply(Y, M.b1, out=S)
+    np.multiply(X, M.b0, out=Q)
+    np.add(Q, S, out=Q)
+    np.multiply(Y, M.b3, out=S)
+    np.multiply(X, M.b2, out=R)
+    np.add(R, S, out=R)
+    np.negative(Q, out=S)
+    np.subtract(S, R, out=S)
+
+    np.rint(Q, out=QR)
+    np.rint(R, out=RR)
+    np.rint(S, out=SR)
+    np.subtract(QR, Q, out=Q)
+    np.abs(Q, out=Q)
+    np.subtract(RR, R, out=R)
+    np.abs(R, out=R)
+    np.subtract(SR, S, out=S)
+    np.abs(S, out=S)
+
+    # error bound per position; the origin terms cover the scaling step
+    np.abs(X, out=TOL)
+    np.isfinite(X, out=m1)
+    np.abs(Y, out=X)
+    np.isfinite(Y, out=m2)
+    np.logical_and(m1, m2, out=m1)
+    np.logical_not(m1, out=m3)  # invalid
+    np.add(TOL, X, out=TOL)
+    np.add(
+        TOL,
+        1 + abs(origin.x / size.x) + abs(origin.y / size.y),
+        out=TOL,
+    )
+    np.multiply(TOL, _FLOAT32_TOLERANCE, out=TOL)
+
+    # ambiguous: some residual near 0.5 or two residuals near-equal
+    np.maximum(Q, R, out=X)
+    np.maximum(X, S, out=X)
+    np.add(X, TOL, out=X)
+    np.greater_equal(X, 0.5, out=m1)
+    np.subtract(Q, R, out=X)
+    np.abs(X, out=X)
+    np.less_equal(X, TOL, out=m2)
+    np.logical_or(m1, m2, out=m1)
+    np.subtract(Q, S, out=X)
+    np.abs(X, out=X)
+    np.less_equal(X, TOL, out=m2)
+    np.logical_or(m1, m2, out=m1)
+    np.subtract(R, S, out=X)
+    np.abs(X, out=X)
+    np.less_equal(X, TOL, out=m2)
+    np.logical_or(m1, m2, out=m1)
+    np.logical_not(m3, out=m2)
+    np.logical_and(m1, m2, out=m1)  # invalid needs no fallback
+    ambiguous = np.flatnonzero(m1)
+
+    # hex rounding; X and Y are free
+    np.negative(RR, out=X)
+    np.subtract(X, SR, out=X)
+    np.negative(QR, out=Y)
+    np.subtract(Y, SR, out=Y)
+    np.greater(Q, R, out=m1)
+    np.greater(Q, S, out=m2)
+    np.logical_and(m1, m2, out=m1)
+    np.subtract(X, QR, out=X)
+    np.multiply(X, m1, out=X)
+    np.add(QR, X, out=QR)
+    np.greater(R, S, out=m2)
+    np.logical_not(m1, out=m1)
+    np.logical_and(m2, m1, out=m2)
+    np.subtract(Y, RR, out=Y)
+    np.multiply(Y, m2, out=Y)
+    np.add(RR, Y, out=RR)
+
+    np.copyto(QR, 0.0, where=m3)
+    np.copyto(RR, 0.0, where=m3)
+    np.copyto(qi, QR, casting="unsafe")
+    np.copyto(ri, RR, casting="unsafe")
+    encode(qi, ri, out)
+    np.copyto(out, INVALID_HEX_ID, where=m3)
+
+    if ambiguous.size:
+        exact = np.empty(ambiguous.size, dtype=np.int64)
+        _label_xy_block(layout, x[ambiguous], y[ambiguous], exact, ws, encode)
+        out[ambiguous] = exact
+
+
+_KERNELS = {"float64": _label_xy_block, "float32": _label_xy_block_float32}
+
+
+def _run_kernel(kernel, layout, x, y, out, ws: LabelScratch, encode) -> None:
+    """Run ``kernel`` into an output block, going through int64 scratch for int32."""
+    ids = out if out.dtype == np.int64 else ws.id_buffer()[: out.shape[0]]
+    # non-finite positions (inf * 0 and friends) are masked at the end
+    with np.errstate(invalid="ignore"):
+        kernel(layout, x, y, ids, ws, encode)
+    if ids is not out:
+        _narrow_into(ids, out)
+
+
+def label_lon_lat(
+    transformer,
+    layout,
+    lon: np.ndarray,
+    lat: np.ndarray,
+    out: np.ndarray,
+    scratch: LabelScratch | None = None,
+    compute_dtype: str = "float64",
+    encoding: str = "cantor",
+) -> np.ndarray:
+    """Label flat lon/lat arrays into ``out`` block by block.
+
+    Args:
+        transformer: pyproj.Transformer from WGS84 to the projected CRS.
+        layout: Hex layout in projected space.
+        lon: 1D float array of longitudes.
+        lat: 1D float array of latitudes, same length as lon.
+        out: 1D int64 (or int32) array receiving the hex IDs, same length as lon.
+        scratch: Buffers to reuse. A fresh ``LabelScratch`` is used if None.
+        compute_dtype: "float64" or "float32" hex rounding. Projection is
+            always float64.
+        encoding: Hex ID encoding, one of ``hex_id.HEX_ID_ENCODINGS``.
+
+    Returns:
+        ``out``.
+    """
+    kernel = _KERNELS[compute_dtype]
+    encode = _ENCODE_INPLACE[encoding]
+    ws = scratch if scratch is not None else LabelScratch()
+    bs = ws.block_size
+    for start in range(0, out.shape[0], bs):
+        stop = min(start + bs, out.shape[0])
+        n = stop - start
+        x, y = ws.x[:n], ws.y[:n]
+        np.copyto(x, lon[start:stop])
+        np.copyto(y, lat[start:stop])
+        transformer.transform(
+            x, y, direction=pyproj.enums.TransformDirection.FORWARD, inplace=True
+        )
+        _run_kernel(kernel, layout, x, y, out[start:stop], ws, encode)
+    return out
+
+
+def label_xy(
+    layout,
+    x: np.ndarray,
+    y: np.ndarray,
+    out: np.ndarray,
+    scratch: LabelScratch | None = None,
+    compute_dtype: str = "float64",
+    encoding: str = "cantor",
+) -> np.ndarray:
+    """Label flat projected x/y arrays into ``out`` block by block.
+
+    Same as ``label_lon_lat`` minus the projection step; ``x`` and ``y`` are
+    not modified.
+
+    Args:
+        layout: Hex layout in projected space.
+        x: 1D float array of projected x coordinates.
+        y: 1D float array of projected y coordinates, same length as x.
+        out: 1D int64 (or int32) array receiving the hex IDs, same length as x.
+        scratch: Buffers to reuse. A fresh ``LabelScratch`` is used if None.
+        compute_dtype: "float64" or "float32" hex rounding.
+        encoding: Hex ID encoding, one of ``hex_id.HEX_ID_ENCODINGS``.
+
+    Returns:
+        ``out``.
+    """
+    kernel = _KERNELS[compute_dtype]
+    encode = _ENCODE_INPLACE[encoding]
+    ws = scratch if scratch is not None else LabelScratch()
+    bs = ws.block_size
+    for start in range(0, out.shape[0], bs):
+        stop = min(start + bs, out.shape[0])
+        n = stop - start
+        xb, yb = ws.x[:n], ws.y[:n]
+        np.copyto(xb, x[start:stop])
+        np.copyto(yb, y[start:stop])
+        _run_kernel(kernel, layout, xb, yb, out[start:stop], ws, encode)
+    return out
+
+
+def label_lon_lat_multi(
+    transformer,
+    layouts,
+    lon: np.ndarray,
+    lat: np.ndarray,
+    outs,
+    scratch: LabelScratch | None = None,
+    compute_dtype: str = "float64",
+    encodings=None,
+) -> list:
+    """Label flat lon/lat arrays on several layouts, projecting each block once.
+
+    Args:
+        transformer: pyproj.Transformer from WGS84 to the projected CRS
+            shared by all layouts.
+        layouts: Sequence of hex layouts in projected space.
+        lon: 1D float array of longitudes.
+        lat: 1D float array of latitudes, same length as lon.
+        outs: Sequence of 1D int64 (or int32) arrays, one per layout, same
+            length as lon.
+        scratch: Buffers to reuse. A fresh ``LabelScratch`` is used if None.
+        compute_dtype: "float64" or "float32" hex rounding.
+        encodings: Sequence of hex ID encodings, one per layout. All
+            "cantor" if None.
+
+    Returns:
+        ``outs`` as a list.
+    """
+    kernel = _KERNELS[compute_dtype]
+    if encodings is None:
+        encodings = ["cantor"] * len(layouts)
+    encoders = [_ENCODE_INPLACE[e] for e in encodings]
+    ws = scratch if scratch is not None else LabelScratch()
+    bs = ws.block_size
+    n_total = lon.shape[0]
+    # projected block, kept intact while ws.x / ws.y are clobbered per layout
+    px = np.empty(min(bs, n_total))
+    py = np.empty(min(bs, n_total))
+    for start in range(0, n_total, bs):
+        stop = min(start + bs, n_total)
+        n = stop - start
+        xp, yp = px[:n], py[:n]
+        np.copyto(xp, lon[start:stop])
+        np.copyto(yp, lat[start:stop])
+        transformer.transform(
+            xp, yp, direction=pyproj.enums.TransformDirection.FORWARD, inplace=True
+        )
+        x, y = ws.x[:n], ws.y[:n]
+        for layout, out, encode in zip(layouts, outs, encoders):
+            np.copyto(x, xp)
+            np.copyto(y, yp)
+            _run_kernel(kernel, layout, x, y, out[start:stop], ws, encode)
+    return list(outs)
+
+
+def label_lon_lat_threaded(
+    thread_state,
+    layout,
+    lon: np.ndarray,
+    lat: np.ndarray,
+    out: np.ndarray,
+    n_threads: int,
+    executor,
+    compute_dtype: str = "float64",
+    encoding: str = "cantor",
+) -> np.ndarray:
+    """Label flat lon/lat arrays into ``out`` using a pool of threads.
+
+    The input is cut into contiguous pieces of whole blocks, a few per thread
+    for load balancing, and each piece is labelled by ``label_lon_lat``. Both
+    pyproj and the numpy kernel release the GIL, so pieces run concurrently.
+
+    Args:
+        thread_state: Callable returning ``(transformer, scratch)`` for the
+            calling thread. Each thread must get its own objects: neither
+            the transformer nor the scratch buffers are shared.
+        layout: Hex layout in projected space.
+        lon: 1D float array of longitudes.
+        lat: 1D float array of latitudes, same length as lon.
+        out: 1D int64 (or int32) array receiving the hex IDs, same length as lon.
+        n_threads: Number of worker threads.
+        executor: ``concurrent.futures.Executor`` with ``n_threads``
+            workers to run the pieces on.
+        compute_dtype: "float64" or "float32" hex rounding.
+        encoding: Hex ID encoding, one of ``hex_id.HEX_ID_ENCODINGS``.
+
+    Returns:
+        ``out``.
+    """
+    n = out.shape[0]
+    n_pieces = 4 * n_threads
+    piece = -(-n // n_pieces)
+    piece = max(BLOCK_SIZE, -(-piece // BLOCK_SIZE) * BLOCK_SIZE)
+
+    def _work(start):
+        transformer, scratch = thread_state()
+        stop = min(start + piece, n)
+        label_lon_lat(
+            transformer, layout, lon[start:stop], lat[start:stop], out[start:stop],
+            scratch=scratch, compute_dtype=compute_dtype, encoding=encoding,
+        )
+
+    # list() re-raises the first worker exception here
+    list(executor.map(_work, range(0, n, piece)))
+    return out
@@ -1,26 +1,99 @@
 """Projection utilities: pyproj.Proj and WGS84 transformer factory."""
 
+import threading
+from collections import OrderedDict
+
 import pyproj
 
+from ._numpy_proj import SUPPORTED_PROJECTIONS, NumpyTransformer
+
+
+PROJECTION_BACKENDS = ("pyproj", "numpy")
+
+
+def check_backend(projection_name, backend):
+    """Raise ValueError if ``backend`` cannot build ``projection_name``."""
+    if backend not in PROJECTION_BACKENDS:
+        raise ValueError(
+            f"projection_backend must be one of {PROJECTION_BACKENDS}, got {backend!r}."
+        )
+    if backend == "numpy" and projection_name not in SUPPORTED_PROJECTIONS:
+        raise ValueError(
+            f"projection_backend='numpy' supports {SUPPORTED_PROJECTIONS}, "
+            f"not {projection_name!r}."
+        )
+
 
-def make_transformer(projection_name, lat_origin, lon_origin):
+def make_transformer(projection_name, lat_origin, lon_origin, backend="pyproj"):
     """Build a pyproj.Proj and a WGS84 <-> projected Transformer.
 
     Args:
         projection_name (str): Proj projection name, e.g. "laea".
         lat_origin (float): Latitude of the projection origin.
         lon_origin (float): Longitude of the projection origin.
+        backend (str): "pyproj" (default) for a PROJ Transformer, or
+            "numpy" for the vectorised ``NumpyTransformer`` (laea, stere
+            and merc only).
 
     Returns:
-        Tuple of (pyproj.Proj, pyproj.Transformer). The Transformer converts
+        Tuple of (pyproj.Proj, Transformer). The Transformer converts
         in the forward direction from WGS84 (lon, lat) to the projected CRS;
         use ``direction=pyproj.enums.TransformDirection.INVERSE`` for the reverse.
+
+    Raises:
+        ValueError: For an unknown backend, or a projection the numpy
+            backend does not implement.
     """
+    check_backend(projection_name, backend)
     proj = pyproj.Proj(
         f"+proj={projection_name} +lat_0={lat_origin} +lon_0={lon_origin} "
         "+datum=WGS84 +units=m"
     )
+    if backend == "numpy":
+        return proj, NumpyTransformer(projection_name, lat_origin, lon_origin)
     transformer = pyproj.Transformer.from_crs(
         "epsg:4326", proj.crs, always_xy=True
     )
     return proj, transformer
+
+
+# Bounded LRU memo of make_transformer, keyed by projection parameters.
+TRANSFORMER_CACHE_SIZE = 64
+_transformer_cache: OrderedDict = OrderedDict()
+_transformer_cache_lock = threading.Lock()
+
+
+def cached_transformer(projection_name, lat_origin, lon_origin, backend="pyproj"):
+    """Process-wide, thread-safe memo of ``make_transformer``.
+
+    Holds up to ``TRANSFORMER_CACHE_SIZE`` entries, evicting the least
+    recently used. Each configuration is built exactly once while cached,
+    even when several threads ask for it at the same time. Unpickled
+    ``HexProj`` objects on a dask worker resolve their transformer here, so
+    it is built once per worker process rather than once per task.
+
+    Args:
+        projection_name (str): Proj projection name, e.g. "laea".
+        lat_origin (float): Latitude of the projection origin.
+        lon_origin (float): Longitude of the projection origin.
+        backend (str): "pyproj" or "numpy".
+
+    Returns:
+        The cached (Proj, Transformer) tuple.
+    """
+    key = (projection_name, float(lat_origin), float(lon_origin), backend)
+    with _transformer_cache_lock:
+        if key in _transformer_cache:
+            _transformer_cache.move_to_end(key)
+            return _transformer_cache[key]
+        value = make_transformer(projection_name, lat_origin, lon_origin, backend=backend)
+        _transformer_cache[key] = value
+        while len(_transformer_cache) > TRANSFORMER_CACHE_SIZE:
+            _transformer_cache.popitem(last=False)
+        return value
+
+
+def clear_transformer_cache():
+    """Drop all cached transformers."""
+    with _transformer_cache_lock:
+        _transformer_cache.clear()
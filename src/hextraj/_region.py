@@ -0,0 +1,348 @@
+"""Scanline enumeration of the hexes that meet a lon/lat box or region.
+
+``HexProj.rectangle_of_hexes`` and ``region_of_hexes`` used to build a
+polygon for every hex of the axial (q, r) parallelogram around the bounds
+and test each against the box or region with shapely. For a wide box that
+parallelogram holds about twice the hexes needed, and all of them became
+Python geometry objects.
+
+Here the boundary (the box edges, or every ring of the region) is sampled
+densely enough that consecutive samples are at most ``_MAX_STEP`` apart in
+fractional axial coordinates, i.e. in the HexProj plane, and then swept
+row by row: every hex row ``r`` gets the q range spanned by the boundary
+samples near it, widened by ``_SLACK``. A line of constant fractional
+``r`` through any point of the region's image meets the boundary on both
+sides, so these ranges hold every hex that meets it. Candidates well
+clear of every boundary sample are inside or outside as a whole, which
+their centre decides. Only the rings of the others are tested exactly:
+against a box on plain coordinate arrays, with the same closed (touching
+counts) semantics as shapely's ``intersects``, and against a region with
+shapely's ``intersects`` on the prepared region, whose segment index keeps
+each test local.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import redblobhex_array as redblobhex
+from ._label import BLOCK_SIZE
+
+# Largest distance between consecutive boundary samples, in hex units.
+_MAX_STEP = 0.25
+
+# Boundary samples per ring never exceed this.
+_MAX_SAMPLES = 1 << 24
+
+# Row and q range widening, in hex units: a point lies within 2/3 of its
+# hex's centre in both axial coordinates, the lon/lat ring of a hex may
+# reach one hex further than its projected hexagon (in practice it stays
+# far closer), and the boundary between samples may be up to one step
+# away.
+_SLACK = 2 / 3 + 1 + _MAX_STEP
+
+
+def _densify(lon, lat, n) -> tuple[np.ndarray, np.ndarray]:
+    """Points along a closed lon/lat path, ``n[i]`` per segment ``i``."""
+    starts = np.cumsum(n) - n
+    segment = np.repeat(np.arange(n.shape[0]), n)
+    t = (np.arange(int(n.sum())) - starts[segment]) / n[segment]
+    lon_s = lon[segment] + t * (lon[segment + 1] - lon[segment])
+    lat_s = lat[segment] + t * (lat[segment + 1] - lat[segment])
+    return np.append(lon_s, lon[-1]), np.append(lat_s, lat[-1])
+
+
+def _path_frac_hex(hp, lon, lat) -> tuple[np.ndarray, np.ndarray]:
+    """Fractional axial (q, r) along a closed path, at most ``_MAX_STEP`` apart.
+
+    Path segments are straight in lon/lat, as the edges of the shapely
+    polygons are. Each is split evenly until its samples are close enough
+    in the HexProj plane; samples that do not project are dropped.
+    """
+    lon, lat = np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    n = np.ones(lon.shape[0] - 1, dtype=np.int64)
+    while True:
+        # unprojectable samples are inf and turn NaN on the way
+        with np.errstate(invalid="ignore"):
+            frac = redblobhex.pixel_to_hex(
+                hp.hex_layout_projected, hp.project(*_densify(lon, lat, n))
+            )
+            q, r = np.asarray(frac.q, dtype=float), np.asarray(frac.r, dtype=float)
+            steps = np.maximum(np.abs(np.diff(q)), np.abs(np.diff(r)))
+        step = np.fmax.reduceat(steps, np.cumsum(n) - n)
+        coarse = step > _MAX_STEP
+        if not coarse.any() or n.sum() >= _MAX_SAMPLES:
+            keep = np.isfinite(q) & np.isfinite(r)
+            return q[keep], r[keep]
+        n[coarse] = np.ceil(n[coarse] * step[coarse] / _MAX_STEP * 1.25).astype(np.int64)
+
+
+def _paths_frac_hex(hp, paths) -> tuple[np.ndarray, np.ndarray]:
+    """``_path_frac_hex`` of several closed paths, concatenated."""
+    samples = [_path_frac_hex(hp, lon, lat) for lon, lat in paths]
+    if not samples:
+        return np.empty(0), np.empty(0)
+    return np.concatenate([q for q, _ in samples]), np.concatenate([r for _, r in samples])
+
+
+class RowRanges(NamedTuple):
+    """Candidate hexes of a sampled boundary, as q ranges per hex row.
+
+    Row ``rows[i]`` holds the candidates ``q_lo[i] <= q <= q_hi[i]``,
+    numbered ``ends[i - 1]`` to ``ends[i] - 1`` in row order; ``keys`` are
+    the boundary samples near each row, sorted, as
+    ``i * width + (q - q_origin)`` (see ``near_boundary``).
+    """
+
+    rows: NDArray[np.int64]
+    q_lo: NDArray[np.int64]
+    q_hi: NDArray[np.int64]
+    ends: NDArray[np.int64]
+    keys: NDArray[np.float64]
+    width: float
+    q_origin: float
+
+
+def row_ranges(q: NDArray[np.float64], r: NDArray[np.float64]) -> RowRanges:
+    """Candidate q range of every hex row near a sampled boundary.
+
+    Args:
+        q: Fractional axial q of the boundary samples.
+        r: Fractional axial r of the boundary samples.
+
+    Returns:
+        RowRanges of the rows within ``_SLACK`` of a sample.
+    """
+    reach = int(np.ceil(_SLACK))
+    rows = np.round(r).astype(np.int64)[:, None] + np.arange(-reach, reach + 1)
+    near = np.abs(rows - r[:, None]) <= _SLACK
+    sample_q = np.broadcast_to(q[:, None], rows.shape)[near]
+    rows, row_index = np.unique(rows[near], return_inverse=True)
+    q_min = np.full(rows.shape[0], np.inf)
+    q_max = np.full(rows.shape[0], -np.inf)
+    np.minimum.at(q_min, row_index, sample_q)
+    np.maximum.at(q_max, row_index, sample_q)
+    # keys of different rows are further apart than any q distance
+    q_origin = float(q_min.min())
+    width = float(q_max.max()) - q_origin + 4 * _SLACK + 4
+    q_lo = np.floor(q_min - _SLACK).astype(np.int64)
+    q_hi = np.ceil(q_max + _SLACK).astype(np.int64)
+    return RowRanges(
+        rows,
+        q_lo,
+        q_hi,
+        np.cumsum(q_hi - q_lo + 1),
+        np.sort(row_index * width + (sample_q - q_origin)),
+        width,
+        q_origin,
+    )
+
+
+def tile_candidates(ranges: RowRanges, start: int, stop: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Candidates ``start`` to ``stop - 1`` of the row ranges.
+
+    Returns:
+        int64 ``(q, r, row_index)``, ``row_index`` into ``ranges.rows``.
+    """
+    index = np.arange(start, stop, dtype=np.int64)
+    row_index = np.searchsorted(ranges.ends, index, side="right")
+    row_start = ranges.ends[row_index] - (ranges.q_hi - ranges.q_lo + 1)[row_index]
+    q = index - row_start + ranges.q_lo[row_index]
+    return q, ranges.rows[row_index], row_index
+
+
+def near_boundary(ranges: RowRanges, q: NDArray[np.int64], row_index: NDArray[np.int64]) -> NDArray[np.bool_]:
+    """Which candidates may have their ring cross the sampled boundary.
+
+    Any other candidate lies entirely inside or entirely outside the
+    region, which its centre decides: every boundary sample is over
+    ``_SLACK`` rows or ``_SLACK + 1/2`` in q away, so the boundary passes
+    well clear of the ring.
+
+    Args:
+        ranges: RowRanges the candidates came from.
+        q: Axial q of the candidates.
+        row_index: Their index into ``ranges.rows``.
+
+    Returns:
+        bool, True for candidates that need the exact ring test.
+    """
+    keys = ranges.keys
+    key = row_index * ranges.width + (q - ranges.q_origin)
+    pos = np.searchsorted(keys, key)
+    after = keys[np.minimum(pos, keys.shape[0] - 1)] - key
+    before = key - keys[np.maximum(pos - 1, 0)]
+    return np.minimum(np.abs(after), np.abs(before)) <= _SLACK + 0.5
+
+
+def rings_intersect_box(corners: NDArray[np.float64], lon_min, lon_max, lat_min, lat_max) -> NDArray[np.bool_]:
+    """Which closed rings meet a lon/lat box (boundaries touching count).
+
+    A ring meets the box if one of its edges does, or if it contains the
+    box. An edge meets the box if their bounding boxes overlap and the box
+    corners are not all strictly on one side of the edge's line.
+
+    Args:
+        corners: ``(N, K, 2)`` lon/lat rings, first and last point equal.
+        lon_min: West edge of the box.
+        lon_max: East edge of the box.
+        lat_min: South edge of the box.
+        lat_max: North edge of the box.
+
+    Returns:
+        ``(N,)`` bool. Rings with a non-finite corner (hexes that do not
+        unproject) meet nothing.
+    """
+    x0, y0 = corners[:, :-1, 0], corners[:, :-1, 1]
+    x1, y1 = corners[:, 1:, 0], corners[:, 1:, 1]
+    hit = (np.minimum(x0, x1) <= lon_max) & (np.maximum(x0, x1) >= lon_min)
+    hit &= (np.minimum(y0, y1) <= lat_max) & (np.maximum(y0, y1) >= lat_min)
+    above = np.zeros(hit.shape, dtype=bool)
+    below = np.zeros(hit.shape, dtype=bool)
+    crosses = (y0 > lat_min) != (y1 > lat_min)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx, dy = x1 - x0, y1 - y0
+        for cx, cy in ((lon_min, lat_min), (lon_max, lat_min), (lon_max, lat_max), (lon_min, lat_max)):
+            side = (cx - x0) * dy - (cy - y0) * dx
+            above |= side >= 0
+            below |= side <= 0
+        # box inside the ring: crossing number of one box corner
+        crosses &= lon_min < x0 + (lat_min - y0) * dx / dy
+    hit &= above & below
+    meets = hit.any(axis=1) | (np.count_nonzero(crosses, axis=1) % 2 == 1)
+    return meets & np.isfinite(corners).all(axis=(1, 2))
+
+
+def _scan(hp, paths, make_tests, n_threads: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Axial (q, r) of the hexes that meet the region bounded by ``paths``.
+
+    The candidates are scanned in tiles of ``BLOCK_SIZE`` consecutive
+    candidates, i.e. bands of hex rows (or stretches of one long row) of
+    the region's projected extent, so memory per tile is bounded whatever
+    the region size. Tiles partition the candidates: their results are
+    disjoint and concatenate in row order.
+
+    Args:
+        hp: HexProj.
+        paths: Closed lon/lat ``(lon, lat)`` vertex arrays of the boundary.
+        make_tests: ``make_tests(threaded)`` returns the tests for one
+            thread: ``centres_inside`` maps centre lon/lat arrays to bool,
+            for hexes clear of the boundary, and ``rings_meet`` maps
+            ``(N, 7, 2)`` rings to bool, for the others.
+        n_threads: Scan tiles concurrently on this many threads, each with
+            its own transformer and tests, bypassing the geometry cache.
+            The threads are ``hp``'s labelling pool, so their transformers
+            are reused across calls.
+            ``None`` or 1 scans on the calling thread through the cache.
+
+    Returns:
+        int64 ``(q, r)``, row by row.
+    """
+    q, r = _paths_frac_hex(hp, paths)
+    if q.shape[0] == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    ranges = row_ranges(q, r)
+    n_candidates = int(ranges.ends[-1])
+    threaded = n_threads is not None and n_threads > 1 and n_candidates > BLOCK_SIZE
+    local = threading.local()
+
+    def _tile(start):
+        if not hasattr(local, "tests"):
+            local.tests = make_tests(threaded)
+            if threaded:
+                transformer, _ = hp._thread_state()
+                local.geometry = (
+                    functools.partial(hp._corners_lon_lat, transformer=transformer),
+                    functools.partial(hp._centres_lon_lat, transformer=transformer),
+                )
+            else:
+                local.geometry = (hp.geometry_cache.corners, hp.geometry_cache.centres)
+        centres_inside, rings_meet = local.tests
+        corners, centres = local.geometry
+
+        q, r, row_index = tile_candidates(ranges, start, min(start + BLOCK_SIZE, n_candidates))
+        hex_ids = hp.encode_hex_id(q, r)
+        near = near_boundary(ranges, q, row_index)
+        keep = np.zeros(q.shape[0], dtype=bool)
+        if near.any():
+            keep[near] = rings_meet(corners(hex_ids[near]))
+        if not near.all():
+            lon, lat = centres(hex_ids[~near]).T
+            keep[~near] = centres_inside(lon, lat)
+        return q[keep], r[keep]
+
+    starts = range(0, n_candidates, BLOCK_SIZE)
+    if threaded:
+        # list() re-raises the first worker exception here
+        tiles = list(hp._executor(n_threads).map(_tile, starts))
+    else:
+        tiles = [_tile(start) for start in starts]
+    return np.concatenate([q for q, _ in tiles]), np.concatenate([r for _, r in tiles])
+
+
+def box_hexes(hp, lon_min, lon_max, lat_min, lat_max) -> tuple[np.ndarray, np.ndarray]:
+    """Axial (q, r) of every hex of ``hp`` whose lon/lat ring meets the box.
+
+    Args:
+        hp: HexProj.
+        lon_min: West edge of the box.
+        lon_max: East edge of the box.
+        lat_min: South edge of the box.
+        lat_max: North edge of the box.
+
+    Returns:
+        int64 ``(q, r)``, row by row.
+    """
+    path = (
+        np.array([lon_min, lon_max, lon_max, lon_min, lon_min], dtype=float),
+        np.array([lat_min, lat_min, lat_max, lat_max, lat_min], dtype=float),
+    )
+
+    def make_tests(threaded):
+        return (
+            lambda lon, lat: (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max),
+            lambda corners: rings_intersect_box(corners, lon_min, lon_max, lat_min, lat_max),
+        )
+
+    return _scan(hp, [path], make_tests)
+
+
+def region_hexes(hp, region, n_threads: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Axial (q, r) of every hex of ``hp`` whose lon/lat ring meets a region.
+
+    Args:
+        hp: HexProj.
+        region: Shapely Polygon or MultiPolygon in lon/lat. It is prepared
+            in place (``shapely.prepare``); threads each prepare a copy.
+        n_threads: As in ``_scan``.
+
+    Returns:
+        int64 ``(q, r)``, row by row.
+    """
+    import shapely
+
+    rings = shapely.get_rings(shapely.get_parts(region))
+    paths = [shapely.get_coordinates(ring).T for ring in rings]
+
+    def make_tests(threaded):
+        # GEOS builds a prepared geometry's indexes lazily on first use,
+        # so threads do not share one
+        geometry = shapely.from_wkb(shapely.to_wkb(region)) if threaded else region
+        shapely.prepare(geometry)
+
+        def rings_meet(corners):
+            # rings with a non-finite corner (hexes that do not unproject)
+            # meet nothing, as in rings_intersect_box
+            finite = np.isfinite(corners).all(axis=(1, 2))
+            meets = np.zeros(corners.shape[0], dtype=bool)
+            meets[finite] = shapely.intersects(geometry, shapely.polygons(corners[finite]))
+            return meets
+
+        return (lambda lon, lat: shapely.contains_xy(geometry, lon, lat), rings_meet)
+
+    return _scan(hp, paths, make_tests, n_threads=n_threads)
@@ -0,0 +1,153 @@
+"""Space-filling-curve orderings of biased hex coordinates.
+
+Kernels for the "morton" (Z-order) and "hilbert" hex ID encodings. They
+work on non-negative int64 coordinates ``a = q + SFC_BIAS`` and
+``b = r + SFC_BIAS`` below ``2 * SFC_BIAS = 2**31`` and produce IDs below
+``2**62``; bias, range checks and INVALID handling live in ``hex_id``.
+
+Morton interleaves the bits of a (even positions) and b (odd positions)
+with the usual magic-mask bit spreading. Hilbert is the order-32 curve
+evaluated four bits per coordinate at a time through a 4-state lookup
+table (state = accumulated swap / flip of the remaining lower bits), so a
+block costs eight table passes instead of 32 bitwise iterations.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+SFC_BIAS = np.int64(1 << 30)
+
+# (shift, mask) steps spreading 32 bits to the even bit positions
+_SPREAD = (
+    (16, np.int64(0x0000FFFF0000FFFF)),
+    (8, np.int64(0x00FF00FF00FF00FF)),
+    (4, np.int64(0x0F0F0F0F0F0F0F0F)),
+    (2, np.int64(0x3333333333333333)),
+    (1, np.int64(0x5555555555555555)),
+)
+
+
+def _spread_inplace(x: np.ndarray, tmp: np.ndarray) -> None:
+    for shift, mask in _SPREAD:
+        np.left_shift(x, shift, out=tmp)
+        np.bitwise_or(x, tmp, out=x)
+        np.bitwise_and(x, mask, out=x)
+
+
+# (shift, mask) steps gathering the even bit positions back to 32 bits
+_COMPACT = (
+    (1, np.int64(0x3333333333333333)),
+    (2, np.int64(0x0F0F0F0F0F0F0F0F)),
+    (4, np.int64(0x00FF00FF00FF00FF)),
+    (8, np.int64(0x0000FFFF0000FFFF)),
+    (16, np.int64(0x00000000FFFFFFFF)),
+)
+
+
+def _compact(x: np.ndarray) -> np.ndarray:
+    x = np.bitwise_and(x, np.int64(0x5555555555555555))
+    tmp = np.empty_like(x)
+    for shift, mask in _COMPACT:
+        np.right_shift(x, shift, out=tmp)
+        np.bitwise_or(x, tmp, out=x)
+        np.bitwise_and(x, mask, out=x)
+    return x
+
+
+def morton_encode_inplace(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    """Interleave biased a, b into ``out``, clobbering ``a`` and ``b``."""
+    _spread_inplace(a, out)
+    _spread_inplace(b, out)
+    np.left_shift(b, 1, out=b)
+    np.bitwise_or(a, b, out=out)
+
+
+def morton_decode(h: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Biased (a, b) of non-negative Morton IDs."""
+    return _compact(h), _compact(np.right_shift(h, 1))
+
+
+def _hilbert_tables():
+    """Encode / decode tables for 4-bit chunks of the Hilbert curve.
+
+    Index ``state * 256 + chunk`` where chunk is ``xb << 4 | yb`` (encode)
+    or the 8-bit curve digit (decode). State bit 0 is "swap x and y", bit 1
+    "flip all remaining bits"; both commute, so composing is XOR.
+    """
+    enc_d = np.empty(4 * 256, dtype=np.int64)
+    enc_s = np.empty(4 * 256, dtype=np.int64)
+    dec_x = np.empty(4 * 256, dtype=np.int64)
+    dec_y = np.empty(4 * 256, dtype=np.int64)
+    dec_s = np.empty(4 * 256, dtype=np.int64)
+    for state in range(4):
+        for xb in range(16):
+            for yb in range(16):
+                swap, flip = state & 1, state >> 1
+                x, y = (xb ^ 15, yb ^ 15) if flip else (xb, yb)
+                if swap:
+                    x, y = y, x
+                d = 0
+                s = 8
+                while s:
+                    rx, ry = int(x & s > 0), int(y & s > 0)
+                    d += s * s * ((3 * rx) ^ ry)
+                    if ry == 0:
+                        if rx == 1:
+                            x, y = x ^ 15, y ^ 15
+                            flip ^= 1
+                        x, y = y, x
+                        swap ^= 1
+                    s >>= 1
+                nxt = swap | flip << 1
+                enc_d[state * 256 + (xb << 4 | yb)] = d
+                enc_s[state * 256 + (xb << 4 | yb)] = nxt
+                dec_x[state * 256 + d] = xb
+                dec_y[state * 256 + d] = yb
+                dec_s[state * 256 + d] = nxt
+    return enc_d, enc_s, dec_x, dec_y, dec_s
+
+
+_ENC_D, _ENC_S, _DEC_X, _DEC_Y, _DEC_S = _hilbert_tables()
+
+
+def hilbert_encode_inplace(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    """Hilbert index of biased a, b into ``out``, clobbering ``a`` and ``b``."""
+    n = out.shape[0]
+    state = np.zeros(n, dtype=np.int64)
+    idx = np.empty(n, dtype=np.int64)
+    tmp = np.empty(n, dtype=np.int64)
+    out[...] = 0
+    for shift in range(28, -1, -4):
+        np.right_shift(a, shift, out=idx)
+        np.bitwise_and(idx, 15, out=idx)
+        np.left_shift(idx, 4, out=idx)
+        np.right_shift(b, shift, out=tmp)
+        np.bitwise_and(tmp, 15, out=tmp)
+        np.bitwise_or(idx, tmp, out=idx)
+        np.left_shift(state, 8, out=tmp)
+        np.bitwise_or(idx, tmp, out=idx)
+        np.left_shift(out, 8, out=out)
+        np.take(_ENC_D, idx, out=tmp)
+        np.bitwise_or(out, tmp, out=out)
+        np.take(_ENC_S, idx, out=state)
+
+
+def hilbert_decode(h: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Biased (a, b) of non-negative Hilbert IDs."""
+    state = np.zeros(h.shape, dtype=np.int64)
+    a = np.zeros(h.shape, dtype=np.int64)
+    b = np.zeros(h.shape, dtype=np.int64)
+    idx = np.empty(h.shape, dtype=np.int64)
+    tmp = np.empty(h.shape, dtype=np.int64)
+    for shift in range(56, -1, -8):
+        np.right_shift(h, shift, out=idx)
+        np.bitwise_and(idx, 255, out=idx)
+        np.left_shift(state, 8, out=tmp)
+        np.bitwise_or(idx, tmp, out=idx)
+        np.left_shift(a, 4, out=a)
+        np.bitwise_or(a, np.take(_DEC_X, idx), out=a)
+        np.left_shift(b, 4, out=b)
+        np.bitwise_or(b, np.take(_DEC_Y, idx), out=b)
+        np.take(_DEC_S, idx, out=state)
+    return a, b
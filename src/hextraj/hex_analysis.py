@@ -9,16 +9,16 @@ import geopandas as gpd
 import dask
 import dask.array as da
 import dask.dataframe as dd
-from shapely.geometry import LineString
 
-from . import redblobhex_array as redblobhex
-from .hex_id import INVALID_HEX_ID, decode_hex_id
+from .hex_grid import HexGrid
+from .hex_id import INVALID_HEX_ID
+from .hex_runs import HexRuns
 from .hexproj import HexProj
 
 
 def hex_connectivity_dask(
     ds,
-    hp,
+    hp=None,
     weight=None,
     groupby_cols=None,
     obs_dim="obs",
@@ -33,10 +33,18 @@ def hex_connectivity_dask(
     chunked that way this is essentially a no-op; for obs-chunked inputs the
     rechunk happens once, upfront.
 
+    ``ds`` may instead be a ``HexRuns`` of already-labelled positions. The
+    table then has one row per run rather than per (traj, obs): the run
+    covers obs ``[start, start + length)`` and every one of those obs has
+    the row's ``from_id`` and ``to_id``, so weighting by ``length`` gives
+    the per-observation counts without expanding the runs.
+
     Args:
         ds: xr.Dataset with at least two 2-D variables (traj x obs) for
-            longitude and latitude, backed by dask arrays.
+            longitude and latitude, backed by dask arrays, or ``HexRuns``.
         hp: HexProj instance used to label lon/lat positions as hex IDs.
+            A default ``HexProj()`` is used when None. Unused for
+            ``HexRuns``.
         weight: Optional name of a variable in ds to include as a weight
             column in the result.  The variable must have the same dimensions
             as the lon/lat arrays.
@@ -61,7 +69,24 @@ def hex_connectivity_dask(
           - one column per name in groupby_cols
         INVALID_HEX_ID (-1) appears in from_id or to_id wherever the input
         lon/lat values are NaN.
+
+        For ``HexRuns``: one row per run with columns traj (named after
+        the traj dim), obs (named after the obs dim, the run's first obs),
+        ``length``, ``from_id`` and ``to_id``.
+
+    Raises:
+        ValueError: When ``weight`` or ``groupby_cols`` is given with
+            ``HexRuns``.
     """
+    if isinstance(ds, HexRuns):
+        if weight is not None or groupby_cols:
+            raise ValueError(
+                "weight and groupby_cols need the Dataset input, not HexRuns."
+            )
+        return _runs_connectivity_dask(ds)
+    if hp is None:
+        hp = HexProj()
+
     # Rechunk obs to full so each partition has all obs steps per trajectory.
     ds = ds.chunk({obs_dim: -1})
 
@@ -86,7 +111,9 @@ def hex_connectivity_dask(
         obs0 = df.groupby(traj_dim, sort=False).head(1)
         from_id_map = dict(zip(
             obs0[traj_dim],
-            hp.label(obs0["to_lon"].values, obs0["to_lat"].values).astype(np.int64),
+            hp.label(
+                obs0["to_lon"].values, obs0["to_lat"].values, dedup=True
+            ).astype(np.int64),
         ))
         from_id = df[traj_dim].map(from_id_map).astype(np.int64)
         return df.assign(to_id=to_id, from_id=from_id).drop(columns=["to_lon", "to_lat"])
@@ -94,9 +121,191 @@ def hex_connectivity_dask(
     return ddf.map_partitions(_label, meta=meta)
 
 
+def _check_reduce_dims(reduce_dims, dims) -> list[str]:
+    """Normalise reduce_dims to a list of names in dims (all dims if empty)."""
+    if isinstance(reduce_dims, str):
+        reduce_dims = [reduce_dims]
+    elif reduce_dims is None or len(reduce_dims) == 0:
+        reduce_dims = list(dims)
+
+    unknown = set(reduce_dims) - set(dims)
+    if unknown:
+        raise ValueError(
+            f"reduce_dims contains dims not on hex_ids: {sorted(unknown)}. "
+            f"Available dims: {list(dims)}"
+        )
+    return list(reduce_dims)
+
+
+def _expand_ranges(start: np.ndarray, length: np.ndarray) -> np.ndarray:
+    """Concatenate ``arange(start[i], start[i] + length[i])`` over i."""
+    offsets = np.cumsum(length) - length
+    return np.arange(length.sum()) + np.repeat(start - offsets, length)
+
+
+def _runs_counts(runs: HexRuns, reduce_dims: list[str]):
+    """``hex_counts_lazy`` for run-length input, without densifying.
+
+    Counts are sums of run lengths. Keeping obs uses a sweep over run
+    start/end events per hex, so the work scales with the number of runs
+    plus the number of output rows.
+    """
+    traj_dim, obs_dim = runs.dims
+    length = runs.length.astype(np.int64)
+    if obs_dim in reduce_dims and traj_dim in reduce_dims:
+        counts = pd.Series(length, index=pd.Index(runs.hex_id, name="hex_id"))
+        return counts.groupby(level="hex_id", sort=False).sum().rename("count")
+
+    if obs_dim in reduce_dims:
+        traj = runs.traj
+        if traj_dim in runs.coords:
+            traj = np.asarray(runs.coords[traj_dim])[traj]
+        frame = pd.DataFrame({traj_dim: traj, "hex_id": runs.hex_id, "count": length})
+        return frame.groupby([traj_dim, "hex_id"], sort=False)["count"].sum().reset_index()
+
+    # obs kept: +1 at each run start, -1 after its end; a running sum per
+    # hex gives the count on each obs interval between events
+    hex_id = np.concatenate([runs.hex_id, runs.hex_id])
+    obs = np.concatenate([runs.start_obs, runs.start_obs + length]).astype(np.int64)
+    delta = np.concatenate([np.ones_like(length), -np.ones_like(length)])
+    order = np.lexsort((obs, hex_id))
+    hex_id, obs, count = hex_id[order], obs[order], np.cumsum(delta[order])
+    seg_len = np.diff(obs)
+    keep = (count[:-1] > 0) & (seg_len > 0) & (hex_id[1:] == hex_id[:-1])
+    seg_len = seg_len[keep]
+    obs_out = _expand_ranges(obs[:-1][keep], seg_len)
+    if obs_dim in runs.coords:
+        obs_out = np.asarray(runs.coords[obs_dim])[obs_out]
+    return pd.DataFrame({
+        obs_dim: obs_out,
+        "hex_id": np.repeat(hex_id[:-1][keep], seg_len),
+        "count": np.repeat(count[:-1][keep], seg_len),
+    })
+
+
+# Runs per partition of the HexRuns connectivity table.
+_RUNS_PARTITION_SIZE = 1_000_000
+
+
+def _runs_connectivity_dask(runs: HexRuns) -> dd.DataFrame:
+    """``hex_connectivity_dask`` for run-length input: one row per run."""
+    traj_dim, obs_dim = runs.dims
+    traj = runs.traj
+    if traj_dim in runs.coords:
+        traj = np.asarray(runs.coords[traj_dim])[traj]
+    obs = runs.start_obs
+    if obs_dim in runs.coords:
+        obs = np.asarray(runs.coords[obs_dim])[obs]
+    from_id = runs.at_obs(0)[runs.traj] if len(runs) else runs.hex_id
+    df = pd.DataFrame({
+        traj_dim: traj,
+        obs_dim: obs,
+        "length": runs.length.astype(np.int64),
+        "from_id": from_id,
+        "to_id": runs.hex_id,
+    })
+    return dd.from_pandas(df, npartitions=max(1, -(-len(df) // _RUNS_PARTITION_SIZE)))
+
+
+def _grid_series(counts: np.ndarray, grid: HexGrid) -> pd.Series:
+    """Nonzero entries of a ``grid.bincount`` result as a count Series."""
+    local = np.flatnonzero(counts)
+    return pd.Series(
+        np.rint(counts[local]).astype(np.int64),
+        index=pd.Index(grid.hex_id_of(local), name="hex_id"),
+        name="count",
+    )
+
+
+def _grid_frame(counts: np.ndarray, keep: dict, grid: HexGrid) -> pd.DataFrame:
+    """Nonzero entries of a keep-major flat bincount as a count DataFrame.
+
+    ``keep`` maps each kept dim to its coordinate values, in key order.
+    """
+    nz = np.flatnonzero(counts)
+    keep_pos, local = np.divmod(nz, len(grid) + 1)
+    keep_shape = tuple(len(values) for values in keep.values())
+    positions = np.unravel_index(keep_pos, keep_shape)
+    return pd.DataFrame({
+        **{d: np.asarray(values)[pos] for (d, values), pos in zip(keep.items(), positions)},
+        "hex_id": grid.hex_id_of(local),
+        "count": np.rint(counts[nz]).astype(np.int64),
+    })
+
+
+def _fold_out_of_grid(counts, grid: HexGrid):
+    """Re-sum counts so every hex ID outside ``grid`` becomes INVALID_HEX_ID."""
+    is_series = isinstance(counts, (pd.Series, dd.Series))
+    frame = counts.rename("count").reset_index() if is_series else counts
+    keys = [c for c in frame.columns if c != "count"]
+
+    def _fold(df):
+        return df.assign(hex_id=grid.hex_id_of(grid._bin(df["hex_id"].to_numpy())))
+
+    if isinstance(frame, dd.DataFrame):
+        frame = frame.map_partitions(_fold, meta=frame._meta)
+    else:
+        frame = _fold(frame)
+    folded = frame.groupby(keys, sort=False)["count"].sum()
+    return folded if is_series else folded.reset_index()
+
+
+def _grid_counts(hex_ids, reduce_dims, grid: HexGrid):
+    """``hex_counts_lazy`` via ``np.bincount`` on a registered grid."""
+    m = len(grid) + 1
+
+    if isinstance(hex_ids, HexRuns):
+        traj_dim, obs_dim = hex_ids.dims
+        reduce_dims = _check_reduce_dims(reduce_dims, hex_ids.dims)
+        if traj_dim in reduce_dims and obs_dim in reduce_dims:
+            return _grid_series(grid.bincount(hex_ids.hex_id, weights=hex_ids.length), grid)
+        if obs_dim in reduce_dims:
+            key = hex_ids.traj * m + grid._bin(hex_ids.hex_id)
+            counts = np.bincount(key, weights=hex_ids.length, minlength=hex_ids.shape[0] * m)
+            traj = hex_ids.coords.get(traj_dim, np.arange(hex_ids.shape[0]))
+            return _grid_frame(counts, {traj_dim: traj}, grid)
+        return _fold_out_of_grid(_runs_counts(hex_ids, reduce_dims), grid)
+
+    if isinstance(hex_ids, pd.Series):
+        return _grid_series(grid.bincount(hex_ids.to_numpy()), grid)
+    if isinstance(hex_ids, dd.Series):
+        return _fold_out_of_grid(hex_counts_lazy(hex_ids), grid)
+    if not isinstance(hex_ids, xr.DataArray):
+        raise TypeError(
+            f"hex_ids must be xr.DataArray, pd.Series, dd.Series or HexRuns; got {type(hex_ids)}"
+        )
+
+    reduce_dims = _check_reduce_dims(reduce_dims, hex_ids.dims)
+    keep_dims = [d for d in hex_ids.dims if d not in reduce_dims]
+
+    if dask.is_dask_collection(hex_ids):
+        if keep_dims:
+            return _fold_out_of_grid(hex_counts_lazy(hex_ids, reduce_dims), grid)
+        flat = hex_ids.data.ravel()
+        per_block = flat.map_blocks(
+            lambda block: grid.bincount(block)[np.newaxis],
+            new_axis=1,
+            chunks=((1,) * flat.numblocks[0], (m,)),
+            dtype=np.int64,
+        )
+        total = per_block.sum(axis=0)
+        meta = _grid_series(np.zeros(m, dtype=np.int64), grid)
+        return dd.from_delayed([dask.delayed(_grid_series)(total, grid)], meta=meta)
+
+    if not keep_dims:
+        return _grid_series(grid.bincount(hex_ids.values), grid)
+    ordered = hex_ids.transpose(*keep_dims, *reduce_dims)
+    n_keep = int(np.prod(ordered.shape[:len(keep_dims)]))
+    key = grid._bin(ordered.values).reshape(n_keep, -1)
+    key += (np.arange(n_keep, dtype=np.int64) * m)[:, np.newaxis]
+    counts = np.bincount(key.ravel(), minlength=n_keep * m)
+    return _grid_frame(counts, {d: ordered[d].values for d in keep_dims}, grid)
+
+
 def hex_counts_lazy(
-    hex_ids: xr.DataArray | pd.Series | dd.Series,
+    hex_ids: xr.DataArray | pd.Series | dd.Series | HexRuns,
     reduce_dims: str | list[str] | None = None,
+    grid: HexGrid | None = None,
 ) -> dd.Series | dd.DataFrame | pd.Series | pd.DataFrame:
     """Count hex visits lazily, without attaching geometry.
 
@@ -109,11 +318,16 @@ def hex_counts_lazy(
     Args:
         hex_ids: Hex IDs to count. ``xr.DataArray``, ``pd.Series``, or
             ``dd.Series`` of int64 values (as produced by
-            ``HexProj.label``). INVALID_HEX_ID (-1) is preserved.
+            ``HexProj.label``), or ``HexRuns`` (as produced by
+            ``HexProj.label_runs``), which is counted from its runs
+            without expanding. INVALID_HEX_ID (-1) is preserved.
         reduce_dims: Dimensions to aggregate over. ``None`` (default) and
             ``[]`` both mean *reduce all dims*. A non-empty list collapses
             the named dims; remaining dims become columns in the returned
             DataFrame. Ignored for ``pd.Series`` / ``dd.Series`` inputs.
+        grid: Optional registered ``HexGrid``. Counting then maps IDs to
+            local indices and uses ``np.bincount`` instead of hashing, and
+            every hex outside the grid is counted under INVALID_HEX_ID.
 
     Returns:
         Full reduction: a Series indexed by ``hex_id`` with count values
@@ -135,6 +349,11 @@ def hex_counts_lazy(
         ``keep_dims``. Misalignment triggers a dask shuffle during
         aggregation; no silent rechunking is performed.
     """
+    if grid is not None:
+        return _grid_counts(hex_ids, reduce_dims, grid)
+    if isinstance(hex_ids, HexRuns):
+        return _runs_counts(hex_ids, _check_reduce_dims(reduce_dims, hex_ids.dims))
+
     # Series inputs: short-circuit directly to value_counts.
     if isinstance(hex_ids, (pd.Series, dd.Series)):
         counts = hex_ids.value_counts(sort=False)
@@ -146,18 +365,7 @@ def hex_counts_lazy(
             f"hex_ids must be xr.DataArray, pd.Series, or dd.Series; got {type(hex_ids)}"
         )
 
-    # Normalise reduce_dims.
-    if isinstance(reduce_dims, str):
-        reduce_dims = [reduce_dims]
-    elif reduce_dims is None or len(reduce_dims) == 0:
-        reduce_dims = list(hex_ids.dims)
-
-    unknown = set(reduce_dims) - set(hex_ids.dims)
-    if unknown:
-        raise ValueError(
-            f"reduce_dims contains dims not on hex_ids: {sorted(unknown)}. "
-            f"Available dims: {list(hex_ids.dims)}"
-        )
+    reduce_dims = _check_reduce_dims(reduce_dims, hex_ids.dims)
 
     all_dims = list(hex_ids.dims)
     keep_dims = [d for d in all_dims if d not in reduce_dims]
@@ -182,48 +390,175 @@ def hex_counts_lazy(
     return counts
 
 
-def _attach_geometry(counts, hp: HexProj) -> gpd.GeoDataFrame:
-    """Attach hex polygon geometry to a counts Series or DataFrame.
+# Values of the ``geometry`` argument of hex_counts and connectivity.
+GEOMETRY_MODES = ("eager", "lazy", "none")
+
+
+def _check_geometry_mode(geometry: str) -> None:
+    if geometry not in GEOMETRY_MODES:
+        raise ValueError(f"geometry must be one of {GEOMETRY_MODES}, got {geometry!r}.")
 
-    Computes the geometry once per unique hex via
-    ``HexProj.to_geodataframe`` and broadcasts via ``reindex``.
-    ``INVALID_HEX_ID`` rows carry ``geometry=None``. Result is sorted
-    by index.
+
+class HexFrame(pd.DataFrame):
+    """Hex count or connectivity table whose geometry is built on demand.
+
+    Returned by ``hex_counts``, ``hex_connectivity`` and
+    ``hex_connectivity_power`` with ``geometry="lazy"``. A plain
+    ``pd.DataFrame`` in every respect (arithmetic, ``to_parquet``, ...)
+    until its ``geometry`` is read: the first access of ``.geometry``,
+    ``["geometry"]`` or ``with_geometry()`` builds the geometries once.
+    Only the geometries are kept, keyed by the index they were built for,
+    so column edits show up in later ``with_geometry()`` calls and a new
+    index rebuilds them. Derived frames (slices, sorts) keep the HexProj
+    and build their own geometry, which the HexProj's geometry cache
+    keeps cheap.
+
+    Attributes:
+        hexproj: HexProj used for the geometry, or None.
+    """
+
+    _metadata = ["hexproj"]
+    hexproj = None
+    # (index, geometries) of the last geometry build
+    _geo = None
+
+    @property
+    def _constructor(self):
+        return HexFrame
+
+    def with_geometry(self, hp: HexProj | None = None) -> gpd.GeoDataFrame:
+        """Return the table as a GeoDataFrame with its geometry column.
+
+        Args:
+            hp: HexProj for the geometry. Defaults to ``hexproj``.
+
+        Returns:
+            GeoDataFrame equal to the ``geometry="eager"`` result, with
+            the frame's current columns.
+
+        Raises:
+            ValueError: If neither ``hp`` nor ``hexproj`` is set.
+        """
+        if hp is None or hp == self.hexproj:
+            return _geo_frame(self, self._geometries())
+        return with_geometry(self, hp)
+
+    def _geometries(self):
+        """Geometries of the rows, built once per index."""
+        if self.hexproj is None:
+            raise ValueError("with_geometry needs a HexProj.")
+        if self._geo is None or self._geo[0] is not self.index:
+            object.__setattr__(self, "_geo", (self.index, _geometries(self, self.hexproj)))
+        return self._geo[1]
+
+    @property
+    def geometry(self) -> gpd.GeoSeries:
+        """Geometry column, built on first access."""
+        return gpd.GeoSeries(
+            self._geometries(), index=self.index, crs="EPSG:4326", name="geometry"
+        )
+
+    def __getitem__(self, key):
+        if isinstance(key, str) and key == "geometry" and "geometry" not in self.columns:
+            return self.geometry
+        return super().__getitem__(key)
+
+
+def with_geometry(table: pd.DataFrame, hp: HexProj) -> gpd.GeoDataFrame:
+    """Attach hex geometry to a hex_counts or connectivity table.
+
+    Tables indexed by ``hex_id`` (possibly under leading dims) get hex
+    polygons, tables indexed by ``(from_id, to_id)`` LineStrings between
+    hex centres. INVALID_HEX_ID rows get None. Use it on the results of
+    ``geometry="none"`` (or ``"lazy"``) calls.
+
+    Args:
+        table: DataFrame with a ``hex_id`` or ``(from_id, to_id)`` index.
+        hp: HexProj for the geometry.
+
+    Returns:
+        GeoDataFrame with the table's index and columns plus ``geometry``,
+        CRS EPSG:4326.
+
+    Raises:
+        ValueError: If the index has neither ``hex_id`` nor both
+            ``from_id`` and ``to_id`` levels.
+    """
+    return _geo_frame(table, _geometries(table, hp))
+
+
+def _geometries(table: pd.DataFrame, hp: HexProj):
+    """Geometries of the rows of a hex_counts or connectivity table."""
+    names = table.index.names
+    if "hex_id" in names:
+        # one polygon per distinct hex, broadcast by reindex
+        hex_id_values = table.index.get_level_values("hex_id").to_numpy()
+        geo = hp.to_geodataframe(np.unique(hex_id_values))
+        geometries = geo.geometry.reindex(hex_id_values).values
+    elif "from_id" in names and "to_id" in names:
+        geometries = hp.edge_geometries(
+            table.index.get_level_values("from_id").to_numpy(),
+            table.index.get_level_values("to_id").to_numpy(),
+        )
+    else:
+        raise ValueError(
+            f"table needs a 'hex_id' or ('from_id', 'to_id') index, got {list(names)}."
+        )
+    return geometries
+
+
+def _geo_frame(table: pd.DataFrame, geometries) -> gpd.GeoDataFrame:
+    """GeoDataFrame of the table's index and columns plus ``geometries``."""
+    return gpd.GeoDataFrame(
+        {**{c: table[c].to_numpy() for c in table.columns if c != "geometry"},
+         "geometry": geometries},
+        index=table.index,
+        crs="EPSG:4326",
+    )
+
+
+def _finish_geometry(table: pd.DataFrame, hp: HexProj | None, geometry: str):
+    """Return ``table`` in the requested geometry mode."""
+    if geometry == "none":
+        return table
+    if hp is None:
+        hp = HexProj()
+    if geometry == "lazy":
+        table = HexFrame(table)
+        table.hexproj = hp
+        return table
+    return with_geometry(table, hp)
+
+
+def _counts_table(counts) -> pd.DataFrame:
+    """hex_counts_lazy output as a sorted table with a ``count`` column.
+
+    The index is ``hex_id`` for a Series and ``(*keep_dims, "hex_id")``
+    for a DataFrame.
     """
     if dask.is_dask_collection(counts):
         counts = counts.compute()
 
     if isinstance(counts, pd.Series):
-        hex_id_values = counts.index.to_numpy()
-        unique_ids = np.unique(hex_id_values)
-        geo = hp.to_geodataframe(unique_ids)
-        geometries = geo.geometry.reindex(hex_id_values).values
-        result = gpd.GeoDataFrame(
-            {"count": counts.to_numpy(), "geometry": geometries},
-            index=pd.Index(hex_id_values, name="hex_id"),
-            crs="EPSG:4326",
+        return pd.DataFrame(
+            {"count": counts.to_numpy()},
+            index=pd.Index(counts.index.to_numpy(), name="hex_id"),
         ).sort_index()
-        return result
 
     # DataFrame path: columns (*keep_dims, "hex_id", "count")
-    hex_id_values = counts["hex_id"].to_numpy()
-    unique_ids = np.unique(hex_id_values)
-    geo = hp.to_geodataframe(unique_ids)
-    geometries = geo.geometry.reindex(hex_id_values).values
     keep_dims = [c for c in counts.columns if c not in ("hex_id", "count")]
     index = pd.MultiIndex.from_frame(counts[keep_dims + ["hex_id"]])
-    result = gpd.GeoDataFrame(
-        {"count": counts["count"].to_numpy(), "geometry": geometries},
-        index=index,
-        crs="EPSG:4326",
+    return pd.DataFrame(
+        {"count": counts["count"].to_numpy()}, index=index
     ).sort_index()
-    return result
 
 
 def hex_counts(
-    hex_ids: xr.DataArray | pd.Series | dd.Series,
+    hex_ids: xr.DataArray | pd.Series | dd.Series | HexRuns,
     reduce_dims: str | list[str] | None = None,
     hp: HexProj | None = None,
+    grid: HexGrid | None = None,
+    geometry: str = "eager",
 ) -> gpd.GeoDataFrame:
     """Count hex visits and attach polygon geometry to the result.
 
@@ -233,9 +568,9 @@ def hex_counts(
     ``hex_counts_lazy``.
 
     Args:
-        hex_ids: Hex IDs to count. ``xr.DataArray``, ``pd.Series``, or
-            ``dd.Series`` of int64 values. INVALID_HEX_ID (-1) is
-            preserved as a regular row with ``geometry=None``.
+        hex_ids: Hex IDs to count. ``xr.DataArray``, ``pd.Series``,
+            ``dd.Series`` of int64 values, or ``HexRuns``. INVALID_HEX_ID
+            (-1) is preserved as a regular row with ``geometry=None``.
         reduce_dims: Dimensions to aggregate over. ``None`` (default) and
             ``[]`` both mean *reduce all dims*. A non-empty list
             collapses the named dims; remaining dims become leading
@@ -243,6 +578,11 @@ def hex_counts(
             ``dd.Series`` inputs.
         hp: Projection used to build polygon geometry. A default
             ``HexProj()`` is created when ``None``.
+        grid: Optional registered ``HexGrid``, as in ``hex_counts_lazy``.
+        geometry: "eager" (default) builds the polygons now. "lazy"
+            returns a ``HexFrame`` that builds them on first access of its
+            geometry (or ``.with_geometry()``). "none" returns a plain
+            DataFrame without geometry; see ``with_geometry``.
 
     Returns:
         GeoDataFrame with:
@@ -251,62 +591,36 @@ def hex_counts(
           - Column ``count``: int64 visit count.
           - Column ``geometry``: Polygon for valid hex IDs, ``None`` for
             INVALID_HEX_ID.
+        A ``HexFrame`` or DataFrame with the same index and ``count``
+        for ``geometry="lazy"`` / ``"none"``.
 
     Raises:
-        ValueError: When ``reduce_dims`` names a dim not on ``hex_ids``.
+        ValueError: When ``reduce_dims`` names a dim not on ``hex_ids``,
+            or ``geometry`` is not one of ``GEOMETRY_MODES``.
         TypeError: When ``hex_ids`` is not one of the accepted types.
     """
-    if hp is None:
-        hp = HexProj()
-
-    counts = hex_counts_lazy(hex_ids, reduce_dims=reduce_dims)
-    return _attach_geometry(counts, hp)
-
-
-def _build_edge_geometries(
-    from_ids: np.ndarray,
-    to_ids: np.ndarray,
-    hp: HexProj,
-) -> list:
-    """Build LineString geometries for hex connectivity pairs.
-
-    Args:
-        from_ids: 1D array of int64 hex IDs (origins).
-        to_ids: 1D array of int64 hex IDs (destinations).
-        hp: HexProj instance for computing geometries.
-
-    Returns:
-        List of geometries: LineString between hex centers for valid pairs,
-        None where either ID is INVALID_HEX_ID.
-    """
-    geometries = []
-    for f_id, t_id in zip(from_ids, to_ids):
-        if f_id == INVALID_HEX_ID or t_id == INVALID_HEX_ID:
-            geometries.append(None)
-        else:
-            q_f, r_f = decode_hex_id(f_id)
-            q_t, r_t = decode_hex_id(t_id)
-            hex_f = redblobhex.Hex(q_f, r_f, -q_f - r_f)
-            hex_t = redblobhex.Hex(q_t, r_t, -q_t - r_t)
-            lon_f, lat_f = hp.hex_to_lon_lat_SoA(hex_f)
-            lon_t, lat_t = hp.hex_to_lon_lat_SoA(hex_t)
-            geometries.append(LineString([(lon_f, lat_f), (lon_t, lat_t)]))
-    return geometries
+    _check_geometry_mode(geometry)
+    counts = hex_counts_lazy(hex_ids, reduce_dims=reduce_dims, grid=grid)
+    return _finish_geometry(_counts_table(counts), hp, geometry)
 
 
 def hex_connectivity(
-    hex_ids: xr.DataArray,
+    hex_ids: xr.DataArray | HexRuns,
     from_dim: str,
     from_idx: int,
     to_dim: str,
     to_idx: int,
     weight: xr.DataArray | None = None,
     hp: HexProj | None = None,
+    grid: HexGrid | None = None,
+    geometry: str = "eager",
 ) -> gpd.GeoDataFrame:
     """Build connectivity matrix from hex IDs along specified dimensions.
 
     Args:
-        hex_ids: xr.DataArray of int64 hex IDs.
+        hex_ids: xr.DataArray of int64 hex IDs, or ``HexRuns``. For runs,
+            from_dim and to_dim must both be the obs dim and the two obs
+            are looked up in the runs directly.
         from_dim: Dimension name for origin position.
         from_idx: Index along from_dim for origin.
         to_dim: Dimension name for destination position.
@@ -314,27 +628,51 @@ def hex_connectivity(
         weight: Optional xr.DataArray of same shape as hex_ids for weighting pairs.
         hp: Optional HexProj instance to compute LineString geometries.
             If None, creates a default HexProj for geometry computation.
+        grid: Optional registered ``HexGrid``. Pairs are then summed over
+            local indices with ``HexGrid.pair_sums`` instead of a groupby,
+            giving the same rows. Hexes outside the grid become
+            INVALID_HEX_ID.
+        geometry: "eager" (default), "lazy" or "none", as in ``hex_counts``.
 
     Returns:
         GeoDataFrame with:
         - Index: MultiIndex of ("from_id", "to_id")
         - Column "count": pair count (or summed weights)
         - Column "geometry": LineString between centroids, or None if either ID is INVALID
-    """
-    # Use default HexProj if none provided
-    if hp is None:
-        hp = HexProj()
+        A ``HexFrame`` or DataFrame without the geometry column for
+        ``geometry="lazy"`` / ``"none"``.
 
-    # Select origin and destination slices
-    from_slice = hex_ids.isel({from_dim: from_idx})
-    to_slice = hex_ids.isel({to_dim: to_idx})
+    Raises:
+        ValueError: When ``hex_ids`` is a ``HexRuns`` and from_dim or
+            to_dim is not its obs dim, or ``geometry`` is not one of
+            ``GEOMETRY_MODES``.
+    """
+    _check_geometry_mode(geometry)
+
+    if isinstance(hex_ids, HexRuns):
+        # look the two obs up in the runs; nothing is expanded
+        obs_dim = hex_ids.dims[1]
+        if from_dim != obs_dim or to_dim != obs_dim:
+            raise ValueError(
+                f"HexRuns connectivity runs along {obs_dim!r}; "
+                f"got from_dim={from_dim!r}, to_dim={to_dim!r}."
+            )
+        is_dask = False
+        from_flat = hex_ids.at_obs(from_idx)
+        to_flat = hex_ids.at_obs(to_idx)
+        if weight is not None:
+            weight = weight.transpose(*hex_ids.dims).compute()
+    else:
+        # Select origin and destination slices
+        from_slice = hex_ids.isel({from_dim: from_idx})
+        to_slice = hex_ids.isel({to_dim: to_idx})
 
-    is_dask = dask.is_dask_collection(hex_ids.data) or (
-        weight is not None and dask.is_dask_collection(weight.data)
-    )
+        is_dask = dask.is_dask_collection(hex_ids.data) or (
+            weight is not None and dask.is_dask_collection(weight.data)
+        )
 
-    from_flat = from_slice.data.ravel()
-    to_flat = to_slice.data.ravel()
+        from_flat = from_slice.data.ravel()
+        to_flat = to_slice.data.ravel()
 
     if weight is not None:
         w_flat = weight.isel({to_dim: to_idx}).data.ravel().astype(float)
@@ -344,44 +682,48 @@ def hex_connectivity(
         else:
             w_flat = np.ones_like(from_flat, dtype=float)
 
-    if is_dask:
-        from_flat = from_flat.astype(np.int64)
-        to_flat = to_flat.astype(np.int64)
-        df = dd.concat(
-            [
-                dd.from_dask_array(from_flat, columns="from_id"),
-                dd.from_dask_array(to_flat, columns="to_id"),
-                dd.from_dask_array(w_flat, columns="w"),
-            ],
-            axis=1,
+    if grid is not None:
+        from_local, to_local, counts_array = grid.pair_sums(
+            np.asarray(from_flat), np.asarray(to_flat), weights=np.asarray(w_flat)
         )
-        agg = df.groupby(["from_id", "to_id"])["w"].sum().compute()
+        from_ids_array = grid.hex_id_of(from_local)
+        to_ids_array = grid.hex_id_of(to_local)
+        # same (from_id, to_id) order as the groupby path
+        order = np.lexsort((to_ids_array, from_ids_array))
+        from_ids_array = from_ids_array[order]
+        to_ids_array = to_ids_array[order]
+        counts_array = counts_array[order]
     else:
-        df = pd.DataFrame({
-            "from_id": np.asarray(from_flat).astype(np.int64),
-            "to_id": np.asarray(to_flat).astype(np.int64),
-            "w": np.asarray(w_flat, dtype=float),
-        })
-        agg = df.groupby(["from_id", "to_id"])["w"].sum()
-
-    from_ids_array = agg.index.get_level_values("from_id").to_numpy().astype(np.int64)
-    to_ids_array = agg.index.get_level_values("to_id").to_numpy().astype(np.int64)
-    counts_array = agg.to_numpy()
+        if is_dask:
+            from_flat = from_flat.astype(np.int64)
+            to_flat = to_flat.astype(np.int64)
+            df = dd.concat(
+                [
+                    dd.from_dask_array(from_flat, columns="from_id"),
+                    dd.from_dask_array(to_flat, columns="to_id"),
+                    dd.from_dask_array(w_flat, columns="w"),
+                ],
+                axis=1,
+            )
+            agg = df.groupby(["from_id", "to_id"])["w"].sum().compute()
+        else:
+            df = pd.DataFrame({
+                "from_id": np.asarray(from_flat).astype(np.int64),
+                "to_id": np.asarray(to_flat).astype(np.int64),
+                "w": np.asarray(w_flat, dtype=float),
+            })
+            agg = df.groupby(["from_id", "to_id"])["w"].sum()
 
-    geometries = _build_edge_geometries(from_ids_array, to_ids_array, hp)
+        from_ids_array = agg.index.get_level_values("from_id").to_numpy().astype(np.int64)
+        to_ids_array = agg.index.get_level_values("to_id").to_numpy().astype(np.int64)
+        counts_array = agg.to_numpy()
 
     multi_index = pd.MultiIndex.from_arrays(
         [from_ids_array, to_ids_array],
         names=["from_id", "to_id"]
     )
-
-    result_gdf = gpd.GeoDataFrame(
-        {"count": counts_array, "geometry": geometries},
-        index=multi_index,
-        crs="EPSG:4326"
-    )
-
-    return result_gdf
+    table = pd.DataFrame({"count": counts_array}, index=multi_index)
+    return _finish_geometry(table, hp, geometry)
 
 
 def hex_connectivity_power(
@@ -389,6 +731,7 @@ def hex_connectivity_power(
     n: int,
     hp: HexProj,
     condition_on_valid: bool = False,
+    geometry: str = "eager",
 ) -> gpd.GeoDataFrame:
     """Compute n-generation connectivity from a connectivity GeoDataFrame.
 
@@ -397,13 +740,14 @@ def hex_connectivity_power(
     in the same GeoDataFrame format.
 
     Args:
-        conn: GeoDataFrame from hex_connectivity with MultiIndex ("from_id", "to_id"),
-              "count" column, and "geometry" column.
+        conn: Table from hex_connectivity (any geometry mode) with
+              MultiIndex ("from_id", "to_id") and a "count" column.
         n: Power to raise the transition matrix to.
         hp: HexProj instance for reconstructing LineString geometries.
         condition_on_valid: If True, condition on staying in-domain by zeroing
                             the INVALID column and renormalising. INVALID is
                             removed from the output. Default False.
+        geometry: "eager" (default), "lazy" or "none", as in ``hex_counts``.
 
     Returns:
         GeoDataFrame with:
@@ -411,7 +755,13 @@ def hex_connectivity_power(
         - Column "probability": float in [0, 1], the (i,j) entry of T^n
         - Column "geometry": LineString between centroids, or None if either ID is INVALID
         - Zero-probability pairs dropped (sparse representation)
+        A ``HexFrame`` or DataFrame without the geometry column for
+        ``geometry="lazy"`` / ``"none"``.
+
+    Raises:
+        ValueError: If ``geometry`` is not one of ``GEOMETRY_MODES``.
     """
+    _check_geometry_mode(geometry)
     # Collect all unique IDs appearing in either index level
     all_ids = sorted(
         set(conn.index.get_level_values("from_id"))
@@ -464,15 +814,9 @@ def hex_connectivity_power(
 
     from_ids_array = np.array(from_ids_out, dtype=np.int64)
     to_ids_array = np.array(to_ids_out, dtype=np.int64)
-    geometries = _build_edge_geometries(from_ids_array, to_ids_array, hp)
-
     multi_index = pd.MultiIndex.from_arrays(
         [from_ids_array, to_ids_array],
         names=["from_id", "to_id"]
     )
-
-    return gpd.GeoDataFrame(
-        {"probability": probs_out, "geometry": geometries},
-        index=multi_index,
-        crs="EPSG:4326",
-    )
+    table = pd.DataFrame({"probability": np.asarray(probs_out, dtype=float)}, index=multi_index)
+    return _finish_geometry(table, hp, geometry)
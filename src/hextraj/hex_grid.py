@@ -0,0 +1,221 @@
+"""Registered hex grids: map sparse hex IDs to dense local indices.
+
+Hex IDs are sparse int64 values, so aggregating them needs
+hashing (pandas groupby / value_counts). For the common fixed-domain case a
+``HexGrid`` registers the domain's hex IDs once (for example from
+``HexProj.region_of_hexes``) and maps labels to contiguous ``0..N-1``
+indices through a lookup table on the ID range (binary search for grids
+whose IDs are too spread out). Counting is then ``np.bincount`` and
+connectivity a flat 2-D ``np.bincount`` (a sort of the flat pair keys on
+large grids).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .hex_id import INVALID_HEX_ID
+
+# Local index of hex IDs outside the grid, including INVALID_HEX_ID.
+OUT_OF_GRID = np.int64(-1)
+
+# Largest hex ID span (max - min) served by a direct lookup table
+# (8 bytes per entry); wider grids fall back to binary search.
+_LUT_MAX_SPAN = 1 << 23
+
+# Largest (N + 1) ** 2 for which ``pair_sums`` sums in a dense table
+# (8 bytes per entry); larger grids sort the flat pair keys instead. The
+# table is also skipped when it would have more than _PAIR_TABLE_DENSITY
+# entries per pair, where sorting the few keys is faster.
+_PAIR_TABLE_MAX_SIZE = 1 << 23
+_PAIR_TABLE_DENSITY = 8
+
+
+class HexGrid:
+    """A fixed set of hex IDs with dense local indices ``0..N-1``.
+
+    Local indices follow sorted hex ID order. Aggregations put everything
+    outside the grid (invalid positions and hexes not registered) in one
+    extra bin at index ``N``.
+
+    Attributes:
+        hex_ids: Read-only sorted unique int64 hex IDs of the grid.
+    """
+
+    def __init__(self, hex_ids: ArrayLike):
+        """Register a grid.
+
+        Args:
+            hex_ids: Hex IDs of the grid, in any order and possibly
+                repeated. INVALID_HEX_ID is dropped.
+        """
+        hex_ids = np.unique(np.asarray(hex_ids, dtype=np.int64))
+        hex_ids = hex_ids[hex_ids != INVALID_HEX_ID]
+        hex_ids.flags.writeable = False
+        self.hex_ids = hex_ids
+
+        # Cantor IDs of a compact domain are dense enough for a lookup
+        # table indexed by ``id - min + 1``; both ends hold the outside bin
+        # so clipped out-of-range IDs land there. Space-filling-curve IDs
+        # of a domain straddling a curve quadrant boundary (the origin
+        # among them) are not, and use binary search.
+        self._lut = None
+        n = len(hex_ids)
+        if n and hex_ids[-1] - hex_ids[0] < _LUT_MAX_SPAN:
+            self._lut_offset = hex_ids[0] - 1
+            self._lut = np.full(hex_ids[-1] - hex_ids[0] + 3, n, dtype=np.int64)
+            self._lut[hex_ids - self._lut_offset] = np.arange(n)
+
+    def __len__(self) -> int:
+        """Number of hexes in the grid."""
+        return self.hex_ids.shape[0]
+
+    def __repr__(self) -> str:
+        """Repr."""
+        return f"HexGrid(n_hexes={len(self)})"
+
+    def index(self, hex_ids: ArrayLike) -> NDArray[np.int64]:
+        """Map hex IDs to local indices.
+
+        Args:
+            hex_ids: int64 hex IDs of any shape.
+
+        Returns:
+            int64 array of the same shape with values in ``0..N-1``, or
+            ``OUT_OF_GRID`` for IDs not in the grid.
+        """
+        idx = self._bin(hex_ids)
+        idx[idx == len(self)] = OUT_OF_GRID
+        return idx
+
+    def _bin(self, hex_ids: ArrayLike) -> NDArray[np.int64]:
+        """Like ``index`` but IDs outside the grid map to ``N``."""
+        hex_ids = np.asarray(hex_ids, dtype=np.int64)
+        shape = hex_ids.shape
+        # bin 1-D so scalar and 0-d IDs get writable arrays too
+        hex_ids = hex_ids.reshape(-1)
+        n = len(self)
+        if self._lut is not None:
+            idx = np.subtract(hex_ids, self._lut_offset)
+            np.take(self._lut, idx, mode="clip", out=idx)
+            return idx.reshape(shape)
+        idx = np.searchsorted(self.hex_ids, hex_ids).astype(np.int64, copy=False)
+        found = idx < n
+        found[found] = self.hex_ids[idx[found]] == hex_ids[found]
+        idx[~found] = n
+        return idx.reshape(shape)
+
+    def bincount(
+        self,
+        hex_ids: ArrayLike,
+        weights: ArrayLike | None = None,
+    ) -> NDArray:
+        """Count (or sum weights of) hex IDs per grid hex.
+
+        Args:
+            hex_ids: int64 hex IDs of any shape.
+            weights: Optional weights of the same shape.
+
+        Returns:
+            Array of length ``N + 1``: one entry per grid hex in local index
+            order, then everything outside the grid. int64 without weights,
+            float64 with.
+        """
+        idx = self._bin(hex_ids).ravel()
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float).ravel()
+            return np.bincount(idx, weights=weights, minlength=len(self) + 1)
+        return np.bincount(idx, minlength=len(self) + 1).astype(np.int64, copy=False)
+
+    def bincount2d(
+        self,
+        from_ids: ArrayLike,
+        to_ids: ArrayLike,
+        weights: ArrayLike | None = None,
+    ) -> NDArray:
+        """Count (or sum weights of) hex ID pairs on the grid.
+
+        A flat bincount over ``from * (N + 1) + to``; the result is dense,
+        so memory is ``8 * (N + 1) ** 2`` bytes. ``pair_sums`` returns only
+        the pairs that occur and scales to large grids.
+
+        Args:
+            from_ids: int64 origin hex IDs.
+            to_ids: int64 destination hex IDs, same shape.
+            weights: Optional weights of the same shape.
+
+        Returns:
+            ``(N + 1, N + 1)`` array indexed by local (from, to) index, the
+            last row / column holding pairs with an end outside the grid.
+            int64 without weights, float64 with.
+        """
+        m = len(self) + 1
+        key = self._bin(from_ids).ravel()
+        key *= m
+        key += self._bin(to_ids).ravel()
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float).ravel()
+            flat = np.bincount(key, weights=weights, minlength=m * m)
+        else:
+            flat = np.bincount(key, minlength=m * m).astype(np.int64, copy=False)
+        return flat.reshape(m, m)
+
+    def pair_sums(
+        self,
+        from_ids: ArrayLike,
+        to_ids: ArrayLike,
+        weights: ArrayLike | None = None,
+    ) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray]:
+        """Count (or sum weights of) the hex ID pairs that occur.
+
+        Many pairs on a small grid are summed in a dense table as in
+        ``bincount2d``; otherwise (and always above ``(N + 1) ** 2 = 2 **
+        23``) the flat pair keys are sorted, so memory follows the number
+        of pairs, not the grid.
+
+        Args:
+            from_ids: int64 origin hex IDs.
+            to_ids: int64 destination hex IDs, same shape.
+            weights: Optional weights of the same shape.
+
+        Returns:
+            ``(from_local, to_local, sums)`` for every pair occurring at
+            least once (also when its weights sum to zero), ordered by
+            local (from, to) index. Ends outside the grid have local index
+            ``N``. ``sums`` is int64 without weights, float64 with.
+        """
+        m = len(self) + 1
+        key = self._bin(from_ids).ravel()
+        key *= m
+        key += self._bin(to_ids).ravel()
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float).ravel()
+        if m * m <= min(_PAIR_TABLE_MAX_SIZE, _PAIR_TABLE_DENSITY * key.shape[0]):
+            counts = np.bincount(key, minlength=m * m)
+            keys = np.flatnonzero(counts)
+            if weights is None:
+                sums = counts[keys]
+            else:
+                sums = np.bincount(key, weights=weights, minlength=m * m)[keys]
+        else:
+            keys, inverse = np.unique(key, return_inverse=True)
+            sums = np.bincount(inverse.ravel(), weights=weights, minlength=keys.shape[0])
+        if weights is None:
+            sums = sums.astype(np.int64, copy=False)
+        from_local, to_local = np.divmod(keys, m)
+        return from_local, to_local, sums
+
+    def hex_id_of(self, local: ArrayLike) -> NDArray[np.int64]:
+        """Map local indices (or the out-of-grid bin ``N``) back to hex IDs.
+
+        Args:
+            local: Local indices in ``0..N``; ``N`` and ``OUT_OF_GRID`` map
+                to INVALID_HEX_ID.
+
+        Returns:
+            int64 hex IDs.
+        """
+        local = np.asarray(local, dtype=np.int64)
+        ids = np.append(self.hex_ids, INVALID_HEX_ID)
+        return ids[np.where(local == OUT_OF_GRID, len(self), local)]
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import math
+
 import numpy as np
 from numpy.typing import ArrayLike, NDArray
 
+from ._sfc import (
+    SFC_BIAS,
+    hilbert_decode,
+    hilbert_encode_inplace,
+    morton_decode,
+    morton_encode_inplace,
+)
 from .redblobhex_array import INTNaN
 
 
 INVALID_HEX_ID = np.int64(-1)
+INVALID_HEX_ID_INT32 = np.int32(-1)
+
+# "int32" stores the same Cantor IDs in half the memory for domains within
+# ``hex_id_budget("cantor", "int32")`` hexes of the origin.
+HEX_ID_DTYPES = ("int64", "int32")
+
+# "cantor" pairs zigzagged (q, r) and is unbounded in practice; "morton" and
+# "hilbert" order hexes along a space-filling curve, so nearby hexes get
+# nearby IDs, and need ``-2**30 <= q, r < 2**30`` (other input is invalid).
+HEX_ID_ENCODINGS = ("cantor", "morton", "hilbert")
+
+# Block length for the ``out=`` paths: temporaries never exceed one block.
+_BLOCK_SIZE = 1 << 16
 
 
 def _to_int64(x) -> np.ndarray:
@@ -16,67 +38,361 @@ def _to_int64(x) -> np.ndarray:
     return np.asarray(x, dtype=np.int64)
 
 
-def _z(n):
-    return np.where(n >= 0, 2 * n, -2 * n - 1)
+def _check_out(out, shape, name="out", dtype=np.int64) -> np.ndarray:
+    """Validate a caller-supplied output buffer (int64 unless ``dtype`` says)."""
+    dtype = np.dtype(dtype)
+    if not isinstance(out, np.ndarray) or out.dtype != dtype:
+        raise TypeError(f"{name} must be an {dtype} numpy array.")
+    if out.shape != tuple(shape):
+        raise ValueError(f"{name} has shape {out.shape}, expected {tuple(shape)}.")
+    if not out.flags.c_contiguous:
+        raise ValueError(f"{name} must be C-contiguous.")
+    return out
+
+
+def _triangular_inplace(w: np.ndarray, out: np.ndarray) -> None:
+    """``out = w * (w + 1) // 2``, exact for ``0 <= w < 2**32``.
+
+    The product is taken modulo 2**64 and halved as unsigned, so it is exact
+    even where ``w * (w + 1)`` itself does not fit int64.
+    """
+    np.add(w, 1, out=out)
+    np.multiply(out, w, out=out)
+    np.right_shift(out.view(np.uint64), 1, out=out.view(np.uint64))
+
+
+def _cantor_encode_inplace(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    """Encode int64 (q, r) buffers into ``out``, clobbering ``a`` and ``b``.
+
+    Cantor pairing of the zigzagged coordinates, without temporaries:
+    zigzag is ``(n << 1) ^ (n >> 63)``. Pairs whose ID would not fit int64
+    (including any INTNaN coordinate) map to INVALID_HEX_ID.
+    """
+    np.right_shift(a, 63, out=out)
+    np.left_shift(a, 1, out=a)
+    np.bitwise_xor(a, out, out=a)
+    np.right_shift(b, 63, out=out)
+    np.left_shift(b, 1, out=b)
+    np.bitwise_xor(b, out, out=b)
+    np.add(a, b, out=out)  # diagonal s
+
+    # The ID fits int64 only if both zigzags and s are below 2**32. Where
+    # they are not, force s = 0 and b = -1 so the result is -1.
+    np.bitwise_or(a, b, out=a)
+    np.bitwise_or(a, out, out=a)
+    np.right_shift(a.view(np.uint64), 32, out=a.view(np.uint64))
+    np.negative(a, out=a)
+    np.right_shift(a, 63, out=a)  # -1 where too large, else 0
+    np.bitwise_or(b, a, out=b)
+    np.invert(a, out=a)
+    np.bitwise_and(out, a, out=out)
+
+    _triangular_inplace(out, a)
+    np.add(a, b, out=out)
+    # s < 2**32 keeps the sum below 2**64; past 2**63 it wraps negative
+    np.right_shift(out, 63, out=a)
+    np.bitwise_or(out, a, out=out)
+
+
+_TRIANGULAR_ROOT_MAX = (1 << 32) - 2
+
+
+def _cantor_decode_inplace(
+    hex_id: np.ndarray, q: np.ndarray, r: np.ndarray, f: np.ndarray, m: np.ndarray
+) -> None:
+    """Decode int64 Cantor IDs into ``q`` and ``r``.
+
+    ``f`` (float64) and ``m`` (bool) are scratch buffers of the same length.
+
+    The diagonal ``w`` (largest with ``w * (w + 1) / 2 <= id``) is estimated
+    with a float64 square root and then corrected in integer arithmetic, so
+    every ID in ``0 .. 2**63 - 1`` decodes exactly. Negative IDs (such as
+    INVALID_HEX_ID) map to INTNaN.
+    """
+    t = f.view(np.int64)
+    np.maximum(hex_id, 0, out=r)
+    np.multiply(r, 8.0, out=f)
+    np.add(f, 1.0, out=f)
+    np.sqrt(f, out=f)
+    np.subtract(f, 1.0, out=f)
+    np.multiply(f, 0.5, out=f)
+    np.floor(f, out=f)
+    np.copyto(q, f, casting="unsafe")
+
+    # The estimate is off by at most one. Clamp so w + 1 stays below 2**32,
+    # step down if T(w) > id, then up if T(w + 1) <= id, using the sign of
+    # the difference as the step.
+    np.minimum(q, _TRIANGULAR_ROOT_MAX, out=q)
+    _triangular_inplace(q, t)
+    np.subtract(r, t, out=t)
+    np.right_shift(t, 63, out=t)
+    np.add(q, t, out=q)
+    _triangular_inplace(q, t)
+    np.add(t, q, out=t)
+    np.add(t, 1, out=t)  # T(w + 1)
+    np.subtract(r, t, out=t)
+    np.right_shift(t, 63, out=t)
+    np.add(q, 1, out=q)
+    np.add(q, t, out=q)
+
+    # b = id - T(w), a = w - b
+    _triangular_inplace(q, t)
+    np.subtract(r, t, out=r)
+    np.subtract(q, r, out=q)
+
+    # inverse zigzag: (z >> 1) ^ -(z & 1)
+    for z in (q, r):
+        np.bitwise_and(z, 1, out=t)
+        np.negative(t, out=t)
+        np.right_shift(z, 1, out=z)
+        np.bitwise_xor(z, t, out=z)
+
+    np.less(hex_id, 0, out=m)
+    np.copyto(q, INTNaN, where=m)
+    np.copyto(r, INTNaN, where=m)
+
+
+def _check_hex_id_dtype(dtype: str) -> None:
+    if dtype not in HEX_ID_DTYPES:
+        raise ValueError(f"hex ID dtype must be one of {HEX_ID_DTYPES}, got {dtype!r}.")
+
+
+def hex_id_budget(encoding: str = "cantor", dtype: str = "int64") -> int:
+    """Largest M such that every hex with ``|q|, |r| <= M`` gets a valid ID.
+
+    Args:
+        encoding: One of ``HEX_ID_ENCODINGS``.
+        dtype: One of ``HEX_ID_DTYPES``.
+
+    Returns:
+        M in hexes from the origin. For the default layout a hex M steps
+        out along q is about ``1.5 * M * hex_size_meters`` away.
+
+    Raises:
+        ValueError: For an unknown encoding or dtype, or a space-filling
+            curve encoding with int32 IDs (not supported).
+    """
+    _check_encoding(encoding)
+    _check_hex_id_dtype(dtype)
+    if encoding != "cantor":
+        if dtype != "int64":
+            raise ValueError(f"{encoding!r} hex IDs need dtype 'int64'.")
+        return int(SFC_BIAS) - 1
+    # the largest ID in the square is at q = r = M: T(4M) + 2M
+    id_max = int(np.iinfo(dtype).max)
+    m = math.isqrt(id_max // 8)
+    while (4 * m + 4) * (4 * m + 5) // 2 + 2 * m + 2 <= id_max:
+        m += 1
+    while 4 * m * (4 * m + 1) // 2 + 2 * m > id_max:
+        m -= 1
+    return m
+
+
+def _narrow_into(hex_id: np.ndarray, out: np.ndarray) -> None:
+    """Copy int64 hex IDs into ``out``, which may be int32.
+
+    Raises:
+        OverflowError: If an ID does not fit the dtype of ``out``.
+    """
+    if out.dtype != np.int64 and hex_id.size:
+        top = hex_id.max()
+        if top > np.iinfo(out.dtype).max:
+            raise OverflowError(
+                f"hex ID {top} does not fit {out.dtype}: the position lies "
+                f"outside the {out.dtype} hex ID budget. Use int64 hex IDs "
+                "or larger hexes."
+            )
+    np.copyto(out, hex_id, casting="unsafe")
+
+
+def _check_encoding(encoding: str) -> None:
+    if encoding not in HEX_ID_ENCODINGS:
+        raise ValueError(
+            f"encoding must be one of {HEX_ID_ENCODINGS}, got {encoding!r}."
+        )
+
+
+def _sfc_encode_inplace(kernel):
+    """Wrap a biased space-filling-curve kernel into an ``(a, b, out)`` encoder.
+
+    Like ``_cantor_encode_inplace`` it clobbers ``a`` and ``b``; unlike it,
+    coordinates outside the curve's range (including INTNaN) come out as
+    INVALID_HEX_ID.
+    """
+    limit = np.uint64(2 * SFC_BIAS)
+
+    def encode_inplace(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+        np.add(a, SFC_BIAS, out=a)
+        np.add(b, SFC_BIAS, out=b)
+        # one unsigned compare catches both ends of the range
+        outside = a.view(np.uint64) >= limit
+        outside |= b.view(np.uint64) >= limit
+        np.copyto(a, 0, where=outside)
+        np.copyto(b, 0, where=outside)
+        kernel(a, b, out)
+        np.copyto(out, INVALID_HEX_ID, where=outside)
+
+    return encode_inplace
+
+
+_ENCODE_INPLACE = {
+    "cantor": _cantor_encode_inplace,
+    "morton": _sfc_encode_inplace(morton_encode_inplace),
+    "hilbert": _sfc_encode_inplace(hilbert_encode_inplace),
+}
+
+_SFC_DECODE = {"morton": morton_decode, "hilbert": hilbert_decode}
 
 
-def _z_inv(n):
-    return np.where(n % 2 == 0, n // 2, -(n + 1) // 2)
+def _sfc_decode(hex_id: np.ndarray, encoding: str):
+    """Decode numpy space-filling-curve IDs; negative IDs map to INTNaN."""
+    shape = hex_id.shape
+    hex_id = hex_id.reshape(-1)
+    invalid = hex_id < 0
+    a, b = _SFC_DECODE[encoding](np.where(invalid, np.int64(0), hex_id))
+    a -= SFC_BIAS
+    b -= SFC_BIAS
+    np.copyto(a, INTNaN, where=invalid)
+    np.copyto(b, INTNaN, where=invalid)
+    return a.reshape(shape), b.reshape(shape)
 
 
-def encode_hex_id(q: ArrayLike, r: ArrayLike) -> np.int64 | NDArray[np.int64]:
-    """Encode (q, r) hex coordinates to a single int64 via Cantor pairing.
+def _encode_into(
+    q: np.ndarray, r: np.ndarray, out: np.ndarray, encoding: str = "cantor"
+) -> np.ndarray:
+    q, r = np.broadcast_arrays(np.asarray(q), np.asarray(r))
+    _check_out(out, q.shape)
+    encode_inplace = _ENCODE_INPLACE[encoding]
+    q_flat, r_flat, out_flat = q.reshape(-1), r.reshape(-1), out.reshape(-1)
+    n_block = min(_BLOCK_SIZE, out_flat.shape[0])
+    a = np.empty(n_block, dtype=np.int64)
+    b = np.empty(n_block, dtype=np.int64)
+    # INTNaN coordinates are out of range for every encoding, so the
+    # kernels map them to INVALID_HEX_ID
+    for start in range(0, out_flat.shape[0], _BLOCK_SIZE):
+        stop = min(start + _BLOCK_SIZE, out_flat.shape[0])
+        n = stop - start
+        np.copyto(a[:n], q_flat[start:stop], casting="unsafe")
+        np.copyto(b[:n], r_flat[start:stop], casting="unsafe")
+        encode_inplace(a[:n], b[:n], out_flat[start:stop])
+    return out
+
+
+def encode_hex_id(
+    q: ArrayLike,
+    r: ArrayLike,
+    out: NDArray[np.int64] | None = None,
+    encoding: str = "cantor",
+) -> np.int64 | NDArray[np.int64]:
+    """Encode (q, r) hex coordinates to a single int64.
 
     Args:
         q: Axial q coordinate(s). int64 scalar, ndarray, or dask array.
         r: Axial r coordinate(s). int64 scalar, ndarray, or dask array.
+        out: Optional preallocated C-contiguous int64 ndarray of the
+            broadcast input shape to write the IDs into. numpy input only.
+        encoding: One of ``HEX_ID_ENCODINGS``. Defaults to "cantor"
+            (Cantor pairing of the zigzagged coordinates).
 
     Returns:
-        int64 scalar or array of hex IDs. Inputs where q or r equal INTNaN
-        map to INVALID_HEX_ID.
+        int64 scalar or array of hex IDs (``out`` if given). Inputs where q
+        or r equal INTNaN, or lie outside the range of a space-filling-curve
+        encoding, map to INVALID_HEX_ID.
+
+    Raises:
+        ValueError: If ``encoding`` is unknown.
     """
+    _check_encoding(encoding)
+    if out is not None:
+        return _encode_into(q, r, out, encoding)
     q = _to_int64(q)
     r = _to_int64(r)
-    invalid = (q == INTNaN) | (r == INTNaN)
-    a, b = _z(q), _z(r)
-    s = a + b
-    result = np.where(invalid, INVALID_HEX_ID, s * (s + 1) // 2 + b)
+    if hasattr(q, "map_blocks") or hasattr(r, "map_blocks"):
+        import dask.array as dsa
+
+        q, r = dsa.broadcast_arrays(dsa.asarray(q), dsa.asarray(r))
+        return dsa.map_blocks(
+            _encode_blocks, q, r.rechunk(q.chunks),
+            encoding=encoding, dtype=np.int64,
+        )
+    result = _encode_blocks(q, r, encoding)
     # numpy scalar path: ndim==0 only occurs for numpy arrays, not dask
-    if hasattr(result, "ndim") and result.ndim == 0:
-        return np.int64(result)
-    return result.astype(np.int64)
+    return np.int64(result) if result.ndim == 0 else result
+
+
+def _encode_blocks(q, r, encoding: str) -> np.ndarray:
+    q, r = np.broadcast_arrays(q, r)
+    return _encode_into(q, r, np.empty(q.shape, dtype=np.int64), encoding)
+
+
+def _decode_into(hex_id, out, encoding: str = "cantor"):
+    hex_id = np.asarray(hex_id)
+    q_out, r_out = out
+    _check_out(q_out, hex_id.shape, name="out[0]")
+    _check_out(r_out, hex_id.shape, name="out[1]")
+    id_flat, q_flat, r_flat = hex_id.reshape(-1), q_out.reshape(-1), r_out.reshape(-1)
+    if encoding == "cantor":
+        n_block = min(_BLOCK_SIZE, id_flat.shape[0])
+        ids = np.empty(n_block, dtype=np.int64)
+        f = np.empty(n_block, dtype=np.float64)
+        m = np.empty(n_block, dtype=bool)
+    for start in range(0, id_flat.shape[0], _BLOCK_SIZE):
+        stop = min(start + _BLOCK_SIZE, id_flat.shape[0])
+        n = stop - start
+        if encoding == "cantor":
+            np.copyto(ids[:n], id_flat[start:stop], casting="unsafe")
+            _cantor_decode_inplace(
+                ids[:n], q_flat[start:stop], r_flat[start:stop], f[:n], m[:n]
+            )
+        else:
+            q_flat[start:stop], r_flat[start:stop] = _sfc_decode(
+                np.asarray(id_flat[start:stop], dtype=np.int64), encoding
+            )
+    return q_out, r_out
+
+
+def _decode_stacked(hex_id: np.ndarray, encoding: str) -> np.ndarray:
+    """Decode a numpy block into a ``(2, *hex_id.shape)`` array of (q, r)."""
+    qr = np.empty((2,) + hex_id.shape, dtype=np.int64)
+    _decode_into(hex_id, (qr[0, ...], qr[1, ...]), encoding)
+    return qr
 
 
 def decode_hex_id(
     hex_id: ArrayLike,
+    out: tuple[NDArray[np.int64], NDArray[np.int64]] | None = None,
+    encoding: str = "cantor",
 ) -> tuple[np.int64, np.int64] | tuple[NDArray[np.int64], NDArray[np.int64]]:
-    """Decode a Cantor int64 hex ID back to (q, r) axial coordinates.
+    """Decode an int64 hex ID back to (q, r) axial coordinates.
 
     Args:
         hex_id: int64 scalar, ndarray, or dask array of hex IDs.
+        out: Optional pair of preallocated C-contiguous int64 ndarrays
+            shaped like ``hex_id`` to write q and r into. numpy input only;
+            temporaries are then bounded to one block.
+        encoding: Encoding the IDs were made with, one of
+            ``HEX_ID_ENCODINGS``. Defaults to "cantor".
 
     Returns:
-        Tuple (q, r) of same type as input. INVALID_HEX_ID maps to (INTNaN, INTNaN).
+        Tuple (q, r) of same type as input (``out`` if given). INVALID_HEX_ID
+        maps to (INTNaN, INTNaN).
+
+    Raises:
+        ValueError: If ``encoding`` is unknown.
     """
+    _check_encoding(encoding)
+    if out is not None:
+        return _decode_into(hex_id, out, encoding)
     hex_id = _to_int64(hex_id)
+    if hasattr(hex_id, "map_blocks"):
+        # one task decodes both coordinates of a block
+        qr = hex_id.map_blocks(
+            _decode_stacked, encoding=encoding, new_axis=0,
+            chunks=((2,),) + hex_id.chunks, dtype=np.int64,
+        )
+        return qr[0], qr[1]
+    qr = _decode_stacked(hex_id, encoding)
     # scalar path: ndim==0 only occurs for numpy scalars, not dask arrays
-    scalar = hex_id.ndim == 0
-
-    invalid = hex_id == INVALID_HEX_ID
-
-    safe = np.where(invalid, np.int64(0), hex_id)
-    w = np.floor((np.sqrt(8 * safe.astype(float) + 1) - 1) / 2).astype(np.int64)
-    t = w * (w + 1) // 2
-    b = hex_id - t
-    a = w - b
-
-    q = _z_inv(a).astype(np.int64)
-    r = _z_inv(b).astype(np.int64)
-
-    if scalar:
-        return (np.int64(INTNaN), np.int64(INTNaN)) if invalid else (np.int64(q), np.int64(r))
-
-    # Use np.where instead of item assignment so dask arrays stay lazy
-    q = np.where(invalid, INTNaN, q)
-    r = np.where(invalid, INTNaN, r)
-    return q, r
+    if hex_id.ndim == 0:
+        return np.int64(qr[0]), np.int64(qr[1])
+    return qr[0], qr[1]
@@ -0,0 +1,276 @@
+"""Precomputed lon/lat lookup rasters for labelling a fixed domain.
+
+Operational output is labelled over and over on the same domain and
+HexProj, and almost all of the cost of ``HexProj.label`` is the projection.
+A ``HexRaster`` pays it once: it splits the domain into a regular lon/lat
+raster and stores the hex ID of every cell that lies well inside a single
+hex. Labelling is then a cell index computation and one gather. Positions
+in cells that straddle a hex edge (or outside the raster) go through the
+exact ``HexProj.label``, so results are identical to it.
+
+A cell is stored when its centre is further from the hex edge than
+``_SAFETY`` times the distance to its furthest corner, both measured in
+the hex's own (fractional axial coordinate) metric after projection. Over
+a cell the projection departs from affine by about cell size / earth
+radius, so the extra quarter leaves ample room for that curvature and for
+positions rounded into a neighbouring cell.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+
+import numpy as np
+import xarray as xr
+from numpy.typing import ArrayLike, NDArray
+
+from . import redblobhex_array as redblobhex
+from ._label import BLOCK_SIZE
+from .hexproj import HexProj, _as_float_array, _as_ids, _is_dask_array
+from .hex_id import _check_out
+
+# Raster value of cells that straddle a hex edge.
+_MIXED = -2
+
+# Cell centre to hex edge distance needed, in units of centre to corner.
+_SAFETY = 1.25
+
+# Margin (in units of the hex inradius) kept on top of the geometric bound,
+# so float64 round-off in ``HexProj.label`` cannot flip a stored cell.
+_EPS = 1e-6
+
+_HEXPROJ_PARAMS = tuple(inspect.signature(HexProj).parameters)
+
+
+def _frac_hex(hp: HexProj, lon, lat) -> tuple[np.ndarray, np.ndarray]:
+    """Fractional axial (q, r) of lon/lat positions."""
+    frac = redblobhex.pixel_to_hex(hp.hex_layout_projected, hp.project(lon, lat))
+    return frac.q, frac.r
+
+
+def _hex_norm(dq, dr) -> np.ndarray:
+    """Hex metric of axial offsets: 1 on the edge of the hex around 0."""
+    return np.maximum(
+        np.abs(dq - dr), np.maximum(np.abs(dq + 2 * dr), np.abs(2 * dq + dr))
+    )
+
+
+def _fill_rows(hp: HexProj, lon_edges, lat_edges, out) -> None:
+    """Raster values of the cells between the given edges into ``out``."""
+    q_edge, r_edge = _frac_hex(hp, lon_edges, lat_edges[:, None])
+    q_c, r_c = _frac_hex(
+        hp,
+        (lon_edges[:-1] + lon_edges[1:]) / 2,
+        (lat_edges[:-1, None] + lat_edges[1:, None]) / 2,
+    )
+    n, m = q_c.shape
+    radius = np.zeros((n, m))
+    for i, j in ((0, 0), (0, 1), (1, 0), (1, 1)):
+        dq = q_edge[i:i + n, j:j + m] - q_c
+        dr = r_edge[i:i + n, j:j + m] - r_c
+        np.maximum(radius, _hex_norm(dq, dr), out=radius)
+
+    hex_c = redblobhex.hex_round(redblobhex.Hex(q_c, r_c, -q_c - r_c))
+    margin = 1 - _hex_norm(q_c - hex_c.q, r_c - hex_c.r)
+    exact = margin > _SAFETY * radius + _EPS
+    out[...] = _MIXED
+    out[exact] = hp.encode_hex_id(hex_c.q[exact], hex_c.r[exact])
+
+
+class HexRaster:
+    """Lon/lat lookup raster of hex IDs for one HexProj and domain.
+
+    Build with ``HexRaster.build``; persist with ``save`` and ``load``.
+
+    Attributes:
+        hexproj: The HexProj whose IDs the raster holds.
+        lon_min: West edge of the raster.
+        lat_min: South edge of the raster.
+        resolution: Cell size in degrees.
+        hex_ids: ``(n_lat, n_lon)`` hex ID of each cell, or ``-2`` for
+            cells resolved by the exact fallback.
+    """
+
+    def __init__(
+        self,
+        hexproj: HexProj,
+        lon_min: float,
+        lat_min: float,
+        resolution: float,
+        hex_ids: ArrayLike,
+    ):
+        """Wrap a raster. Use ``build`` to compute one.
+
+        Args:
+            hexproj: HexProj the IDs belong to.
+            lon_min: West edge of the raster.
+            lat_min: South edge of the raster.
+            resolution: Cell size in degrees.
+            hex_ids: 2-D ``(n_lat, n_lon)`` IDs of ``hexproj.hex_id_dtype``.
+        """
+        self.hexproj = hexproj
+        self.lon_min = float(lon_min)
+        self.lat_min = float(lat_min)
+        self.resolution = float(resolution)
+        self.hex_ids = np.ascontiguousarray(hex_ids, dtype=hexproj._id_dtype)
+        self.hex_ids.flags.writeable = False
+
+    @classmethod
+    def build(
+        cls,
+        hexproj: HexProj,
+        lon_min: float,
+        lon_max: float,
+        lat_min: float,
+        lat_max: float,
+        resolution: float,
+    ) -> HexRaster:
+        """Compute the lookup raster of a lon/lat box.
+
+        The share of cells stored (``exact_fraction``) falls with the ratio
+        of cell to hex size, so pick a resolution well below the hex size:
+        0.005 degree cells store about 92 % of a 10 km hex grid at 54N.
+
+        Args:
+            hexproj: HexProj to label with.
+            lon_min: West edge of the box.
+            lon_max: East edge of the box.
+            lat_min: South edge of the box.
+            lat_max: North edge of the box.
+            resolution: Cell size in degrees.
+
+        Returns:
+            HexRaster covering the box (rounded out to whole cells).
+
+        Raises:
+            ValueError: If the box is empty or ``resolution`` not positive.
+        """
+        if not resolution > 0:
+            raise ValueError(f"resolution must be positive, got {resolution}.")
+        if not (lon_max > lon_min and lat_max > lat_min):
+            raise ValueError("lon/lat box is empty.")
+        n_lon = int(np.ceil((lon_max - lon_min) / resolution))
+        n_lat = int(np.ceil((lat_max - lat_min) / resolution))
+        hex_ids = np.empty((n_lat, n_lon), dtype=hexproj._id_dtype)
+
+        lon_edges = lon_min + resolution * np.arange(n_lon + 1)
+        lat_edges = lat_min + resolution * np.arange(n_lat + 1)
+        rows = max(1, BLOCK_SIZE // (n_lon + 1))
+        with np.errstate(invalid="ignore"):
+            for row in range(0, n_lat, rows):
+                _fill_rows(
+                    hexproj, lon_edges, lat_edges[row:row + rows + 1],
+                    hex_ids[row:row + rows],
+                )
+        return cls(hexproj, lon_min, lat_min, resolution, hex_ids)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """``(n_lat, n_lon)`` of the raster."""
+        return self.hex_ids.shape
+
+    @property
+    def exact_fraction(self) -> float:
+        """Share of cells answered by lookup alone."""
+        return float(np.mean(self.hex_ids != _MIXED)) if self.hex_ids.size else 0.0
+
+    def label(
+        self,
+        lon: ArrayLike,
+        lat: ArrayLike,
+        out: NDArray[np.int64] | None = None,
+    ) -> np.int64 | NDArray[np.int64]:
+        """Map lon/lat coordinates to hex IDs, equal to ``hexproj.label``.
+
+        Args:
+            lon: Longitude(s) as scalar, array-like, dask array or DataArray.
+                Longitudes are not wrapped: positions outside the raster's
+                lon range use the exact fallback.
+            lat: Latitude(s), broadcastable against lon.
+            out: Optional preallocated C-contiguous array of the input shape
+                and ``hexproj.hex_id_dtype`` to write the IDs into.
+
+        Returns:
+            Scalar or ndarray of hex IDs (``out`` if given), or a DataArray
+            / dask array for lazy input, as in ``HexProj.label``.
+
+        Raises:
+            ValueError: When ``out`` is given with lazy input.
+        """
+        hp = self.hexproj
+        if isinstance(lon, xr.DataArray) or isinstance(lat, xr.DataArray) or (
+            _is_dask_array(lon) or _is_dask_array(lat)
+        ):
+            if out is not None:
+                raise ValueError("out is not supported for lazy input.")
+            return hp._label_lazy(lon, lat, labeller=self.label)
+
+        lon, lat = np.broadcast_arrays(_as_float_array(lon), _as_float_array(lat))
+        if out is None:
+            result = np.empty(lon.shape, dtype=hp._id_dtype)
+        else:
+            result = _check_out(out, lon.shape, dtype=hp._id_dtype)
+        lon_flat, lat_flat, ids_flat = lon.reshape(-1), lat.reshape(-1), result.reshape(-1)
+        n_lat, n_lon = self.shape
+        inv = 1.0 / self.resolution
+        for start in range(0, ids_flat.shape[0], BLOCK_SIZE):
+            block = slice(start, start + BLOCK_SIZE)
+            i = (lat_flat[block] - self.lat_min) * inv
+            j = (lon_flat[block] - self.lon_min) * inv
+            # NaN compares False, so invalid positions fall through too
+            inside = (i >= 0) & (i < n_lat) & (j >= 0) & (j < n_lon)
+            cell = np.where(inside, i, 0).astype(np.int64) * n_lon
+            cell += np.where(inside, j, 0).astype(np.int64)
+            ids = ids_flat[block]
+            np.take(self.hex_ids, cell, out=ids)
+            miss = ~inside
+            miss |= ids == _MIXED
+            if miss.any():
+                ids[miss] = hp.label(lon_flat[block][miss], lat_flat[block][miss])
+        return _as_ids(result, out)
+
+    def save(self, path) -> None:
+        """Write the raster to a compressed ``.npz`` file.
+
+        Args:
+            path: File name or open binary file.
+        """
+        params = dict(zip(_HEXPROJ_PARAMS, self.hexproj._constructor_args()))
+        np.savez_compressed(
+            path,
+            hex_ids=self.hex_ids,
+            lon_min=self.lon_min,
+            lat_min=self.lat_min,
+            resolution=self.resolution,
+            hexproj=json.dumps(params),
+        )
+
+    @classmethod
+    def load(cls, path) -> HexRaster:
+        """Read a raster written by ``save``.
+
+        Args:
+            path: File name or open binary file.
+
+        Returns:
+            HexRaster with its HexProj rebuilt from the stored parameters.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            hexproj = HexProj(**json.loads(str(data["hexproj"])))
+            return cls(
+                hexproj,
+                float(data["lon_min"]),
+                float(data["lat_min"]),
+                float(data["resolution"]),
+                data["hex_ids"],
+            )
+
+    def __repr__(self) -> str:
+        """Repr."""
+        n_lat, n_lon = self.shape
+        return (
+            f"HexRaster(lon_min={self.lon_min!r}, lat_min={self.lat_min!r}, "
+            f"resolution={self.resolution!r}, shape=({n_lat}, {n_lon}), "
+            f"exact_fraction={self.exact_fraction:.3f})"
+        )
@@ -0,0 +1,190 @@
+"""Run-length encoded hex labels for (traj, obs) trajectory data.
+
+Particles stay in the same hex for many consecutive observations, so a
+dense ``(traj, obs)`` array of hex IDs is mostly repeats. ``HexRuns`` stores
+one row per run instead: ``(traj, start_obs, length, hex_id)``. Runs tile
+the full ``(traj, obs)`` grid, sorted by traj then start_obs, and never
+span two trajectories; NaN positions (including the padding of ragged
+trajectories) are runs of INVALID_HEX_ID.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, NDArray
+
+
+class HexRuns:
+    """Run-length encoded int64 hex IDs of shape ``(n_traj, n_obs)``.
+
+    Build with ``HexProj.label_runs`` (labels and encodes block by block,
+    never holding the dense IDs) or ``HexRuns.from_dense``.
+    ``hex_counts``, ``hex_counts_lazy``, ``hex_connectivity`` and
+    ``hex_connectivity_dask`` accept a ``HexRuns`` in place of dense IDs.
+
+    Attributes:
+        traj: int64 trajectory index of each run.
+        start_obs: int32 first obs index of each run.
+        length: int32 number of observations in each run.
+        hex_id: int64 hex ID of each run.
+        shape: ``(n_traj, n_obs)`` of the dense array.
+        dims: ``(traj_dim, obs_dim)`` names.
+        coords: Mapping from dim name to coordinate values, for dims that
+            had coordinates in the labelled input.
+    """
+
+    def __init__(
+        self,
+        traj: ArrayLike,
+        start_obs: ArrayLike,
+        length: ArrayLike,
+        hex_id: ArrayLike,
+        shape: tuple[int, int],
+        dims: tuple[str, str] = ("traj", "obs"),
+        coords: dict | None = None,
+    ):
+        """Wrap run arrays. No validation beyond dtypes is done.
+
+        Args:
+            traj: Trajectory index of each run.
+            start_obs: First obs index of each run.
+            length: Run length in observations.
+            hex_id: Hex ID of each run.
+            shape: ``(n_traj, n_obs)`` of the dense array.
+            dims: ``(traj_dim, obs_dim)`` names. Defaults to
+                ``("traj", "obs")``.
+            coords: Optional mapping from dim name to coordinate values.
+        """
+        self.traj = np.asarray(traj, dtype=np.int64)
+        self.start_obs = np.asarray(start_obs, dtype=np.int32)
+        self.length = np.asarray(length, dtype=np.int32)
+        self.hex_id = np.asarray(hex_id, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.dims = tuple(dims)
+        self.coords = dict(coords or {})
+
+    @classmethod
+    def from_dense(
+        cls,
+        hex_ids,
+        dims: tuple[str, str] | None = None,
+    ) -> HexRuns:
+        """Run-length encode a dense 2-D array of hex IDs.
+
+        Args:
+            hex_ids: 2-D int64 ndarray or ``xr.DataArray`` ordered
+                ``(traj, obs)``.
+            dims: ``(traj_dim, obs_dim)``. Taken from a DataArray when None,
+                ``("traj", "obs")`` otherwise.
+
+        Returns:
+            HexRuns.
+
+        Raises:
+            ValueError: If ``hex_ids`` is not 2-D.
+        """
+        coords = {}
+        if hasattr(hex_ids, "dims"):
+            if dims is None:
+                dims = hex_ids.dims
+            hex_ids = hex_ids.transpose(*dims)
+            coords = {d: hex_ids[d].values for d in dims if d in hex_ids.coords}
+            hex_ids = hex_ids.values
+        hex_ids = np.asarray(hex_ids, dtype=np.int64)
+        if hex_ids.ndim != 2:
+            raise ValueError(
+                f"hex_ids must be 2-D (traj, obs), got {hex_ids.ndim} dims."
+            )
+        runs = _encode_rows(hex_ids, 0)
+        return cls(*runs, shape=hex_ids.shape, dims=dims or ("traj", "obs"), coords=coords)
+
+    @classmethod
+    def _concat(cls, parts, shape, dims, coords) -> HexRuns:
+        """Join per-block ``_encode_rows`` results in traj order."""
+        if not parts:
+            parts = [tuple(np.empty(0, dtype=np.int64) for _ in range(4))]
+        return cls(
+            *(np.concatenate(column) for column in zip(*parts)),
+            shape=shape, dims=dims, coords=coords,
+        )
+
+    def __len__(self) -> int:
+        """Number of runs."""
+        return self.hex_id.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the run arrays."""
+        return (
+            self.traj.nbytes + self.start_obs.nbytes
+            + self.length.nbytes + self.hex_id.nbytes
+        )
+
+    def to_dense(self) -> NDArray[np.int64]:
+        """Expand back to the dense ``(n_traj, n_obs)`` int64 array."""
+        return np.repeat(self.hex_id, self.length).reshape(self.shape)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """One row per run with columns traj, start_obs, length, hex_id.
+
+        The traj column holds positional indices; see ``coords`` for the
+        coordinate values.
+        """
+        return pd.DataFrame({
+            "traj": self.traj,
+            "start_obs": self.start_obs,
+            "length": self.length,
+            "hex_id": self.hex_id,
+        })
+
+    def at_obs(self, obs: int) -> NDArray[np.int64]:
+        """Hex ID of every trajectory at one obs index.
+
+        Args:
+            obs: Obs index; negative values count from the end as in
+                ``isel``.
+
+        Returns:
+            int64 array of length ``n_traj``.
+
+        Raises:
+            IndexError: If ``obs`` is out of range.
+        """
+        n_traj, n_obs = self.shape
+        if not -n_obs <= obs < n_obs:
+            raise IndexError(f"obs index {obs} out of range for {n_obs} obs.")
+        obs = obs % n_obs
+        keys = self.traj * n_obs + self.start_obs
+        wanted = np.arange(n_traj, dtype=np.int64) * n_obs + obs
+        return self.hex_id[np.searchsorted(keys, wanted, side="right") - 1]
+
+    def __repr__(self) -> str:
+        """Repr."""
+        return (
+            f"HexRuns(n_runs={len(self)}, shape={self.shape}, dims={self.dims})"
+        )
+
+
+def _encode_rows(hex_ids: np.ndarray, traj_offset: int):
+    """Runs of a C-ordered 2-D block of hex IDs whose first row is ``traj_offset``.
+
+    Returns:
+        Tuple (traj, start_obs, length, hex_id) of 1-D arrays.
+    """
+    n_rows, n_obs = hex_ids.shape
+    starts = np.empty(hex_ids.shape, dtype=bool)
+    starts[:, :1] = True
+    np.not_equal(hex_ids[:, 1:], hex_ids[:, :-1], out=starts[:, 1:])
+    flat = np.flatnonzero(starts)
+    # every row opens with a run, so the next start also ends the last run
+    # of the previous row
+    length = np.diff(flat, append=n_rows * n_obs)
+    traj, start_obs = np.divmod(flat, n_obs) if n_obs else (flat, flat)
+    return (
+        traj + traj_offset,
+        start_obs.astype(np.int32),
+        length.astype(np.int32),
+        hex_ids.reshape(-1)[flat],
+    )
+
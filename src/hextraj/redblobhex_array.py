@@ -123,20 +123,64 @@ def hex_round(hex: Hex):
     return Hex(qi, ri, si)
 
 
-def hex_to_pixel(layout, h):
+def hex_to_pixel(layout, h, out=None, scratch=None, mask=None):
     M = layout.orientation
     size = layout.size
     origin = layout.origin
+    if out is not None:
+        # write into the caller's Point(x, y) float64 buffers; products go
+        # through ``scratch`` (float64) and the INTNaN test through ``mask``
+        # (bool), both of the input's shape and allocated here if not given
+        x, y = out.x, out.y
+        if scratch is None:
+            scratch = np.empty_like(x)
+        if mask is None:
+            mask = np.empty(x.shape, dtype=bool)
+        np.multiply(h.q, M.f2, out=y)
+        np.multiply(h.r, M.f3, out=x)
+        np.add(y, x, out=y)
+        np.multiply(y, size.y, out=y)
+        np.add(y, origin.y, out=y)
+        np.multiply(h.q, M.f0, out=x)
+        np.multiply(h.r, M.f1, out=scratch)
+        np.add(x, scratch, out=x)
+        np.multiply(x, size.x, out=x)
+        np.add(x, origin.x, out=x)
+        for c in (h.q, h.r, h.s):
+            np.equal(c, INTNaN, out=mask)
+            np.copyto(x, np.nan, where=mask)
+            np.copyto(y, np.nan, where=mask)
+        return out
     x = (M.f0 * h.q + M.f1 * h.r) * size.x
     y = (M.f2 * h.q + M.f3 * h.r) * size.y
     _nans = np.where((h.q == INTNaN) | (h.r == INTNaN) | (h.s == INTNaN), np.nan, 0.0)
     return Point(x + origin.x + _nans, y + origin.y + _nans)
 
 
-def pixel_to_hex(layout, p):
+def pixel_to_hex(layout, p, out=None, scratch=None):
     M = layout.orientation
     size = layout.size
     origin = layout.origin
+    if out is not None:
+        # write into the caller's Hex(q, r, s) float64 buffers; s holds pt.x
+        # and r holds pt.y until they are overwritten, and the b1 product
+        # goes through ``scratch`` (float64, allocated here if not given)
+        q, r, s = out.q, out.r, out.s
+        if scratch is None:
+            scratch = np.empty_like(q)
+        np.subtract(p.x, origin.x, out=s)
+        np.divide(s, size.x, out=s)
+        np.subtract(p.y, origin.y, out=r)
+        np.divide(r, size.y, out=r)
+        np.multiply(s, M.b0, out=q)
+        np.multiply(r, M.b1, out=scratch)
+        np.add(q, scratch, out=q)
+        np.multiply(s, M.b2, out=s)
+        np.multiply(r, M.b3, out=r)
+        np.add(s, r, out=r)
+        np.negative(q, out=s)
+        np.subtract(s, r, out=s)
+        return out
     pt = Point((p.x - origin.x) / size.x, (p.y - origin.y) / size.y)
     q = M.b0 * pt.x + M.b1 * pt.y
     r = M.b2 * pt.x + M.b3 * pt.y
@@ -0,0 +1,119 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from hextraj.hexproj import HexProj
+from hextraj.hex_id import INVALID_HEX_ID
+from hextraj.redblobhex_array import Hex
+
+
+@pytest.fixture
+def hp():
+    return HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=50_000)
+
+
+def test_cached_geometry_matches_direct(hp):
+    ids = hp.region_of_hexes(box(-10, 50, 5, 60))
+    corners = hp.geometry_cache.corners(ids)
+    centres = hp.geometry_cache.centres(ids)
+    assert corners.shape == (len(ids), 7, 2)
+    assert centres.shape == (len(ids), 2)
+
+    q, r = hp.decode_hex_id(ids)
+    expected = hp.hex_corners_lon_lat(Hex(q, r, -q - r))
+    np.testing.assert_array_equal(corners[:, :, 0], np.stack([c[0] for c in expected], axis=1))
+    np.testing.assert_array_equal(corners[:, :, 1], np.stack([c[1] for c in expected], axis=1))
+    lon, lat = hp.hex_to_lon_lat_SoA((q, r))
+    np.testing.assert_array_equal(centres, np.stack([lon, lat], axis=-1))
+
+
+def test_cache_statistics_count_distinct_ids(hp):
+    ids = np.array([7, 3, 7, 12, 3])
+    hp.geometry_cache.corners(ids)
+    assert hp.geometry_cache.cache_info()["corners"][:2] == (0, 3)
+    first = hp.geometry_cache.corners(ids)
+    info = hp.geometry_cache.cache_info()
+    assert info["corners"].hits == 3 and info["corners"].currsize == 3
+    assert info["centres"].currsize == 0
+    np.testing.assert_array_equal(first[0], first[2])
+
+    hp.geometry_cache.cache_clear()
+    assert hp.geometry_cache.cache_info()["corners"] == (0, 0, 0, hp.geometry_cache.maxsize, 0)
+
+
+def test_cache_evicts_least_recently_used(hp):
+    cache = hp.geometry_cache
+    cache.maxsize = 10
+    cache.centres(np.arange(8))
+    cache.centres(np.arange(3))
+    cache.centres(np.arange(100, 105))
+    info = cache.cache_info()["centres"]
+    assert info.currsize == 10 and info.evictions == 3
+
+    cache.centres(np.arange(3))
+    assert cache.cache_info()["centres"].hits == info.hits + 3
+    # a single request larger than the cache is answered in full without
+    # being stored, so it evicts nothing
+    before = cache.cache_info()["centres"]
+    ids = np.append(np.arange(200, 230), [0, 1, 2, 0])
+    centres = cache.centres(ids)
+    np.testing.assert_array_equal(centres, hp._centres_lon_lat(ids))
+    info = cache.cache_info()["centres"]
+    assert info.currsize == 10 and info.evictions == before.evictions
+    assert info.hits == before.hits + 3
+    cache.centres(np.arange(3))
+    assert cache.cache_info()["centres"].hits == info.hits + 3
+
+
+def test_geometry_exports_can_bypass_cache(hp):
+    pytest.importorskip("pyarrow")
+    ids = hp.region_of_hexes(box(-10, 50, 5, 60))
+    hp.geometry_cache.cache_clear()
+    gdf = hp.to_geodataframe(ids, cached=False, count=np.ones(len(ids)))
+    table = hp.to_geoarrow(ids, cached=False)
+    assert hp.geometry_cache.cache_info()["corners"] == (0, 0, 0, hp.geometry_cache.maxsize, 0)
+    assert gdf.geometry.geom_equals_exact(hp.to_geodataframe(ids).geometry, 0).all()
+    assert table.equals(hp.to_geoarrow(ids))
+
+
+def test_geometry_helpers_skip_projection_when_cached(hp, monkeypatch):
+    region = box(-10, 50, 5, 60)
+    ids = hp.region_of_hexes(region)
+    gdf = hp.to_geodataframe(np.append(ids, INVALID_HEX_ID))
+    edges = hp.edges_geodataframe(ids[:-1], ids[1:])
+
+    calls = []
+    transform = hp._transform_proj_to_lon_lat
+
+    def counting(x, y):
+        calls.append(np.size(x))
+        return transform(x, y)
+
+    monkeypatch.setattr(hp, "_transform_proj_to_lon_lat", counting)
+    np.testing.assert_array_equal(hp.region_of_hexes(region), ids)
+    again = hp.to_geodataframe(np.append(ids, INVALID_HEX_ID))
+    assert again.geometry.iloc[-1] is None
+    assert again.geometry.iloc[:-1].geom_equals(gdf.geometry.iloc[:-1]).all()
+    assert hp.edges_geodataframe(ids[:-1], ids[1:]).geometry.geom_equals(edges.geometry).all()
+    assert calls == []
+
+
+def test_cache_is_per_instance_and_not_pickled(hp):
+    hp.geometry_cache.centres(np.arange(5))
+    hp2 = pickle.loads(pickle.dumps(hp))
+    assert hp2 == hp
+    assert hp2.geometry_cache.cache_info()["centres"].currsize == 0
+    assert HexProj().geometry_cache is not HexProj().geometry_cache
+
+
+def test_cache_thread_safe(hp):
+    ids = [np.arange(i, i + 400) for i in range(0, 4000, 100)]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(hp.geometry_cache.corners, ids))
+    for chunk, result in zip(ids, results):
+        np.testing.assert_array_equal(result, hp._corners_lon_lat(chunk))
+    info = hp.geometry_cache.cache_info()["corners"]
+    assert info.misses == info.currsize == 4300
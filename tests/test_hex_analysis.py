@@ -8,6 +8,7 @@ from shapely.geometry import LineString, Polygon
 from hextraj.hexproj import HexProj
 from hextraj.hex_id import INVALID_HEX_ID
 from hextraj.hex_analysis import hex_counts, hex_connectivity, hex_connectivity_power
+from hextraj.hex_analysis import HexFrame, with_geometry
 
 
 @pytest.fixture
@@ -432,3 +433,101 @@ def test_hex_connectivity_power_condition_drops_invalid_column(hex_ids_invalid,
     to_ids = result.index.get_level_values("to_id")
     assert INVALID_HEX_ID not in from_ids
     assert INVALID_HEX_ID not in to_ids
+
+
+def test_int32_hex_ids_accepted(hex_ids_invalid, hp):
+    """hex_counts, hex_connectivity and to_geodataframe take int32 IDs."""
+    hp32 = HexProj(hex_size_meters=2_000_000, hex_id_dtype="int32")
+    ids32 = hex_ids_invalid.astype(np.int32)
+
+    counts = hex_counts(hex_ids_invalid, hp=hp)
+    counts32 = hex_counts(ids32, hp=hp32)
+    np.testing.assert_array_equal(counts32.index, counts.index)
+    np.testing.assert_array_equal(counts32["count"], counts["count"])
+    assert counts32.geometry.loc[INVALID_HEX_ID] is None
+    valid = counts.index != INVALID_HEX_ID
+    assert counts32.geometry[valid].geom_equals(counts.geometry[valid]).all()
+
+    conn = hex_connectivity(hex_ids_invalid, "obs", 0, "obs", 1, hp=hp)
+    conn32 = hex_connectivity(ids32, "obs", 0, "obs", 1, hp=hp32)
+    np.testing.assert_array_equal(conn32["count"], conn["count"])
+    np.testing.assert_array_equal(conn32.index.to_frame(), conn.index.to_frame())
+    assert conn32.geometry.geom_equals(conn.geometry).sum() == 1
+
+    gdf = hp32.to_geodataframe(np.unique(ids32.values))
+    assert len(gdf) == len(counts)
+
+
+# ---------------------------------------------------------------------------
+# geometry modes
+# ---------------------------------------------------------------------------
+
+def _counts(hex_ids, hp, geometry):
+    return hex_counts(hex_ids, reduce_dims=["obs"], hp=hp, geometry=geometry)
+
+
+def _conn(hex_ids, hp, geometry):
+    return hex_connectivity(
+        hex_ids, "obs", 0, "obs", -1, hp=hp, geometry=geometry
+    )
+
+
+def _power(hex_ids, hp, geometry):
+    conn = hex_connectivity(hex_ids, "obs", 0, "obs", -1, hp=hp, geometry="none")
+    return hex_connectivity_power(conn, 2, hp, geometry=geometry)
+
+
+@pytest.mark.parametrize("build", [_counts, _conn, _power])
+def test_geometry_modes_match_eager(hex_ids_invalid, hp, build):
+    eager = build(hex_ids_invalid, hp, "eager")
+    lazy = build(hex_ids_invalid, hp, "lazy")
+    none = build(hex_ids_invalid, hp, "none")
+
+    assert type(none) is pd.DataFrame
+    assert "geometry" not in none.columns
+    pd.testing.assert_frame_equal(none, pd.DataFrame(eager.drop(columns="geometry")))
+    pd.testing.assert_frame_equal(pd.DataFrame(lazy), none)
+
+    assert isinstance(lazy, HexFrame)
+    assert lazy._geo is None
+    assert lazy.geometry.geom_equals(eager.geometry).sum() == eager.geometry.notna().sum()
+    assert lazy._geo is not None
+    assert lazy["geometry"].equals(lazy.geometry)
+    built = lazy._geo
+    lazy.with_geometry()
+    assert lazy._geo is built
+    pd.testing.assert_frame_equal(with_geometry(none, hp), eager)
+
+
+def test_hex_frame_keeps_hexproj(hex_ids, hp):
+    lazy = hex_counts(hex_ids, hp=hp, geometry="lazy")
+    head = lazy.iloc[:3]
+    assert isinstance(head, HexFrame) and head.hexproj is hp
+    assert len(head.geometry) == 3
+
+
+def test_hex_frame_geometry_follows_edits(hex_ids, hp):
+    """Column edits after a geometry build show up; a new index rebuilds it."""
+    lazy = hex_counts(hex_ids, hp=hp, geometry="lazy")
+    first = lazy.with_geometry()
+    lazy["count"] = lazy["count"] * 10
+    lazy["share"] = 0.5
+    edited = lazy.with_geometry()
+    np.testing.assert_array_equal(edited["count"], first["count"] * 10)
+    assert (edited["share"] == 0.5).all()
+    assert edited.geometry.equals(first.geometry)
+
+    lazy.index = lazy.index[::-1].rename("hex_id")
+    assert lazy.with_geometry().geometry.equals(
+        with_geometry(pd.DataFrame(lazy), hp).geometry
+    )
+
+
+def test_geometry_mode_invalid(hex_ids, hp):
+    with pytest.raises(ValueError, match="geometry"):
+        hex_counts(hex_ids, hp=hp, geometry="later")
+
+
+def test_with_geometry_needs_hex_index(hp):
+    with pytest.raises(ValueError, match="index"):
+        with_geometry(pd.DataFrame({"count": [1]}), hp)
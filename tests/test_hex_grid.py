@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import dask.dataframe as dd
+from shapely.geometry import box
+
+from hextraj import HexGrid, OUT_OF_GRID
+from hextraj.hexproj import HexProj
+from hextraj.hex_id import INVALID_HEX_ID
+from hextraj.hex_analysis import hex_counts, hex_counts_lazy, hex_connectivity
+
+
+@pytest.fixture
+def hp():
+    return HexProj(hex_size_meters=100_000)
+
+
+@pytest.fixture
+def hex_ids(hp):
+    """30 trajs × 20 obs inside a 20° box, with NaNs, and traj/obs coords."""
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-10, 10, (30, 20))
+    lat = rng.uniform(-10, 10, (30, 20))
+    lon[::7, 5] = np.nan
+    return xr.DataArray(
+        hp.label(lon, lat),
+        dims=("traj", "obs"),
+        coords={"traj": np.arange(30) + 500, "obs": np.arange(20) * 60},
+    )
+
+
+@pytest.fixture
+def grid(hp):
+    return HexGrid(hp.region_of_hexes(box(-11, -11, 11, 11)))
+
+
+def _sorted(frame):
+    keys = list(frame.columns[:-1])
+    return frame.sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("lookup_table", [True, False])
+def test_index_maps_to_dense_range(monkeypatch, lookup_table):
+    """Lookup-table and binary-search mappings agree."""
+    if not lookup_table:
+        monkeypatch.setattr("hextraj.hex_grid._LUT_MAX_SPAN", 0)
+    grid = HexGrid([40, 7, 7, 12, INVALID_HEX_ID])
+    np.testing.assert_array_equal(grid.hex_ids, [7, 12, 40])
+    assert len(grid) == 3
+    np.testing.assert_array_equal(
+        grid.index([[12, 40], [8, INVALID_HEX_ID]]), [[1, 2], [OUT_OF_GRID, OUT_OF_GRID]]
+    )
+    np.testing.assert_array_equal(
+        grid.index([99, 0, np.iinfo(np.int64).max]), [OUT_OF_GRID] * 3
+    )
+    assert grid.index(12) == 1 and grid.index(np.int64(8)) == OUT_OF_GRID
+    assert grid.index(np.array(40)).shape == ()
+    np.testing.assert_array_equal(grid.hex_id_of([2, 0, 3, OUT_OF_GRID]), [40, 7, -1, -1])
+    assert not grid.hex_ids.flags.writeable
+
+
+def test_bincount_and_bincount2d():
+    grid = HexGrid([7, 12, 40])
+    ids = np.array([12, 12, 40, 99, INVALID_HEX_ID])
+    np.testing.assert_array_equal(grid.bincount(ids), [0, 2, 1, 2])
+    np.testing.assert_allclose(
+        grid.bincount(ids, weights=[1.0, 0.5, 2.0, 1.0, 1.0]), [0, 1.5, 2, 2]
+    )
+    pairs = grid.bincount2d([7, 7, 12, 99], [12, 12, 99, 7])
+    assert pairs.shape == (4, 4)
+    assert pairs[0, 1] == 2 and pairs[1, 3] == 1 and pairs[3, 0] == 1
+    assert pairs.sum() == 4
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_pair_sums(monkeypatch, dense):
+    """Dense-table and sorted-key sums agree and keep every occurring pair."""
+    if not dense:
+        monkeypatch.setattr("hextraj.hex_grid._PAIR_TABLE_MAX_SIZE", 0)
+    monkeypatch.setattr("hextraj.hex_grid._PAIR_TABLE_DENSITY", 1 << 10)
+    grid = HexGrid([7, 12, 40])
+    from_local, to_local, sums = grid.pair_sums([7, 40, 7, 12, 99], [12, 7, 12, 99, 7])
+    np.testing.assert_array_equal(from_local, [0, 1, 2, 3])
+    np.testing.assert_array_equal(to_local, [1, 3, 0, 0])
+    np.testing.assert_array_equal(sums, [2, 1, 1, 1])
+    assert sums.dtype == np.int64
+    _, _, sums = grid.pair_sums(
+        [7, 40, 7, 12, 99], [12, 7, 12, 99, 7], weights=[1.0, 2.0, -1.0, 0.5, 0.0]
+    )
+    np.testing.assert_array_equal(sums, [0.0, 0.5, 2.0, 0.0])
+
+
+def test_pair_sums_large_grid():
+    """A grid far too large for a dense pair table sums in O(pairs)."""
+    grid = HexGrid(np.arange(200_000) * 2)
+    from_local, to_local, sums = grid.pair_sums([0, 0, 399_998, 5], [399_998, 399_998, 0, 0])
+    np.testing.assert_array_equal(from_local, [0, 199_999, 200_000])
+    np.testing.assert_array_equal(to_local, [199_999, 0, 0])
+    np.testing.assert_array_equal(sums, [2, 1, 1])
+
+
+@pytest.mark.parametrize("reduce_dims", [None, "obs", "traj"])
+def test_hex_counts_lazy_grid_matches_hashing(hex_ids, grid, reduce_dims):
+    """On a grid covering all labels, bincount counting equals the groupby path."""
+    expected = hex_counts_lazy(hex_ids, reduce_dims=reduce_dims)
+    result = hex_counts_lazy(hex_ids, reduce_dims=reduce_dims, grid=grid)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(
+            result.sort_index(), expected.sort_index(), check_names=False
+        )
+    else:
+        pd.testing.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+@pytest.mark.parametrize("reduce_dims", [None, "obs", "traj"])
+def test_hex_counts_lazy_grid_runs_and_dask(hp, hex_ids, grid, reduce_dims):
+    """HexRuns, pd.Series and dask input give the same grid counts."""
+    from hextraj import HexRuns
+
+    expected = hex_counts_lazy(hex_ids, reduce_dims=reduce_dims, grid=grid)
+    inputs = [HexRuns.from_dense(hex_ids), hex_ids.chunk({"traj": 8})]
+    if reduce_dims is None:
+        inputs.append(pd.Series(hex_ids.values.ravel()))
+    for other in inputs:
+        result = hex_counts_lazy(other, reduce_dims=reduce_dims, grid=grid)
+        if isinstance(result, (dd.Series, dd.DataFrame)):
+            result = result.compute()
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(
+                result.sort_index(), expected.sort_index(), check_names=False
+            )
+        else:
+            pd.testing.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+def test_hex_counts_grid_folds_outside_into_invalid(hp, hex_ids):
+    """Hexes outside a small grid are counted under INVALID_HEX_ID."""
+    grid = HexGrid(hp.region_of_hexes(box(0, 0, 5, 5)))
+    result = hex_counts(hex_ids, hp=hp, grid=grid)
+    expected = hex_counts_lazy(hex_ids)
+    inside = expected.index.isin(grid.hex_ids)
+
+    assert set(result.index) <= set(grid.hex_ids) | {INVALID_HEX_ID}
+    assert result.loc[INVALID_HEX_ID, "count"] == expected[~inside].sum()
+    assert result["count"].sum() == hex_ids.size
+    assert result.geometry.loc[INVALID_HEX_ID] is None
+
+
+def test_hex_connectivity_grid_matches_hashing(hp, hex_ids, grid):
+    weight = xr.ones_like(hex_ids, dtype=float) * 0.5
+    # every other traj weighs zero; its pairs are kept with a zero sum
+    zeros = weight * xr.DataArray(np.resize([1.0, 0.0], 30), dims="traj")
+    for w in (None, weight, zeros):
+        expected = hex_connectivity(hex_ids, "obs", 0, "obs", -1, weight=w, hp=hp)
+        result = hex_connectivity(hex_ids, "obs", 0, "obs", -1, weight=w, hp=hp, grid=grid)
+        pd.testing.assert_series_equal(result["count"], expected["count"])
+        assert w is not zeros or (result["count"] == 0).any()
+        assert result.geometry.equals(expected.geometry)
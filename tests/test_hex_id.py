@@ -1,7 +1,13 @@
 import numpy as np
 import pytest
 
-from hextraj.hex_id import INVALID_HEX_ID, decode_hex_id, encode_hex_id
+from hextraj.hex_id import (
+    HEX_ID_ENCODINGS,
+    INVALID_HEX_ID,
+    decode_hex_id,
+    encode_hex_id,
+    hex_id_budget,
+)
 from hextraj.redblobhex_array import INTNaN
 
 
@@ -168,3 +174,231 @@ def test_roundtrip_dask_arrays_lazy():
     # only after compute() should we verify values
     np.testing.assert_array_equal(q_out.compute(), [0, 1, -1, 10, -10, 100])
     np.testing.assert_array_equal(r_out.compute(), [0, 0,  0,  0,   0,  50])
+
+
+# Tests for out= buffers
+def test_encode_out_buffer():
+    """encode_hex_id writes into a preallocated buffer across block boundaries."""
+    rng = np.random.default_rng(0)
+    q = rng.integers(-1000, 1000, size=(3, 40_000))
+    r = rng.integers(-1000, 1000, size=(3, 40_000))
+    q[0, 5] = INTNaN
+
+    out = np.empty(q.shape, dtype=np.int64)
+    result = encode_hex_id(q, r, out=out)
+
+    assert result is out
+    np.testing.assert_array_equal(out, encode_hex_id(q, r))
+    assert out[0, 5] == INVALID_HEX_ID
+
+
+def test_decode_out_buffer():
+    """decode_hex_id writes into a preallocated (q, r) pair."""
+    hex_ids = np.array([[0, 3, 5], [INVALID_HEX_ID, 12487, 45250]], dtype=np.int64)
+    q_out = np.empty(hex_ids.shape, dtype=np.int64)
+    r_out = np.empty(hex_ids.shape, dtype=np.int64)
+
+    q, r = decode_hex_id(hex_ids, out=(q_out, r_out))
+
+    assert q is q_out and r is r_out
+    q_ref, r_ref = decode_hex_id(hex_ids)
+    np.testing.assert_array_equal(q_out, q_ref)
+    np.testing.assert_array_equal(r_out, r_ref)
+
+
+def test_encode_out_rejects_bad_buffer():
+    q = np.zeros(4, dtype=np.int64)
+    with pytest.raises(ValueError, match="shape"):
+        encode_hex_id(q, q, out=np.empty(3, dtype=np.int64))
+    with pytest.raises(TypeError, match="int64"):
+        encode_hex_id(q, q, out=np.empty(4, dtype=np.float64))
+
+
+# Exactness over the full int64 range
+def _reference_decode(hex_id):
+    """Exact Python-int Cantor decode."""
+    import math
+
+    w = (math.isqrt(8 * hex_id + 1) - 1) // 2
+    b = hex_id - w * (w + 1) // 2
+    a = w - b
+    z_inv = lambda z: z // 2 if z % 2 == 0 else -(z + 1) // 2  # noqa: E731
+    return z_inv(a), z_inv(b)
+
+
+def _triangular_edges():
+    """IDs on both sides of diagonal starts T(w), including the largest w."""
+    edges = [0, 1, 2, 2**53 + 1, 2**62, 2**63 - 1]
+    for w in [2**26 + 1, 94_906_265, 2**31, 3_037_000_499, 2**32 - 3, 2**32 - 2]:
+        t = w * (w + 1) // 2
+        edges += [t - 1, t, t + 1]
+    return np.array([e for e in edges if 0 <= e < 2**63], dtype=np.int64)
+
+
+def test_decode_exact_over_full_range():
+    """Every non-negative int64 is a valid Cantor ID; decode it exactly and re-encode."""
+    rng = np.random.default_rng(0)
+    hex_ids = np.concatenate([
+        rng.integers(0, 2**63 - 1, 200_000, dtype=np.int64, endpoint=True),
+        rng.integers(0, 2**40, 10_000, dtype=np.int64),
+        _triangular_edges(),
+    ])
+
+    q, r = decode_hex_id(hex_ids)
+
+    np.testing.assert_array_equal(encode_hex_id(q, r), hex_ids)
+    sample = np.concatenate([hex_ids[::97], _triangular_edges()])
+    q_s, r_s = decode_hex_id(sample)
+    assert [(int(a), int(b)) for a, b in zip(q_s, r_s)] == [
+        _reference_decode(int(h)) for h in sample
+    ]
+
+
+def test_encode_beyond_int64_is_invalid():
+    """Pairs whose Cantor ID would exceed int64 map to INVALID_HEX_ID."""
+    q_max, r_max = decode_hex_id(np.int64(2**63 - 1))
+    assert encode_hex_id(q_max, r_max) == 2**63 - 1
+    q = np.array([q_max + 1, 2**31, 0, 2**40, 2**62, -(2**62), 2**31 - 1])
+    r = np.array([r_max, 0, 2**31, 0, 0, -(2**62), 2**31 - 1])
+    np.testing.assert_array_equal(encode_hex_id(q, r), INVALID_HEX_ID)
+    assert encode_hex_id(-(2**31), 0) == (2**32 - 1) * 2**31
+
+
+def test_decode_negative_ids_are_invalid():
+    q, r = decode_hex_id(np.array([-1, -5, np.iinfo(np.int64).min, 4]))
+    np.testing.assert_array_equal(q[:3], INTNaN)
+    np.testing.assert_array_equal(r[:3], INTNaN)
+    assert (q[3], r[3]) == (-1, -1)
+
+
+# Tests for the space-filling-curve encodings
+SFC_ENCODINGS = ["morton", "hilbert"]
+SFC_LIMIT = 2**30
+
+
+def _hilbert_xy2d(order, x, y):
+    """Scalar reference Hilbert index of (x, y) on a 2**order square."""
+    d = 0
+    s = 1 << (order - 1)
+    while s:
+        rx = int(x & s > 0)
+        ry = int(y & s > 0)
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x, y = (1 << order) - 1 - x, (1 << order) - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+@pytest.mark.parametrize("encoding", SFC_ENCODINGS)
+def test_sfc_roundtrip_full_range(encoding):
+    rng = np.random.default_rng(0)
+    q = rng.integers(-SFC_LIMIT, SFC_LIMIT, 100_000)
+    r = rng.integers(-SFC_LIMIT, SFC_LIMIT, 100_000)
+    q[:4] = [-SFC_LIMIT, SFC_LIMIT - 1, 0, -1]
+    r[:4] = [SFC_LIMIT - 1, -SFC_LIMIT, -1, 0]
+
+    hex_ids = encode_hex_id(q, r, encoding=encoding)
+    assert hex_ids.min() >= 0
+    assert len(np.unique(hex_ids)) == len(np.unique(np.stack([q, r]), axis=1).T)
+    q_out, r_out = decode_hex_id(hex_ids, encoding=encoding)
+    np.testing.assert_array_equal(q_out, q)
+    np.testing.assert_array_equal(r_out, r)
+
+
+def test_morton_interleaves_bits():
+    q = np.array([0, 1, 0, 3, 5]) - SFC_LIMIT
+    r = np.array([0, 0, 1, 3, 2]) - SFC_LIMIT
+    np.testing.assert_array_equal(
+        encode_hex_id(q, r, encoding="morton"), [0, 1, 2, 15, 0b011001]
+    )
+
+
+def test_hilbert_matches_reference():
+    rng = np.random.default_rng(1)
+    q = rng.integers(-SFC_LIMIT, SFC_LIMIT, 500)
+    r = rng.integers(-SFC_LIMIT, SFC_LIMIT, 500)
+    expected = [
+        _hilbert_xy2d(32, int(a) + SFC_LIMIT, int(b) + SFC_LIMIT) for a, b in zip(q, r)
+    ]
+    np.testing.assert_array_equal(encode_hex_id(q, r, encoding="hilbert"), expected)
+
+
+def test_hilbert_consecutive_ids_are_neighbours():
+    """Walking the Hilbert curve moves one axial step at a time."""
+    start = encode_hex_id(-3, 5, encoding="hilbert")
+    q, r = decode_hex_id(np.arange(start, start + 5000), encoding="hilbert")
+    steps = np.abs(np.diff(q)) + np.abs(np.diff(r))
+    assert (steps == 1).all()
+
+
+@pytest.mark.parametrize("encoding", SFC_ENCODINGS)
+def test_sfc_out_of_range_is_invalid(encoding):
+    q = np.array([SFC_LIMIT, -SFC_LIMIT - 1, 0, INTNaN, 0, 2**62])
+    r = np.array([0, 0, SFC_LIMIT, 0, INTNaN, 0])
+    np.testing.assert_array_equal(encode_hex_id(q, r, encoding=encoding), INVALID_HEX_ID)
+
+    q_out, r_out = decode_hex_id(np.array([INVALID_HEX_ID, 7]), encoding=encoding)
+    assert q_out[0] == INTNaN and r_out[0] == INTNaN
+    assert q_out[1] != INTNaN
+
+
+@pytest.mark.parametrize("encoding", SFC_ENCODINGS)
+def test_sfc_scalar_dask_and_out(encoding):
+    da = pytest.importorskip("dask.array")
+
+    hex_id = encode_hex_id(3, -4, encoding=encoding)
+    assert isinstance(hex_id, np.int64)
+    q, r = decode_hex_id(hex_id, encoding=encoding)
+    assert isinstance(q, np.int64) and (q, r) == (3, -4)
+
+    rng = np.random.default_rng(2)
+    q = rng.integers(-1000, 1000, (3, 40_000))
+    r = rng.integers(-1000, 1000, (3, 40_000))
+    expected = encode_hex_id(q, r, encoding=encoding)
+    out = np.empty(q.shape, dtype=np.int64)
+    assert encode_hex_id(q, r, out=out, encoding=encoding) is out
+    np.testing.assert_array_equal(out, expected)
+
+    lazy = encode_hex_id(da.from_array(q, chunks=(2, 10_000)), r, encoding=encoding)
+    assert isinstance(lazy, da.Array)
+    np.testing.assert_array_equal(lazy.compute(), expected)
+    q_lazy, r_lazy = decode_hex_id(lazy, encoding=encoding)
+    assert isinstance(q_lazy, da.Array)
+    np.testing.assert_array_equal(q_lazy.compute(), q)
+    np.testing.assert_array_equal(r_lazy.compute(), r)
+
+    q_out = np.empty(q.shape, dtype=np.int64)
+    r_out = np.empty(q.shape, dtype=np.int64)
+    decode_hex_id(expected, out=(q_out, r_out), encoding=encoding)
+    np.testing.assert_array_equal(q_out, q)
+    np.testing.assert_array_equal(r_out, r)
+
+
+def test_unknown_encoding_rejected():
+    assert HEX_ID_ENCODINGS == ("cantor", "morton", "hilbert")
+    with pytest.raises(ValueError, match="encoding"):
+        encode_hex_id(0, 0, encoding="peano")
+    with pytest.raises(ValueError, match="encoding"):
+        decode_hex_id(0, encoding="peano")
+
+
+def test_hex_id_budget():
+    """Every hex within the budget fits the dtype, one step further does not."""
+    m = hex_id_budget("cantor", "int32")
+    assert m == 16_383
+    for q, r in [(m, m), (-m, -m), (m, -m), (-m, m)]:
+        assert 0 <= encode_hex_id(q, r) <= np.iinfo(np.int32).max
+    assert encode_hex_id(m + 1, m + 1) > np.iinfo(np.int32).max
+
+    m = hex_id_budget("cantor", "int64")
+    assert encode_hex_id(m, m) != INVALID_HEX_ID
+    assert encode_hex_id(-m, -m) != INVALID_HEX_ID
+    assert hex_id_budget("hilbert") == 2**30 - 1
+
+    with pytest.raises(ValueError, match="int64"):
+        hex_id_budget("morton", "int32")
+    with pytest.raises(ValueError, match="dtype"):
+        hex_id_budget("cantor", "int16")
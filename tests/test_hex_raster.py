@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+import xarray as xr
+import dask.array as da
+
+from hextraj import HexRaster
+from hextraj.hexproj import HexProj
+from hextraj.hex_id import INVALID_HEX_ID
+from hextraj.redblobhex_array import Hex, hex_to_pixel
+
+
+def _lon_lat(hp, n, seed):
+    """Random positions in and around the raster, plus ones just off hex edges."""
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(-13, 7, n)
+    lat = rng.uniform(47, 63, n)
+    lat[::97] = np.nan
+    q = rng.integers(-30, 31, n).astype(float)
+    r = rng.integers(-30, 31, n).astype(float)
+    center = hex_to_pixel(hp.hex_layout_projected, Hex(q, r, -q - r))
+    angle = np.pi / 3 * rng.integers(0, 6, n)
+    if hp.hex_orientation == "pointy":
+        angle += np.pi / 6
+    t = rng.uniform(0, 1, n)
+    size = hp.hex_layout_projected.size.x
+    x = center.x + size * ((1 - t) * np.cos(angle) + t * np.cos(angle + np.pi / 3))
+    y = center.y + size * ((1 - t) * np.sin(angle) + t * np.sin(angle + np.pi / 3))
+    x += rng.normal(0, 1e-6 * size, n)
+    y += rng.normal(0, 1e-6 * size, n)
+    edge_lon, edge_lat = hp._transform_proj_to_lon_lat(x, y)
+    return np.concatenate([lon, edge_lon]), np.concatenate([lat, edge_lat])
+
+
+@pytest.mark.parametrize("orientation", ["flat", "pointy"])
+@pytest.mark.parametrize("hex_id_dtype", ["int64", "int32"])
+def test_raster_label_matches_label(orientation, hex_id_dtype):
+    hp = HexProj(
+        lon_origin=-3.0, lat_origin=55.0, hex_size_meters=20_000,
+        hex_orientation=orientation, hex_id_dtype=hex_id_dtype,
+    )
+    raster = HexRaster.build(hp, -12, 6, 48, 62, 0.02)
+    assert raster.shape == (700, 900)
+    assert 0.5 < raster.exact_fraction < 1
+    lon, lat = _lon_lat(hp, 200_000, seed=0)
+
+    expected = hp.label(lon, lat)
+    ids = raster.label(lon, lat)
+    assert ids.dtype == hp._id_dtype
+    np.testing.assert_array_equal(ids, expected)
+    assert (ids == INVALID_HEX_ID).sum() == np.isnan(lat).sum()
+
+    out = np.empty(lon.shape, dtype=hp._id_dtype)
+    assert raster.label(lon, lat, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+    assert raster.label(lon[1], lat[1]) == expected[1]
+
+
+def test_raster_lazy_input():
+    hp = HexProj(lon_origin=-3.0, lat_origin=55.0, hex_size_meters=20_000)
+    raster = HexRaster.build(hp, -12, 6, 48, 62, 0.02)
+    lon, lat = _lon_lat(hp, 10_000, seed=1)
+    lon = xr.DataArray(da.from_array(lon, chunks=5_000), dims="obs")
+    ids = raster.label(lon, lat)
+    assert isinstance(ids.data, da.Array)
+    np.testing.assert_array_equal(ids.compute(), hp.label(lon.values, lat))
+    with pytest.raises(ValueError, match="lazy"):
+        raster.label(lon, lat, out=np.empty(lat.shape, dtype=np.int64))
+
+
+def test_raster_save_load(tmp_path):
+    hp = HexProj(
+        lon_origin=-3.0, lat_origin=55.0, hex_size_meters=20_000,
+        hex_orientation="pointy", hex_id_dtype="int32",
+    )
+    raster = HexRaster.build(hp, -5, 0, 50, 55, 0.05)
+    raster.save(tmp_path / "raster.npz")
+    loaded = HexRaster.load(tmp_path / "raster.npz")
+    assert loaded.hexproj == hp
+    assert (loaded.lon_min, loaded.lat_min, loaded.resolution) == (-5, 50, 0.05)
+    np.testing.assert_array_equal(loaded.hex_ids, raster.hex_ids)
+    assert loaded.hex_ids.dtype == np.int32
+    assert "exact_fraction" in repr(loaded)
+
+
+def test_raster_build_rejects_bad_box():
+    hp = HexProj()
+    with pytest.raises(ValueError, match="resolution"):
+        HexRaster.build(hp, 0, 1, 0, 1, 0)
+    with pytest.raises(ValueError, match="empty"):
+        HexRaster.build(hp, 1, 0, 0, 1, 0.1)
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import dask.array as da
+
+from hextraj import HexRuns
+from hextraj.hexproj import HexProj
+from hextraj.hex_id import INVALID_HEX_ID
+from hextraj.hex_analysis import (
+    hex_counts,
+    hex_counts_lazy,
+    hex_connectivity,
+    hex_connectivity_dask,
+)
+
+
+@pytest.fixture
+def hp():
+    return HexProj(hex_size_meters=50_000)
+
+
+@pytest.fixture
+def lon_lat():
+    """40 random-walk trajs × 300 obs, one ragged (NaN-padded) tail."""
+    rng = np.random.default_rng(0)
+    n_traj, n_obs = 40, 300
+    lon = np.cumsum(rng.normal(0, 0.05, (n_traj, n_obs)), axis=1)
+    lon += rng.uniform(-5, 5, (n_traj, 1))
+    lat = np.cumsum(rng.normal(0, 0.05, (n_traj, n_obs)), axis=1)
+    lon[3, 200:] = np.nan
+    lat[3, 200:] = np.nan
+    coords = {"traj": np.arange(100, 100 + n_traj), "obs": np.arange(n_obs) * 3600}
+    return (
+        xr.DataArray(lon, dims=("traj", "obs"), coords=coords),
+        xr.DataArray(lat, dims=("traj", "obs"), coords=coords),
+    )
+
+
+def _sorted(frame):
+    keys = list(frame.columns[:-1])
+    return frame.sort_values(keys).reset_index(drop=True)
+
+
+def test_from_dense_round_trip():
+    """Runs tile the grid row by row and expand back to the dense array."""
+    ids = np.array([[5, 5, 5, 2], [2, 2, -1, -1], [7, 7, 7, 7]], dtype=np.int64)
+    runs = HexRuns.from_dense(ids)
+    np.testing.assert_array_equal(runs.traj, [0, 0, 1, 1, 2])
+    np.testing.assert_array_equal(runs.start_obs, [0, 3, 0, 2, 0])
+    np.testing.assert_array_equal(runs.length, [3, 1, 2, 2, 4])
+    np.testing.assert_array_equal(runs.hex_id, [5, 2, 2, INVALID_HEX_ID, 7])
+    np.testing.assert_array_equal(runs.to_dense(), ids)
+    np.testing.assert_array_equal(runs.at_obs(-1), [2, -1, 7])
+    with pytest.raises(IndexError):
+        runs.at_obs(4)
+
+
+def test_from_dense_rejects_non_2d():
+    with pytest.raises(ValueError, match="2-D"):
+        HexRuns.from_dense(np.zeros(3, dtype=np.int64))
+
+
+def test_label_runs_matches_label(hp, lon_lat, monkeypatch):
+    """label_runs equals encoding the dense labels, across slab boundaries."""
+    import hextraj.hexproj as hexproj_module
+
+    lon, lat = lon_lat
+    monkeypatch.setattr(hexproj_module, "_RUNS_SLAB_SIZE", 7 * 300 + 11)
+    runs = hp.label_runs(lon, lat)
+    dense = hp.label(lon, lat)
+    expected = HexRuns.from_dense(dense)
+
+    assert runs.shape == (40, 300)
+    assert runs.dims == ("traj", "obs")
+    np.testing.assert_array_equal(runs.coords["traj"], lon["traj"].values)
+    for name in ("traj", "start_obs", "length", "hex_id"):
+        np.testing.assert_array_equal(getattr(runs, name), getattr(expected, name))
+    np.testing.assert_array_equal(runs.to_dense(), dense.values)
+    assert runs.nbytes < dense.nbytes / 2
+
+
+def test_label_runs_dask_and_transposed(hp, lon_lat):
+    """Dask-backed input is encoded chunk by chunk; dims order comes from dims."""
+    lon, lat = lon_lat
+    expected = hp.label_runs(lon, lat)
+    lazy = hp.label_runs(
+        lon.T.chunk({"traj": 7, "obs": 100}), lat.T.chunk({"traj": 7, "obs": 100})
+    )
+    np.testing.assert_array_equal(lazy.to_dense(), expected.to_dense())
+    np.testing.assert_array_equal(lazy.traj, expected.traj)
+
+    runs = hp.label_runs(da.from_array(lon.values, chunks=(9, 50)), lat.values)
+    np.testing.assert_array_equal(runs.to_dense(), expected.to_dense())
+
+
+def test_label_runs_rejects_non_2d(hp):
+    with pytest.raises(ValueError, match="2-D"):
+        hp.label_runs(np.zeros(3), np.zeros(3))
+
+
+@pytest.mark.parametrize("reduce_dims", [None, "obs", "traj"])
+def test_hex_counts_lazy_runs_match_dense(hp, lon_lat, reduce_dims):
+    lon, lat = lon_lat
+    dense = hex_counts_lazy(hp.label(lon, lat), reduce_dims=reduce_dims)
+    runs = hex_counts_lazy(hp.label_runs(lon, lat), reduce_dims=reduce_dims)
+    if isinstance(dense, pd.Series):
+        pd.testing.assert_series_equal(runs.sort_index(), dense.sort_index())
+    else:
+        pd.testing.assert_frame_equal(_sorted(runs), _sorted(dense))
+
+
+def test_hex_counts_runs_match_dense(hp, lon_lat):
+    lon, lat = lon_lat
+    dense = hex_counts(hp.label(lon, lat), hp=hp)
+    runs = hex_counts(hp.label_runs(lon, lat), hp=hp)
+    pd.testing.assert_series_equal(runs["count"], dense["count"])
+    assert runs.geometry.equals(dense.geometry)
+    assert INVALID_HEX_ID in runs.index
+
+
+def test_hex_counts_runs_rejects_unknown_dim(hp, lon_lat):
+    with pytest.raises(ValueError, match="reduce_dims"):
+        hex_counts_lazy(hp.label_runs(*lon_lat), reduce_dims="time")
+
+
+@pytest.mark.parametrize("to_idx", [1, 150, -1])
+def test_hex_connectivity_runs_match_dense(hp, lon_lat, to_idx):
+    lon, lat = lon_lat
+    weight = xr.ones_like(lon) * np.arange(40)[:, None]
+    dense = hex_connectivity(
+        hp.label(lon, lat), "obs", 0, "obs", to_idx, weight=weight, hp=hp
+    )
+    runs = hex_connectivity(
+        hp.label_runs(lon, lat), "obs", 0, "obs", to_idx, weight=weight, hp=hp
+    )
+    pd.testing.assert_series_equal(runs["count"], dense["count"])
+
+
+def test_hex_connectivity_runs_rejects_traj_dim(hp, lon_lat):
+    with pytest.raises(ValueError, match="along 'obs'"):
+        hex_connectivity(hp.label_runs(*lon_lat), "traj", 0, "obs", 1, hp=hp)
+
+
+def test_hex_connectivity_dask_runs_weighted_by_length(hp, lon_lat):
+    """Summing run lengths per (from_id, to_id) equals the per-obs table's row counts."""
+    lon, lat = lon_lat
+    ds = xr.Dataset({"lon": lon, "lat": lat}).chunk({"traj": 10})
+    dense = hex_connectivity_dask(ds, hp).compute()
+    runs = hex_connectivity_dask(hp.label_runs(lon, lat)).compute()
+
+    assert list(runs.columns) == ["traj", "obs", "length", "from_id", "to_id"]
+    expected = dense.groupby(["from_id", "to_id"]).size()
+    result = runs.groupby(["from_id", "to_id"])["length"].sum()
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_hex_connectivity_dask_runs_rejects_weight(hp, lon_lat):
+    with pytest.raises(ValueError, match="HexRuns"):
+        hex_connectivity_dask(hp.label_runs(*lon_lat), weight="w")
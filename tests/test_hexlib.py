@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import pytest
 import xarray as xr
 
 from dask import array as darr
@@ -11,6 +12,7 @@ from hextraj.redblobhex_array import (
     hex_corner_offset,
     hex_to_pixel,
     orientation_flat,
+    orientation_pointy,
     pixel_to_hex,
 )
 
@@ -185,3 +187,67 @@ def test_nan_positions_roundtrip():
 
     np.testing.assert_equal(p1.x, p0.x)
     np.testing.assert_equal(p1.y, p0.y)
+
+
+@pytest.mark.parametrize("orientation", [orientation_flat, orientation_pointy])
+def test_pixel_to_hex_out_matches(orientation):
+    """pixel_to_hex(out=...) writes the same values into the caller's buffers."""
+    layout = Layout(orientation=orientation, size=Point(3.0, 3.0), origin=Point(0, 0))
+    rng = np.random.default_rng(0)
+    p = Point(rng.normal(scale=50, size=100), rng.normal(scale=50, size=100))
+
+    expected = pixel_to_hex(layout, p)
+    out = Hex(np.empty(100), np.empty(100), np.empty(100))
+    result = pixel_to_hex(layout, p, out=out)
+
+    assert result is out
+    for got, want in zip(out[:3], expected[:3]):
+        np.testing.assert_array_equal(got, want)
+    pixel_to_hex(layout, p, out=out, scratch=np.empty(100))
+    for got, want in zip(out[:3], expected[:3]):
+        np.testing.assert_array_equal(got, want)
+
+
+@pytest.mark.parametrize("orientation", [orientation_flat, orientation_pointy])
+def test_hex_to_pixel_out_matches(orientation):
+    """hex_to_pixel(out=...) matches the allocating path, including INTNaN."""
+    from hextraj.redblobhex_array import INTNaN
+
+    layout = Layout(orientation=orientation, size=Point(3.0, 3.0), origin=Point(0, 0))
+    q = np.array([0, 1, -4, INTNaN, 7], dtype=np.int64)
+    r = np.array([0, -2, 3, 0, INTNaN], dtype=np.int64)
+    h = Hex(q, r, -q - r)
+
+    expected = hex_to_pixel(layout, h)
+    out = Point(np.empty(5), np.empty(5))
+    result = hex_to_pixel(layout, h, out=out)
+
+    assert result is out
+    np.testing.assert_array_equal(out.x, expected.x)
+    np.testing.assert_array_equal(out.y, expected.y)
+    hex_to_pixel(layout, h, out=out, scratch=np.empty(5), mask=np.empty(5, dtype=bool))
+    np.testing.assert_array_equal(out.x, expected.x)
+    np.testing.assert_array_equal(out.y, expected.y)
+
+
+def test_out_paths_allocate_nothing_with_scratch():
+    """With out, scratch and mask given, no input-sized array is allocated."""
+    import tracemalloc
+
+    layout = Layout(orientation=orientation_flat, size=Point(3.0, 3.0), origin=Point(0, 0))
+    n = 200_000
+    q = np.arange(n, dtype=np.int64)
+    h = Hex(q, -q, 0 * q)
+    pixel = Point(np.empty(n), np.empty(n))
+    frac = Hex(np.empty(n), np.empty(n), np.empty(n))
+    scratch, mask = np.empty(n), np.empty(n, dtype=bool)
+
+    tracemalloc.start()
+    try:
+        hex_to_pixel(layout, h, out=pixel, scratch=scratch, mask=mask)
+        pixel_to_hex(layout, pixel, out=frac, scratch=scratch)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < n
+    np.testing.assert_allclose(frac.q, q)
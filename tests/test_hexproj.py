@@ -66,3 +66,114 @@ def test_check_orientations_available():
     hp_pointy = HexProj(hex_orientation="pointy")
     with pytest.raises(ValueError, match="Only 'flat' and 'pointy'"):
         hp_nonexistent = HexProj(hex_orientation="nonexistent")
+
+
+@pytest.mark.parametrize("projection_backend", ["pyproj", "numpy"])
+def test_hexproj_pickles_as_parameters(projection_backend):
+    """A pickled HexProj carries only its constructor parameters."""
+    import pickle
+
+    hp = HexProj(
+        lon_origin=-3.0, lat_origin=54.0, hex_size_meters=25_000,
+        hex_orientation="pointy", projection_backend=projection_backend,
+    )
+    hp.label(np.zeros(3), np.zeros(3))  # make sure the transformer exists
+    payload = pickle.dumps(hp)
+
+    assert b"pyproj." not in payload  # no pyproj.transformer / pyproj.proj objects
+    assert len(payload) < 300
+
+    hp2 = pickle.loads(payload)
+    assert repr(hp2) == repr(hp)
+    lon = np.array([-3.0, 0.5, 10.0])
+    lat = np.array([54.0, 50.0, 60.0])
+    np.testing.assert_array_equal(hp2.label(lon, lat), hp.label(lon, lat))
+
+
+def test_hexproj_transformer_cached_per_process():
+    """Equal HexProjs in one process share a single transformer."""
+    hp1 = HexProj(lon_origin=7.0, lat_origin=41.0, hex_size_meters=10_000)
+    hp2 = HexProj(lon_origin=7.0, lat_origin=41.0, hex_size_meters=50_000)
+    assert hp1.transformer_relto_wgs is hp2.transformer_relto_wgs
+    assert hp1.proj is hp2.proj
+
+
+def test_hexproj_value_equality_and_hash():
+    """Equal parameters give equal, hash-equal HexProjs usable as dict keys."""
+    hp1 = HexProj(lon_origin=0, lat_origin=0, hex_size_meters=100)
+    hp2 = HexProj(lon_origin=0.0, lat_origin=0.0, hex_size_meters=100.0)
+    hp3 = HexProj(lon_origin=0, lat_origin=0, hex_size_meters=200)
+
+    assert hp1 == hp2
+    assert hash(hp1) == hash(hp2)
+    assert hp1 != hp3
+    assert hp1 != "HexProj"
+    assert len({hp1: 1, hp2: 2, hp3: 3}) == 2
+    assert hp1 != HexProj(
+        lon_origin=0, lat_origin=0, hex_size_meters=100, hex_id_encoding="hilbert"
+    )
+    hp32 = HexProj(lon_origin=0, lat_origin=0, hex_size_meters=100, hex_id_dtype="int32")
+    assert hp1 != hp32
+    assert "hex_id_dtype='int32'" in repr(hp32)
+    assert eval(repr(hp32), {"HexProj": HexProj}) == hp32
+
+
+def test_hexproj_hex_id_encoding():
+    """The encoding survives repr and pickling and drives the geometry helpers."""
+    import pickle
+
+    hp = HexProj(hex_size_meters=50_000, hex_id_encoding="hilbert")
+    hp_cantor = HexProj(hex_size_meters=50_000)
+    assert "hex_id_encoding='hilbert'" in repr(hp)
+    assert pickle.loads(pickle.dumps(hp)) == hp
+    assert eval(repr(hp), {"HexProj": HexProj}) == hp
+
+    ids = hp.rectangle_of_hexes(-2, 2, -2, 2)
+    ids_cantor = hp_cantor.rectangle_of_hexes(-2, 2, -2, 2)
+    q, r = hp.decode_hex_id(ids)
+    np.testing.assert_array_equal(
+        np.sort(hp_cantor.encode_hex_id(q, r)), np.sort(ids_cantor)
+    )
+    gdf = hp.to_geodataframe(ids)
+    gdf_cantor = hp_cantor.to_geodataframe(hp_cantor.encode_hex_id(q, r))
+    assert gdf.geometry.geom_equals(gdf_cantor.set_index(gdf.index).geometry).all()
+    edges = hp.edges_geodataframe(ids[:3], ids[1:4])
+    edges_cantor = hp_cantor.edges_geodataframe(
+        hp_cantor.encode_hex_id(q[:3], r[:3]), hp_cantor.encode_hex_id(q[1:4], r[1:4])
+    )
+    assert edges.geometry.reset_index(drop=True).geom_equals(
+        edges_cantor.geometry.reset_index(drop=True)
+    ).all()
+
+    with pytest.raises(ValueError, match="encoding"):
+        HexProj(hex_id_encoding="peano")
+
+
+def test_transformer_cache_bounded_and_thread_safe(monkeypatch):
+    """The memo is LRU-bounded and builds each key once under concurrency."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from hextraj import _proj
+
+    calls = []
+    real = _proj.make_transformer
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(_proj, "make_transformer", counting)
+    monkeypatch.setattr(_proj, "TRANSFORMER_CACHE_SIZE", 3)
+    _proj.clear_transformer_cache()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(
+            lambda _: _proj.cached_transformer("laea", 12.0, 34.0), range(32)
+        ))
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+    for lat in range(5):
+        _proj.cached_transformer("laea", float(lat), 0.0)
+    assert len(_proj._transformer_cache) == 3
+    _proj.clear_transformer_cache()
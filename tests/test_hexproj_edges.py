@@ -317,3 +317,34 @@ def test_edges_geodataframe_length(hex_proj, n):
 
     # Result length should match input length
     assert len(gdf) == n
+
+
+# ============================================================================
+# Test: edge_geometries matches per-edge construction
+# ============================================================================
+
+
+def test_edge_geometries_match_per_edge_lines(hex_proj):
+    """The batched builder equals one LineString per pair between hex centres."""
+    from shapely.geometry import LineString
+
+    rng = np.random.default_rng(0)
+    ids = encode_hex_id(rng.integers(-20, 21, 50), rng.integers(-20, 21, 50))
+    from_ids = rng.choice(ids, 2_000)
+    to_ids = rng.choice(ids, 2_000)
+    from_ids[::17] = INVALID_HEX_ID
+    to_ids[::23] = INVALID_HEX_ID
+
+    geometries = hex_proj.edge_geometries(from_ids, to_ids)
+    assert geometries.dtype == object and geometries.shape == (2_000,)
+    for f_id, t_id, line in zip(from_ids, to_ids, geometries):
+        if f_id == INVALID_HEX_ID or t_id == INVALID_HEX_ID:
+            assert line is None
+            continue
+        ends = [hex_proj.hex_to_lon_lat_SoA(decode_hex_id(i)) for i in (f_id, t_id)]
+        assert line.equals_exact(LineString(ends), tolerance=0)
+
+    # distinct centres are projected once, in one call
+    info = hex_proj.geometry_cache.cache_info()["centres"]
+    assert info.misses == len(np.unique(ids))
+    assert hex_proj.edge_geometries(from_ids[:0], to_ids[:0]).shape == (0,)
@@ -189,6 +189,36 @@ def test_rectangle_of_hexes_small_bbox(hex_proj):
     assert len(result) > 0
 
 
+@pytest.mark.parametrize(
+    "hexproj_kwargs, bbox",
+    [
+        (dict(hex_size_meters=100_000), (-20.0, 20.0, -10.0, 10.0)),
+        # far from the origin the box's image bulges between its corners
+        (dict(lat_origin=-30.0, hex_size_meters=50_000, hex_orientation="pointy"), (20.0, 45.0, 8.0, 20.0)),
+        # box edges through hex corners: touching rings count
+        (dict(hex_size_meters=111_000), (0.0, 3.0, 0.0, 3.0)),
+    ],
+)
+def test_rectangle_of_hexes_matches_brute_force(hexproj_kwargs, bbox):
+    """rectangle_of_hexes returns exactly the hexes whose polygons intersect the bbox."""
+    from shapely.geometry import box
+
+    hp = HexProj(**hexproj_kwargs)
+    lon_min, lon_max, lat_min, lat_max = bbox
+    result = hp.rectangle_of_hexes(lon_min, lon_max, lat_min, lat_max)
+
+    # all hexes of a q/r window well beyond the result
+    q, r = hp.decode_hex_id(result)
+    q_all, r_all = np.meshgrid(
+        np.arange(q.min() - 5, q.max() + 6), np.arange(r.min() - 5, r.max() + 6)
+    )
+    candidates = hp.encode_hex_id(q_all.ravel(), r_all.ravel())
+    gdf = hp.to_geodataframe(candidates)
+    expected = candidates[gdf.geometry.intersects(box(lon_min, lat_min, lon_max, lat_max)).values]
+
+    np.testing.assert_array_equal(np.sort(result), np.sort(expected))
+
+
 # ============================================================================
 # Feature 3: HexProj.region_of_hexes(region_polygon)
 # ============================================================================
@@ -255,6 +285,83 @@ def test_region_of_hexes_intersects_polygon(hex_proj):
         "Not all returned hex geometries intersect the polygon"
 
 
+@pytest.mark.parametrize(
+    "region_wkt",
+    [
+        # concave
+        "POLYGON ((-8 -6, 9 -7, 2 0, 10 8, -7 7, -8 -6))",
+        # hole wider than a hex: hexes inside it are left out
+        "POLYGON ((-15 -15, 15 -15, 15 15, -15 15, -15 -15), (-9 -9, 9 -9, 9 9, -9 9, -9 -9))",
+        # two parts, far apart
+        "MULTIPOLYGON (((-20 -5, -12 -5, -12 3, -20 -5)), ((10 10, 16 10, 16 16, 10 16, 10 10)))",
+    ],
+)
+def test_region_of_hexes_matches_brute_force(hex_proj, region_wkt):
+    """region_of_hexes returns exactly the bbox hexes whose polygons intersect the region."""
+    from shapely import wkt
+
+    region = wkt.loads(region_wkt)
+    candidates = hex_proj.rectangle_of_hexes(*np.array(region.bounds)[[0, 2, 1, 3]])
+    mask = hex_proj.to_geodataframe(candidates).geometry.intersects(region).values
+
+    np.testing.assert_array_equal(hex_proj.region_of_hexes(region), candidates[mask])
+
+
+@pytest.mark.parametrize("n_threads", [None, 3])
+def test_region_of_hexes_tiles(hex_proj, monkeypatch, n_threads):
+    """Small tiles, serial or threaded, give the untiled result."""
+    from shapely.geometry import Point
+
+    import hextraj._region
+
+    region = Point(0, 0).buffer(20).difference(Point(2, 2).buffer(6))
+    expected = hex_proj.region_of_hexes(region)
+    monkeypatch.setattr(hextraj._region, "BLOCK_SIZE", 7)
+    hex_proj.geometry_cache.cache_clear()
+    np.testing.assert_array_equal(hex_proj.region_of_hexes(region, n_threads=n_threads), expected)
+
+
+def test_region_of_hexes_threaded_reuses_transformers(monkeypatch):
+    """Repeated threaded scans do not rebuild per-thread transformers."""
+    from shapely.geometry import Point
+
+    import hextraj._region
+    from hextraj import hexproj
+
+    calls = []
+    real = hexproj.make_transformer
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(hexproj, "make_transformer", counting)
+    monkeypatch.setattr(hextraj._region, "BLOCK_SIZE", 7)
+    hp = HexProj(hex_size_meters=200_000)
+    region = Point(0, 0).buffer(20)
+    for _ in range(4):
+        hp.region_of_hexes(region, n_threads=3)
+    assert 1 <= len(calls) <= 3
+
+
+@pytest.mark.filterwarnings("error")
+def test_box_and_region_near_antipode_are_quiet():
+    """Hexes that do not unproject are skipped without numpy warnings."""
+    from shapely.geometry import box
+
+    from hextraj._region import rings_intersect_box
+
+    hp = HexProj(hex_size_meters=500_000)
+    for bounds in [(150, 180, -30, 30), (120, 179.9, -80, 80)]:
+        rect = hp.rectangle_of_hexes(*bounds)
+        region = hp.region_of_hexes(box(bounds[0], bounds[2], bounds[1], bounds[3]))
+        np.testing.assert_array_equal(rect, region)
+        assert len(rect) and np.isfinite(hp.corner_coords(rect)).all()
+
+    ring = np.array([[[0, 0], [np.inf, 0], [1, 1], [np.nan, 1], [0, 0]]], dtype=float)
+    assert not rings_intersect_box(ring, -5, 5, -5, 5)[0]
+
+
 def test_region_of_hexes_origin_inside(hex_proj):
     """Polygon containing origin should yield hexes."""
     from shapely.geometry import Polygon
@@ -335,3 +442,102 @@ def test_to_geodataframe_batch_polygon_count(hex_proj):
     assert len(gdf) == 10
     for geom in gdf.geometry:
         assert isinstance(geom, Polygon)
+
+
+# ============================================================================
+# Coordinate-array and GeoArrow outputs
+# ============================================================================
+
+
+def test_corner_and_centre_coords_match_geometries(hex_proj, sample_hex_ids):
+    """corner_coords / centre_coords hold the polygon and centre coordinates."""
+    ids = np.append(sample_hex_ids, INVALID_HEX_ID)
+    corners = hex_proj.corner_coords(ids)
+    centres = hex_proj.centre_coords(ids)
+    gdf = hex_proj.to_geodataframe(ids)
+
+    assert corners.shape == (4, 7, 2) and centres.shape == (4, 2)
+    for i in range(3):
+        np.testing.assert_array_equal(
+            corners[i], np.asarray(gdf.geometry.iloc[i].exterior.coords)
+        )
+    assert np.isnan(corners[3]).all() and np.isnan(centres[3]).all()
+
+    edges = hex_proj.edge_coords(ids[:-1], ids[1:])
+    np.testing.assert_array_equal(edges[:2, 0], centres[:2])
+    np.testing.assert_array_equal(edges[:2, 1], centres[1:3])
+    assert np.isnan(edges[2]).all()
+
+
+def test_to_geoarrow_round_trips_to_geodataframe(hex_proj, sample_hex_ids):
+    """The GeoArrow table reads back into the to_geodataframe polygons."""
+    pytest.importorskip("pyarrow")
+    import geopandas
+
+    ids = np.append(sample_hex_ids, INVALID_HEX_ID)
+    values = np.arange(4.0)
+    table = hex_proj.to_geoarrow(ids, my_values=values)
+
+    assert table.column_names == ["hex_id", "my_values", "geometry"]
+    assert table.schema.field("geometry").metadata[b"ARROW:extension:name"] == b"geoarrow.polygon"
+    gdf = geopandas.GeoDataFrame.from_arrow(table)
+    expected = hex_proj.to_geodataframe(ids)
+    assert gdf.crs.to_epsg() == 4326
+    np.testing.assert_array_equal(gdf["hex_id"], ids)
+    np.testing.assert_array_equal(gdf["my_values"], values)
+    assert gdf.geometry.iloc[3] is None
+    assert all(gdf.geometry.iloc[:3].values.geom_equals_exact(expected.geometry.iloc[:3].values, 0))
+
+
+def test_to_geoarrow_keeps_int32_ids():
+    """int32 HexProjs write int32 hex_id columns with the int64 geometry."""
+    pytest.importorskip("pyarrow")
+    import pyarrow as pa
+
+    hp32 = HexProj(hex_id_dtype="int32")
+    ids = hp32.label([0.0, 3.0, np.nan], [0.0, 2.0, 0.0])
+    assert ids.dtype == np.int32
+    table = hp32.to_geoarrow(ids)
+    assert table.schema.field("hex_id").type == pa.int32()
+    np.testing.assert_array_equal(table["hex_id"].to_numpy(), ids)
+    assert table["geometry"].equals(HexProj().to_geoarrow(ids)["geometry"])
+    with pytest.raises(OverflowError):
+        hp32.to_geoarrow([np.iinfo(np.int32).max + 1])
+
+
+def test_hex_corners_lon_lat_batched(hex_proj, monkeypatch):
+    """Array input takes one inverse projection call and matches per-hex calls."""
+    from hextraj.redblobhex_array import Hex
+
+    q = np.array([[0, 1, 2], [-3, 4, 0]])
+    r = np.array([[0, -1, 1], [2, 0, 5]])
+    scalar = [hex_proj.hex_corners_lon_lat(Hex(qi, ri, -qi - ri)) for qi, ri in zip(q.ravel(), r.ravel())]
+    assert all(np.isscalar(lon) for lon, _ in scalar[0])
+
+    calls = []
+    transform = hex_proj._transform_proj_to_lon_lat
+    monkeypatch.setattr(
+        hex_proj, "_transform_proj_to_lon_lat",
+        lambda *args: calls.append(1) or transform(*args),
+    )
+    batched = hex_proj.hex_corners_lon_lat(Hex(q, r, -q - r))
+    assert len(calls) == 1
+    for i in range(7):
+        np.testing.assert_array_equal(batched[i][0].ravel(), [c[i][0] for c in scalar])
+        np.testing.assert_array_equal(batched[i][1].ravel(), [c[i][1] for c in scalar])
+
+
+def test_corner_coords_from_axial_and_uncached(hex_proj, sample_hex_ids):
+    """corner_coords gives the same rings from IDs or (q, r), cached or not."""
+    q, r = decode_hex_id(sample_hex_ids)
+    hex_proj.geometry_cache.cache_clear()
+    uncached = hex_proj.corner_coords(q=q[:, None], r=r[:, None], cached=False)
+    assert uncached.shape == (3, 1, 7, 2)
+    assert hex_proj.geometry_cache.cache_info()["corners"].currsize == 0
+    np.testing.assert_array_equal(uncached[:, 0], hex_proj.corner_coords(sample_hex_ids))
+    np.testing.assert_array_equal(hex_proj.corner_coords(q=q, r=r), uncached[:, 0])
+    np.testing.assert_array_equal(
+        hex_proj.corner_coords(sample_hex_ids.reshape(1, 3), cached=False)[0], uncached[:, 0]
+    )
+    with pytest.raises(ValueError, match="hex_ids"):
+        hex_proj.corner_coords(sample_hex_ids, q=q, r=r)
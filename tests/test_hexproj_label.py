@@ -3,7 +3,7 @@ import pytest
 
 from hextraj.hexproj import HexProj
 from hextraj.hex_id import encode_hex_id, decode_hex_id, INVALID_HEX_ID
-from hextraj.redblobhex_array import INTNaN
+from hextraj.redblobhex_array import INTNaN, Hex, hex_to_pixel
 
 
 def test_label_returns_int64_array():
@@ -83,3 +83,591 @@ def test_label_invalid_produces_invalid_hex_id():
     assert result[2] != INVALID_HEX_ID
 
 
+@pytest.mark.parametrize("orientation", ["flat", "pointy"])
+@pytest.mark.parametrize("hex_size", [1_000, 50_000, 500_000])
+def test_label_matches_unfused_pipeline(orientation, hex_size):
+    """Fused label is bit-for-bit equal to encode_hex_id(lon_lat_to_hex_SoA(...))."""
+    hp = HexProj(
+        lon_origin=-3.0, lat_origin=54.0, hex_size_meters=hex_size,
+        hex_orientation=orientation,
+    )
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-80, 80, size=200_003)
+    lat = rng.uniform(-30, 85, size=200_003)
+
+    hex_soa = hp.lon_lat_to_hex_SoA(lon=lon, lat=lat)
+    expected = encode_hex_id(hex_soa.q, hex_soa.r)
+
+    np.testing.assert_array_equal(hp.label(lon, lat), expected)
+
+
+def test_label_block_boundaries():
+    """Results do not depend on the kernel block size."""
+    from hextraj._label import LabelScratch, label_lon_lat
+
+    hp = HexProj(hex_size_meters=100_000)
+    rng = np.random.default_rng(1)
+    lon = rng.uniform(-60, 60, size=1_001)
+    lat = rng.uniform(-60, 60, size=1_001)
+    lon[::7] = np.nan
+
+    out = np.empty(lon.shape, dtype=np.int64)
+    label_lon_lat(
+        hp.transformer_relto_wgs, hp.hex_layout_projected, lon, lat, out,
+        scratch=LabelScratch(block_size=64),
+    )
+    np.testing.assert_array_equal(out, hp.label(lon, lat))
+    assert (out[::7] == INVALID_HEX_ID).all()
+
+
+def test_label_out_and_scratch_reused():
+    """label(out=, scratch=) fills the caller's buffer and can be called repeatedly."""
+    from hextraj import LabelScratch
+
+    hp = HexProj(hex_size_meters=100_000)
+    rng = np.random.default_rng(2)
+    out = np.empty((4, 250), dtype=np.int64)
+    scratch = LabelScratch(block_size=128)
+
+    for _ in range(3):
+        lon = rng.uniform(-60, 60, size=(4, 250))
+        lat = rng.uniform(-60, 60, size=(4, 250))
+        result = hp.label(lon, lat, out=out, scratch=scratch)
+        assert result is out
+        np.testing.assert_array_equal(out, hp.label(lon, lat))
+
+
+def test_transform_into_scratch():
+    """The projection runs in place on caller-owned x/y buffers."""
+    hp = HexProj(hex_size_meters=100_000)
+    lon = np.array([0.0, 10.0, -5.0])
+    lat = np.array([0.0, 20.0, 45.0])
+    x, y = np.empty(3), np.empty(3)
+
+    xy = hp._transform_lon_lat_to_proj(lon, lat, out=(x, y))
+
+    assert xy.x is x and xy.y is y
+    ref = hp._transform_lon_lat_to_proj(lon, lat)
+    np.testing.assert_array_equal(x, ref.x)
+    np.testing.assert_array_equal(y, ref.y)
+
+
+def test_label_dask_array_stays_lazy():
+    """Dask input returns a chunk-aligned lazy int64 dask array."""
+    da = pytest.importorskip("dask.array")
+
+    hp = HexProj(hex_size_meters=100_000)
+    rng = np.random.default_rng(3)
+    lon_np = rng.uniform(-60, 60, size=(6, 10))
+    lat_np = rng.uniform(-60, 60, size=(6, 10))
+    lon_np[2, 3] = np.nan
+    lon = da.from_array(lon_np, chunks=(2, 5))
+    lat = da.from_array(lat_np, chunks=(2, 5))
+
+    result = hp.label(lon, lat)
+
+    assert isinstance(result, da.Array)
+    assert result.dtype == np.int64
+    assert result.chunks == lon.chunks
+    np.testing.assert_array_equal(result.compute(), hp.label(lon_np, lat_np))
+
+
+def test_label_dataarray_keeps_dims_and_coords():
+    """DataArray input returns a DataArray with the same dims and coords."""
+    xr = pytest.importorskip("xarray")
+    pytest.importorskip("dask.array")
+
+    hp = HexProj(hex_size_meters=100_000)
+    rng = np.random.default_rng(4)
+    coords = {"traj": np.arange(6), "obs": np.arange(10) * 3600}
+    lon = xr.DataArray(
+        rng.uniform(-60, 60, size=(6, 10)), dims=("traj", "obs"), coords=coords
+    ).chunk({"traj": 3})
+    lat = xr.DataArray(
+        rng.uniform(-60, 60, size=(6, 10)), dims=("traj", "obs"), coords=coords
+    ).chunk({"traj": 3})
+
+    result = hp.label(lon, lat)
+
+    assert isinstance(result, xr.DataArray)
+    assert result.dims == ("traj", "obs")
+    assert result.chunks == lon.chunks
+    np.testing.assert_array_equal(result.obs, lon.obs)
+    np.testing.assert_array_equal(
+        result.compute().values, hp.label(lon.values, lat.values)
+    )
+
+
+def test_label_lazy_rejects_out():
+    da = pytest.importorskip("dask.array")
+
+    hp = HexProj(hex_size_meters=100_000)
+    lon = da.zeros(4, chunks=2)
+    with pytest.raises(ValueError, match="not supported"):
+        hp.label(lon, lon, out=np.empty(4, dtype=np.int64))
+
+
+@pytest.mark.parametrize("n_threads", [2, 4])
+def test_label_threaded_matches_serial(n_threads):
+    """Threaded labelling gives the same IDs as the single-threaded path."""
+    hp = HexProj(hex_size_meters=25_000)
+    rng = np.random.default_rng(5)
+    lon = rng.uniform(-60, 60, size=(3, 100_001))
+    lat = rng.uniform(-60, 60, size=(3, 100_001))
+    lon[1, ::11] = np.nan
+
+    np.testing.assert_array_equal(
+        hp.label(lon, lat, n_threads=n_threads), hp.label(lon, lat)
+    )
+
+
+def test_label_threaded_uses_own_transformers():
+    """Worker threads never use the instance's shared transformer."""
+    import threading
+
+    hp = HexProj(hex_size_meters=25_000)
+    seen = []
+    original = hp._thread_state
+
+    def spy():
+        transformer, scratch = original()
+        seen.append((threading.get_ident(), transformer))
+        return transformer, scratch
+
+    hp._thread_state = spy
+    lon = np.zeros(500_000)
+    hp.label(lon, lon, n_threads=3)
+
+    assert seen
+    assert all(t is not hp.transformer_relto_wgs for _, t in seen)
+    per_thread = {}
+    for ident, t in seen:
+        assert per_thread.setdefault(ident, t) is t
+
+
+def test_label_threaded_reuses_transformers(monkeypatch):
+    """Repeated threaded calls keep their worker threads and transformers."""
+    from hextraj import hexproj
+
+    calls = []
+    real = hexproj.make_transformer
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(hexproj, "make_transformer", counting)
+    hp = HexProj(hex_size_meters=25_000)
+    lon = np.zeros(500_000)
+    for _ in range(4):
+        hp.label(lon, lon, n_threads=3)
+    # at most one transformer per pool thread, however many calls
+    assert 1 <= len(calls) <= 3
+
+
+def test_label_threaded_rejects_scratch():
+    from hextraj import LabelScratch
+
+    hp = HexProj()
+    with pytest.raises(ValueError, match="scratch"):
+        hp.label(np.zeros(3), np.zeros(3), scratch=LabelScratch(), n_threads=2)
+
+
+def _near_edge_lon_lat(hp, n, seed):
+    """Positions a tiny distance off hex edges, where rounding is fragile."""
+    rng = np.random.default_rng(seed)
+    q = rng.integers(-40, 41, n).astype(float)
+    r = rng.integers(-40, 41, n).astype(float)
+    center = hex_to_pixel(hp.hex_layout_projected, Hex(q, r, -q - r))
+    x, y = center.x, center.y
+    size = hp.hex_layout_projected.size.x
+    angle = np.pi / 3 * rng.integers(0, 6, n)
+    if hp.hex_orientation == "pointy":
+        angle += np.pi / 6
+    t = rng.uniform(0, 1, n)
+    x = x + size * ((1 - t) * np.cos(angle) + t * np.cos(angle + np.pi / 3))
+    y = y + size * ((1 - t) * np.sin(angle) + t * np.sin(angle + np.pi / 3))
+    x += rng.normal(0, 1e-6 * size, n)
+    y += rng.normal(0, 1e-6 * size, n)
+    return hp._transform_proj_to_lon_lat(x, y)
+
+
+@pytest.mark.parametrize("orientation", ["flat", "pointy"])
+@pytest.mark.parametrize("hex_size", [1_000, 10_000, 100_000, 1_000_000])
+def test_label_float32_compute_matches_float64(orientation, hex_size):
+    """compute_dtype="float32" gives the float64 IDs over the whole globe and near hex edges."""
+    hp = HexProj(
+        lon_origin=-30.0, lat_origin=40.0,
+        hex_size_meters=hex_size, hex_orientation=orientation,
+    )
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 180, 100_000)
+    lat = rng.uniform(-89, 89, 100_000)
+    lon[::997] = np.nan
+    edge_lon, edge_lat = _near_edge_lon_lat(hp, 20_000, seed=1)
+    lon = np.concatenate([lon, edge_lon])
+    lat = np.concatenate([lat, edge_lat])
+
+    np.testing.assert_array_equal(
+        hp.label(lon, lat, compute_dtype="float32"), hp.label(lon, lat)
+    )
+
+
+def test_label_float32_input_not_upcast():
+    """float32 input labels like its float64 upcast, also via threads and dask."""
+    import dask.array as da
+
+    hp = HexProj(hex_size_meters=10_000)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-60, 60, 150_000).astype(np.float32)
+    lat = rng.uniform(-60, 60, 150_000).astype(np.float32)
+    expected = hp.label(lon.astype(np.float64), lat.astype(np.float64))
+
+    np.testing.assert_array_equal(hp.label(lon, lat), expected)
+    np.testing.assert_array_equal(
+        hp.label(lon, lat, compute_dtype="float32", n_threads=2), expected
+    )
+    lazy = hp.label(
+        da.from_array(lon, chunks=40_000), da.from_array(lat, chunks=40_000),
+        compute_dtype="float32",
+    )
+    np.testing.assert_array_equal(lazy.compute(), expected)
+
+
+def test_label_rejects_unknown_compute_dtype():
+    hp = HexProj(hex_size_meters=10_000)
+    with pytest.raises(ValueError, match="compute_dtype"):
+        hp.label(0.0, 0.0, compute_dtype="float16")
+
+
+def test_project_matches_transform():
+    """project returns the projected coordinates with the input shape, floats for scalars."""
+    hp = HexProj(lon_origin=10.0, lat_origin=50.0, hex_size_meters=10_000)
+    lon = np.array([[0.0, 10.0, np.nan], [20.0, 5.0, 12.0]])
+    lat = np.array([40.0, 50.0, 60.0])
+    xy = hp.project(lon, lat)
+    expected = hp._transform_lon_lat_to_proj(*np.broadcast_arrays(lon, lat))
+    assert xy.x.shape == (2, 3)
+    np.testing.assert_array_equal(xy.x, expected.x)
+    np.testing.assert_array_equal(xy.y, expected.y)
+
+    scalar = hp.project(12.0, 51.0)
+    assert isinstance(scalar.x, float) and isinstance(scalar.y, float)
+    assert scalar.x == pytest.approx(hp._transform_lon_lat_to_proj(12.0, 51.0).x)
+
+
+def test_label_projected_matches_label():
+    """Projected coordinates label the same on every grid sharing the projection."""
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-40, 40, 100_000)
+    lat = rng.uniform(-60, 60, 100_000)
+    lon[::101] = np.nan
+    xy = HexProj(lon_origin=5.0, hex_size_meters=5_000).project(lon, lat)
+    for hex_size in (5_000, 25_000):
+        for orientation in ("flat", "pointy"):
+            hp = HexProj(
+                lon_origin=5.0, hex_size_meters=hex_size, hex_orientation=orientation
+            )
+            np.testing.assert_array_equal(
+                hp.label_projected(xy.x, xy.y), hp.label(lon, lat)
+            )
+            np.testing.assert_array_equal(
+                hp.label_projected(xy.x, xy.y, compute_dtype="float32"),
+                hp.label(lon, lat),
+            )
+    assert isinstance(hp.label_projected(xy.x[0], xy.y[0]), np.int64)
+
+
+def test_label_resolutions_matches_label():
+    """label_resolutions equals labelling each grid separately."""
+    from hextraj import label_resolutions
+
+    hps = [
+        HexProj(lon_origin=-20.0, lat_origin=30.0, hex_size_meters=size, hex_orientation=o)
+        for size in (5_000, 10_000, 25_000, 50_000, 100_000)
+        for o in ("flat", "pointy")
+    ]
+    rng = np.random.default_rng(1)
+    n = 2 * 65_536 + 17
+    lon = rng.uniform(-60, 20, n).reshape(1, n)
+    lat = rng.uniform(0, 60, n).reshape(1, n)
+    lat[0, ::53] = np.nan
+
+    results = label_resolutions(hps, lon, lat)
+    assert len(results) == len(hps)
+    for hp, ids in zip(hps, results):
+        assert ids.shape == (1, n)
+        np.testing.assert_array_equal(ids, hp.label(lon, lat))
+
+
+def test_label_resolutions_projects_once(monkeypatch):
+    """The pyproj transform runs once per block, not once per grid."""
+    import hextraj.hexproj as hexproj_module
+    from hextraj import label_resolutions
+
+    calls = []
+    real = hexproj_module.cached_transformer
+
+    class CountingTransformer:
+        def __init__(self, transformer):
+            self._transformer = transformer
+
+        def transform(self, *args, **kwargs):
+            calls.append(len(args[0]))
+            return self._transformer.transform(*args, **kwargs)
+
+    def counting_cached_transformer(*args):
+        proj, transformer = real(*args)
+        return proj, CountingTransformer(transformer)
+
+    monkeypatch.setattr(
+        hexproj_module, "cached_transformer", counting_cached_transformer
+    )
+    hps = [HexProj(hex_size_meters=size) for size in (5_000, 10_000, 25_000)]
+    lon = np.linspace(-10, 10, 65_536 + 1)
+    label_resolutions(hps, lon, lon)
+    assert calls == [65_536, 1]
+
+
+def test_label_resolutions_rejects_mixed_projections():
+    from hextraj import label_resolutions
+
+    with pytest.raises(ValueError, match="share projection_name"):
+        label_resolutions(
+            [HexProj(lon_origin=0.0), HexProj(lon_origin=1.0)], 0.0, 0.0
+        )
+    with pytest.raises(ValueError, match="at least one"):
+        label_resolutions([], 0.0, 0.0)
+
+
+@pytest.mark.parametrize("encoding", ["morton", "hilbert"])
+def test_label_sfc_encoding_matches_reencoded_cantor(encoding):
+    """A HexProj with a space-filling-curve encoding labels the same hexes."""
+    import dask.array as da
+    from hextraj import label_resolutions
+
+    hp = HexProj(lon_origin=-20.0, lat_origin=30.0, hex_size_meters=10_000)
+    hp_sfc = HexProj(
+        lon_origin=-20.0, lat_origin=30.0, hex_size_meters=10_000,
+        hex_id_encoding=encoding,
+    )
+    rng = np.random.default_rng(3)
+    lon = rng.uniform(-60, 20, 70_000)
+    lat = rng.uniform(0, 60, 70_000)
+    lat[::101] = np.nan
+    edge_lon, edge_lat = _near_edge_lon_lat(hp, 5_000, seed=4)
+    lon = np.concatenate([lon, edge_lon])
+    lat = np.concatenate([lat, edge_lat])
+
+    q, r = hp.decode_hex_id(hp.label(lon, lat))
+    expected = encode_hex_id(q, r, encoding=encoding)
+    assert (expected == INVALID_HEX_ID).sum() == np.isnan(lat).sum()
+
+    np.testing.assert_array_equal(hp_sfc.label(lon, lat), expected)
+    np.testing.assert_array_equal(
+        hp_sfc.label(lon, lat, compute_dtype="float32"), expected
+    )
+    np.testing.assert_array_equal(hp_sfc.label(lon, lat, n_threads=2), expected)
+    np.testing.assert_array_equal(
+        hp_sfc.label(da.from_array(lon, chunks=20_000), lat).compute(), expected
+    )
+    xy = hp_sfc.project(lon, lat)
+    np.testing.assert_array_equal(hp_sfc.label_projected(xy.x, xy.y), expected)
+    cantor, sfc = label_resolutions([hp, hp_sfc], lon, lat)
+    np.testing.assert_array_equal(sfc, expected)
+    np.testing.assert_array_equal(cantor, hp.label(lon, lat))
+
+    np.testing.assert_array_equal(hp_sfc.decode_hex_id(expected)[0], q)
+
+
+def test_label_int32_matches_int64():
+    """int32 IDs are the int64 IDs narrowed, on every labelling path."""
+    import dask.array as da
+    import xarray as xr
+    from hextraj import label_resolutions
+
+    kwargs = dict(lon_origin=5.0, lat_origin=55.0, hex_size_meters=1_000)
+    hp = HexProj(**kwargs)
+    hp32 = HexProj(**kwargs, hex_id_dtype="int32")
+    rng = np.random.default_rng(5)
+    lon = rng.uniform(-5, 15, 150_000)
+    lat = rng.uniform(50, 60, 150_000)
+    lat[::97] = np.nan
+    expected = hp.label(lon, lat)
+
+    ids = hp32.label(lon, lat)
+    assert ids.dtype == np.int32
+    np.testing.assert_array_equal(ids, expected)
+    np.testing.assert_array_equal(hp32.label(lon, lat, n_threads=3), expected)
+    np.testing.assert_array_equal(
+        hp32.label(lon, lat, compute_dtype="float32"),
+        hp.label(lon, lat, compute_dtype="float32"),
+    )
+    xy = hp32.project(lon, lat)
+    np.testing.assert_array_equal(hp32.label_projected(xy.x, xy.y), expected)
+    out = np.empty(lon.shape, dtype=np.int32)
+    assert hp32.label(lon, lat, out=out) is out
+    with pytest.raises(TypeError, match="int32"):
+        hp32.label(lon, lat, out=np.empty(lon.shape, dtype=np.int64))
+
+    lazy = hp32.label(xr.DataArray(da.from_array(lon, chunks=40_000), dims="obs"), lat)
+    assert lazy.dtype == np.int32
+    np.testing.assert_array_equal(lazy.compute(), expected)
+
+    ids64, ids32 = label_resolutions([hp, hp32], lon, lat)
+    assert ids64.dtype == np.int64 and ids32.dtype == np.int32
+    np.testing.assert_array_equal(ids32, expected)
+    assert isinstance(hp32.label(lon[0], lat[0]), np.int32)
+
+
+def test_label_int32_overflow_raises():
+    hp32 = HexProj(lon_origin=0.0, lat_origin=0.0, hex_size_meters=100, hex_id_dtype="int32")
+    assert hp32.hex_id_budget == 16_383
+    hp32.label(np.array([0.0, 1.0]), np.array([0.0, 1.0]))
+    with pytest.raises(OverflowError, match="int32"):
+        hp32.label(np.array([0.0, 30.0]), np.array([0.0, 0.0]))
+    with pytest.raises(OverflowError, match="int32"):
+        hp32.encode_hex_id(16_384, 16_384)
+    assert hp32.encode_hex_id(16_383, 16_383).dtype == np.int32
+    with pytest.raises(ValueError, match="int64"):
+        HexProj(hex_id_encoding="hilbert", hex_id_dtype="int32")
+    with pytest.raises(ValueError, match="dtype"):
+        HexProj(hex_id_dtype="uint32")
+
+
+def test_label_bbox_domain(monkeypatch):
+    """Positions outside a bbox domain are INVALID and never projected."""
+    import hextraj.hexproj as hexproj_module
+
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(6)
+    lon = rng.uniform(-180, 180, (400, 500))
+    lat = rng.uniform(-80, 80, (400, 500))
+    lat[::7, 3] = np.nan
+    expected = hp.label(lon, lat)
+
+    ids = hp.label(lon, lat, domain=(-15, 10, 45, 65))
+    inside = (lon >= -15) & (lon <= 10) & (lat >= 45) & (lat <= 65)
+    np.testing.assert_array_equal(ids, np.where(inside, expected, INVALID_HEX_ID))
+
+    # the lon range runs east modulo 360, across the antimeridian if need be
+    ids = hp.label(lon, lat, domain=(170, -170, -10, 10), n_threads=2)
+    inside = (np.abs(lon) >= 170) & (np.abs(lat) <= 10)
+    np.testing.assert_array_equal(ids, np.where(inside, expected, INVALID_HEX_ID))
+    np.testing.assert_array_equal(
+        hp.label(lon + 360, lat, domain=(-15, 10, 45, 65)),
+        hp.label(lon, lat, domain=(-15, 10, 45, 65)),
+    )
+
+    n_projected = []
+    label_lon_lat = hexproj_module.label_lon_lat
+
+    def counting(transformer, layout, lon, lat, out, **kwargs):
+        n_projected.append(lon.size)
+        return label_lon_lat(transformer, layout, lon, lat, out, **kwargs)
+
+    monkeypatch.setattr(hexproj_module, "label_lon_lat", counting)
+    hp.label(lon, lat, domain=(-15, 10, 45, 65))
+    inside = (lon >= -15) & (lon <= 10) & (lat >= 45) & (lat <= 65)
+    assert n_projected == [np.count_nonzero(inside)]
+
+
+def test_label_hex_id_domain():
+    """A hex ID domain keeps exactly the labels in the set, also near hex edges."""
+    import dask.array as da
+    from shapely.geometry import box
+    from hextraj import HexGrid
+
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=25_000)
+    domain_ids = hp.region_of_hexes(box(-8, 50, 2, 58))
+    rng = np.random.default_rng(7)
+    lon = rng.uniform(-40, 40, 100_000)
+    lat = rng.uniform(30, 80, 100_000)
+    edge_lon, edge_lat = _near_edge_lon_lat(hp, 20_000, seed=8)
+    lon = np.concatenate([lon, edge_lon])
+    lat = np.concatenate([lat, edge_lat])
+    labels = hp.label(lon, lat)
+    expected = np.where(np.isin(labels, domain_ids), labels, INVALID_HEX_ID)
+    assert (expected != INVALID_HEX_ID).sum() > 2_000
+
+    np.testing.assert_array_equal(hp.label(lon, lat, domain=domain_ids), expected)
+    grid = HexGrid(domain_ids)
+    np.testing.assert_array_equal(hp.label(lon, lat, domain=grid), expected)
+    lazy = hp.label(da.from_array(lon, chunks=30_000), lat, domain=grid)
+    np.testing.assert_array_equal(lazy.compute(), expected)
+    out = np.empty(lon.shape, dtype=np.int64)
+    assert hp.label(lon, lat, out=out, domain=list(domain_ids)) is out
+    np.testing.assert_array_equal(out, expected)
+    inside = np.flatnonzero(expected != INVALID_HEX_ID)[0]
+    outside = np.flatnonzero((expected == INVALID_HEX_ID) & (labels != INVALID_HEX_ID))[0]
+    for domain in (domain_ids, grid):
+        for k in (inside, outside):
+            assert hp.label(lon[k], lat[k], domain=domain) == expected[k]
+
+
+def test_label_grid_domain_bbox_reused(monkeypatch):
+    """A HexGrid domain's lon/lat box is computed once per HexProj."""
+    from hextraj import HexGrid
+
+    hp = HexProj(hex_size_meters=25_000)
+    grid = HexGrid(hp.label(np.linspace(-2, 2, 50), np.linspace(-1, 1, 50)))
+    calls = []
+    corners = hp._corners_lon_lat
+
+    def counting(hex_ids, *args, **kwargs):
+        calls.append(len(hex_ids))
+        return corners(hex_ids, *args, **kwargs)
+
+    monkeypatch.setattr(hp, "_corners_lon_lat", counting)
+    lon = np.linspace(-5, 5, 1_000)
+    first = hp.label(lon, lon, domain=grid)
+    np.testing.assert_array_equal(hp.label(lon, lon, domain=grid), first)
+    assert calls == [len(grid)]
+
+
+def test_label_domain_avoids_int32_overflow():
+    """Far-away positions outside the domain do not overflow int32 IDs."""
+    hp32 = HexProj(lon_origin=0.0, lat_origin=0.0, hex_size_meters=100, hex_id_dtype="int32")
+    lon, lat = np.array([0.0, 0.5, 30.0]), np.array([0.0, 0.5, 0.0])
+    with pytest.raises(OverflowError):
+        hp32.label(lon, lat)
+    ids = hp32.label(lon, lat, domain=(-1, 1, -1, 1))
+    assert ids.dtype == np.int32
+    np.testing.assert_array_equal(ids[:2], hp32.label(lon[:2], lat[:2]))
+    assert ids[2] == INVALID_HEX_ID
+
+
+def test_label_dedup_matches_label():
+    """dedup=True gives the same IDs for repeated, NaN and float32 positions."""
+    import dask.array as da
+    from hextraj.hexproj import _unique_positions
+
+    hp = HexProj(lon_origin=-3.0, lat_origin=54.0, hex_size_meters=10_000)
+    rng = np.random.default_rng(9)
+    edge_lon, edge_lat = _near_edge_lon_lat(hp, 200, seed=10)
+    site = rng.integers(0, 200, (300, 400))
+    lon, lat = edge_lon[site], edge_lat[site]
+    lat[::13, 7] = np.nan
+    lon[5, ::3] = np.nan
+    expected = hp.label(lon, lat)
+
+    codes, lon_u, lat_u = _unique_positions(lon.ravel(), lat.ravel())
+    assert len(lon_u) <= 200
+    assert (codes == -1).sum() == np.isnan(lon + lat).sum()
+    assert _unique_positions(lon_u, lat_u) is None
+
+    np.testing.assert_array_equal(hp.label(lon, lat, dedup=True), expected)
+    np.testing.assert_array_equal(
+        hp.label(lon, lat, dedup=True, n_threads=2, compute_dtype="float32"), expected
+    )
+    np.testing.assert_array_equal(
+        hp.label(lon.astype(np.float32), lat.astype(np.float32), dedup=True),
+        hp.label(lon.astype(np.float32), lat.astype(np.float32)),
+    )
+    np.testing.assert_array_equal(
+        hp.label(lon, lat, dedup=True, domain=(-5, 0, 40, 70)),
+        hp.label(lon, lat, domain=(-5, 0, 40, 70)),
+    )
+    lazy = hp.label(da.from_array(lon, chunks=(100, 400)), lat, dedup=True)
+    np.testing.assert_array_equal(lazy.compute(), expected)
+    assert hp.label(lon[0, 0], lat[0, 0], dedup=True) == expected[0, 0]
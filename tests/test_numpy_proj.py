@@ -0,0 +1,98 @@
+"""Tests for the numpy projection backend against pyproj."""
+
+import numpy as np
+import pyproj
+import pytest
+
+from hextraj._numpy_proj import (
+    FORWARD_TOLERANCE_M,
+    INVERSE_TOLERANCE_DEG,
+    SUPPORTED_PROJECTIONS,
+    NumpyTransformer,
+)
+from hextraj._proj import make_transformer
+from hextraj.hexproj import HexProj
+
+
+INVERSE = pyproj.enums.TransformDirection.INVERSE
+
+
+@pytest.mark.parametrize("projection_name", SUPPORTED_PROJECTIONS)
+@pytest.mark.parametrize("lat_origin", [0.0, 54.0, -33.3, 89.0, 90.0, -90.0])
+@pytest.mark.parametrize("lon_origin", [0.0, -3.0, 170.0])
+def test_matches_pyproj(projection_name, lat_origin, lon_origin):
+    """Forward and inverse agree with PROJ to the documented tolerances."""
+    _, reference = make_transformer(projection_name, lat_origin, lon_origin)
+    transformer = NumpyTransformer(projection_name, lat_origin, lon_origin)
+
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 180, size=20_000)
+    lat = rng.uniform(-89.9, 89.9, size=20_000)
+
+    x_ref, y_ref = reference.transform(lon, lat)
+    x, y = transformer.transform(lon, lat)
+
+    # same points are (un)projectable
+    np.testing.assert_array_equal(np.isfinite(x), np.isfinite(x_ref))
+    ok = np.isfinite(x_ref) & np.isfinite(y_ref) & (np.hypot(x_ref, y_ref) < 2e7)
+    assert np.hypot(x - x_ref, y - y_ref)[ok].max() < FORWARD_TOLERANCE_M
+
+    lon_ref, lat_ref = reference.transform(x_ref[ok], y_ref[ok], direction=INVERSE)
+    lon_inv, lat_inv = transformer.transform(x_ref[ok], y_ref[ok], direction=INVERSE)
+    dlon = np.abs((lon_inv - lon_ref + 180) % 360 - 180)
+    dlon = np.where(np.abs(lat_ref) > 89.999, 0.0, dlon)  # lon undefined at poles
+    assert dlon.max() < INVERSE_TOLERANCE_DEG
+    assert np.abs(lat_inv - lat_ref).max() < INVERSE_TOLERANCE_DEG
+
+
+def test_scalar_and_inplace():
+    transformer = NumpyTransformer("laea", 54.0, -3.0)
+    x, y = transformer.transform(-3.0, 54.0)
+    assert isinstance(x, float) and isinstance(y, float)
+    assert abs(x) < 1e-6 and abs(y) < 1e-6
+
+    xx = np.array([0.0, 10.0])
+    yy = np.array([50.0, 60.0])
+    expected = transformer.transform(xx, yy)
+    rx, ry = transformer.transform(xx, yy, inplace=True)
+    assert rx is xx and ry is yy
+    np.testing.assert_array_equal(xx, expected[0])
+
+
+def test_nan_and_out_of_range_are_inf():
+    transformer = NumpyTransformer("laea", 0.0, 0.0)
+    x, y = transformer.transform(np.array([np.nan, 0.0, 180.0]), np.array([0.0, 95.0, 0.0]))
+    assert np.isinf(x).all() and np.isinf(y).all()
+
+
+def test_unsupported_projection():
+    with pytest.raises(ValueError, match="supports"):
+        NumpyTransformer("tmerc", 0.0, 0.0)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="projection_backend"):
+        HexProj(projection_backend="gdal")
+
+
+@pytest.mark.parametrize("projection_name", SUPPORTED_PROJECTIONS)
+def test_hexproj_numpy_backend_labels_like_pyproj(projection_name):
+    """At 10 km hexes the sub-millimetre differences do not change any label."""
+    kwargs = dict(
+        projection_name=projection_name, lon_origin=-3.0, lat_origin=54.0,
+        hex_size_meters=10_000,
+    )
+    hp_ref = HexProj(**kwargs)
+    hp = HexProj(projection_backend="numpy", **kwargs)
+
+    rng = np.random.default_rng(1)
+    lon = rng.uniform(-40, 30, size=100_000)
+    lat = rng.uniform(30, 80, size=100_000)
+    lon[::101] = np.nan
+
+    np.testing.assert_array_equal(hp.label(lon, lat), hp_ref.label(lon, lat))
+    np.testing.assert_array_equal(
+        hp.label(lon[:1000], lat[:1000], n_threads=2),
+        hp_ref.label(lon[:1000], lat[:1000]),
+    )
+    assert "projection_backend='numpy'" in repr(hp)